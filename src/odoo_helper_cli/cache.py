@@ -0,0 +1,11 @@
+"""Per-user cache locations for derived data (indexes, checkpoints, snapshots)."""
+import os
+from pathlib import Path
+
+
+def cache_dir(*parts: str) -> Path:
+    """Return (and create) ``$XDG_CACHE_HOME/odoo-helper/<parts>``."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = Path(base, "odoo-helper", *parts)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,19 +1,106 @@
 import os
+import time
 import typer
 from rich.console import Console
-from typing import Optional
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .connection import connection
+from . import statements
+from .health import HealthWatch, fetch_health, fetch_sample
 
 app = typer.Typer()
 console = Console()
 
 
+def _fleet_report(dsn_file: Path, check: str, params: Dict, concurrency: int, timeout: float, output: str) -> None:
+    """Run ``check`` on every DSN of the file and print one report; exit 1 if any target failed."""
+    from rich.table import Table
+    from .fleet import read_dsn_file, run_fleet
+
+    targets = read_dsn_file(dsn_file)
+    if not targets:
+        console.print(f"[yellow]No DSNs in {dsn_file}")
+        raise typer.Exit(code=1)
+    results = run_fleet(targets, check, params, concurrency, timeout)
+    failed = [r for r in results if not r["ok"]]
+    ok = [r for r in results if r["ok"]]
+
+    if check == "health":
+        # Most troubled first: waiting locks, then long-running queries, then load
+        ok.sort(key=lambda r: (r["result"]["waiting_locks"], len(r["result"]["long_running"]), r["result"]["active"]), reverse=True)
+    elif check == "ping":
+        ok.sort(key=lambda r: r["elapsed_ms"], reverse=True)
+
+    if output == "json":
+        if check == "slow-queries":
+            key = statements.ORDER_KEYS[params["order_by"]]
+            rows = [{"target": r["target"], **s} for r in ok for s in r["result"]]
+            rows = sorted(rows, key=lambda s: s[key], reverse=True)[:params["limit"]]
+            console.print_json(data={"statements": rows, "failed": failed})
+        else:
+            console.print_json(data=failed + ok)
+    elif check == "slow-queries":
+        key = statements.ORDER_KEYS[params["order_by"]]
+        rows = sorted(
+            ((r["target"], s) for r in ok for s in r["result"]), key=lambda ts: ts[1][key], reverse=True,
+        )[:params["limit"]]
+        table = Table(title=f"Top queries across {len(ok)} databases (pg_stat_statements, cumulative)")
+        table.add_column("database")
+        table.add_column("calls", justify="right")
+        table.add_column("total_time ms", justify="right")
+        table.add_column("mean_time ms", justify="right")
+        table.add_column("blks read", justify="right")
+        table.add_column("query", overflow="fold")
+        for target, r in rows:
+            table.add_row(
+                target, str(r["calls"]), f"{r['total_ms']:.2f}", f"{r['mean_ms']:.2f}",
+                str(r["shared_blks_read"]), (r["query"] or "")[:2000],
+            )
+        console.print(table)
+    else:
+        table = Table(title=f"{check} across {len(results)} databases")
+        table.add_column("database")
+        table.add_column("status")
+        if check == "health":
+            for col in ("active", "idle", "total", "waiting locks", "long running"):
+                table.add_column(col, justify="right")
+            table.add_column("Odoo")
+        table.add_column("ms", justify="right")
+        for r in failed + ok:
+            row = [r["target"], "[green]ok" if r["ok"] else "[red]failed"]
+            if check == "health":
+                h = r.get("result")
+                row += [
+                    str(h["active"]), str(h["idle"]), str(h["total"]),
+                    f"[yellow]{h['waiting_locks']}" if h["waiting_locks"] else "0",
+                    str(len(h["long_running"])), "yes" if h["has_ir_model_data"] else "[yellow]no",
+                ] if h else [""] * 6
+            row.append(f"{r['elapsed_ms']:.0f}")
+            table.add_row(*row)
+        console.print(table)
+
+    if output != "json":
+        for r in failed:
+            console.print(f"[red]{r['target']}:[/red] {r['error']}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
 @app.command("ping")
-def ping(dsn: str = typer.Option(None, help="Postgres DSN")):
+def ping(
+    dsn: str = typer.Option(None, help="Postgres DSN"),
+    dsn_file: Optional[Path] = typer.Option(None, exists=True, readable=True, help="File with one DSN (or 'label DSN') per line; checks all concurrently"),
+    concurrency: int = typer.Option(10, min=1, help="Databases checked at once with --dsn-file"),
+    timeout: float = typer.Option(10.0, min=0.5, help="Per-database deadline in seconds with --dsn-file"),
+    output: str = typer.Option("rich", help="Output format with --dsn-file: rich|json"),
+):
     """Quick connectivity check to Postgres."""
+    if dsn_file:
+        _fleet_report(dsn_file, "ping", {}, concurrency, timeout, output)
+        return
     try:
-        import psycopg
-        conn = psycopg.connect(dsn) if dsn else psycopg.connect()
-        with conn.cursor() as cur:
+        with connection(dsn) as conn, conn.cursor() as cur:
             cur.execute("SELECT 1")
             one = cur.fetchone()
         console.print(f"[green]DB OK[/green] {one}")
@@ -26,52 +113,30 @@ def ping(dsn: str = typer.Option(None, help="Postgres DSN")):
 def health(
     dsn: str = typer.Option(None, help="Postgres DSN"),
     long_tx_threshold: str = typer.Option("5 minutes", help="Report transactions running longer than this interval"),
+    watch: bool = typer.Option(False, help="Sample sessions, locks and throughput repeatedly in a live view"),
+    interval: float = typer.Option(2.0, min=0.1, help="Seconds between samples with --watch"),
+    history: int = typer.Option(30, min=2, help="Samples kept and shown with --watch"),
+    dsn_file: Optional[Path] = typer.Option(None, exists=True, readable=True, help="File with one DSN (or 'label DSN') per line; checks all concurrently"),
+    concurrency: int = typer.Option(10, min=1, help="Databases checked at once with --dsn-file"),
+    timeout: float = typer.Option(10.0, min=0.5, help="Per-database deadline in seconds with --dsn-file"),
+    output: str = typer.Option("rich", help="Output format with --dsn-file: rich|json"),
 ):
     """Run basic DB health checks: version, active/idle sessions, long-running queries, locks, Odoo table presence."""
+    if dsn_file:
+        if watch:
+            console.print("[red]--watch works on a single --dsn")
+            raise typer.Exit(code=2)
+        _fleet_report(dsn_file, "health", {"long_tx_threshold": long_tx_threshold}, concurrency, timeout, output)
+        return
+    if watch:
+        _watch_health(dsn, interval, history)
+        return
     try:
-        import psycopg
         from rich.table import Table
-        conn = psycopg.connect(dsn) if dsn else psycopg.connect()
-        conn.autocommit = True
-        with conn.cursor() as cur:
-            cur.execute("SELECT version()")
-            version = cur.fetchone()[0]
-
-            cur.execute("""
-                SELECT
-                  sum((state = 'active')::int) AS active,
-                  sum((state = 'idle')::int)   AS idle,
-                  count(*)                      AS total
-                FROM pg_stat_activity
-                WHERE pid <> pg_backend_pid();
-            """)
-            active, idle, total = cur.fetchone()
-
-            cur.execute(
-                """
-                SELECT pid, now() - query_start AS duration, coalesce(left(query, 140), '')
-                FROM pg_stat_activity
-                WHERE state = 'active' AND now() - query_start > %s::interval
-                ORDER BY duration DESC
-                LIMIT 10
-                """,
-                (long_tx_threshold,),
-            )
-            long_running = cur.fetchall()
-
-            cur.execute("SELECT count(*) FROM pg_locks WHERE NOT granted;")
-            waiting_locks = cur.fetchone()[0]
-
-            # Odoo table presence
-            cur.execute(
-                """
-                SELECT EXISTS (
-                    SELECT 1 FROM information_schema.tables
-                    WHERE table_schema = 'public' AND table_name = 'ir_model_data'
-                )
-                """
-            )
-            has_imd = cur.fetchone()[0]
+        with connection(dsn) as conn:
+            h = fetch_health(conn, long_tx_threshold)
+        version, active, idle, total = h["version"], h["active"], h["idle"], h["total"]
+        waiting_locks, long_running, has_imd = h["waiting_locks"], h["long_running"], h["has_ir_model_data"]
 
         console.print(f"[bold]Postgres[/bold]: {version}")
 
@@ -83,7 +148,7 @@ def health(
         console.print(table)
 
         if waiting_locks:
-            console.print(f"[yellow]Waiting locks:[/yellow] {waiting_locks}")
+            console.print(f"[yellow]Waiting locks:[/yellow] {waiting_locks} (see `db locks` for blocking chains)")
         else:
             console.print("[green]No waiting locks detected.")
 
@@ -92,8 +157,8 @@ def health(
             lr.add_column("pid", justify="right")
             lr.add_column("duration")
             lr.add_column("query", overflow="fold")
-            for pid, duration, query in long_running:
-                lr.add_row(str(pid), str(duration), query)
+            for r in long_running:
+                lr.add_row(str(r["pid"]), r["duration"], r["query"])
             console.print(lr)
         else:
             console.print("[green]No long running queries.")
@@ -102,80 +167,421 @@ def health(
             console.print("[green]Odoo table detected:[/green] public.ir_model_data")
         else:
             console.print("[yellow]public.ir_model_data not found. This may not be an Odoo DB or schema is not 'public'.")
+        console.print(f"[dim]Collected in {h['elapsed_ms']:.1f} ms (1 round trip)")
 
     except Exception as e:
         console.print(f"[red]Health check error:[/red] {e}")
         raise typer.Exit(code=1)
 
 
+def _watch_table(w: HealthWatch, interval: float):
+    from rich.table import Table
+
+    def rate(v) -> str:
+        return f"{v:,.1f}" if v is not None else "-"
+
+    table = Table(title=f"DB health every {interval:g}s (last {len(w.history)} samples, Ctrl-C to stop)")
+    table.add_column("time", no_wrap=True)
+    for col in ("active", "idle", "idle tx", "waiting", "commit/s", "rollback/s", "tup rd/s", "tup wr/s", "hit %"):
+        table.add_column(col, justify="right")
+    for r in w.history:
+        table.add_row(
+            time.strftime("%H:%M:%S", time.localtime(r["at"])),
+            str(r["active"]),
+            str(r["idle"]),
+            str(r["idle_in_tx"]),
+            f"[yellow]{r['waiting_locks']}" if r["waiting_locks"] else "0",
+            rate(r["commits_s"]),
+            rate(r["rollbacks_s"]),
+            rate(r["tup_read_s"]),
+            rate(r["tup_written_s"]),
+            f"{r['hit_ratio'] * 100:.2f}" if r["hit_ratio"] is not None else "-",
+        )
+    table.caption = f"peak active {w.peak('active')}, peak waiting locks {w.peak('waiting_locks')}"
+    return table
+
+
+def _watch_health(dsn: Optional[str], interval: float, history: int) -> None:
+    from rich.live import Live
+
+    w = HealthWatch(history)
+    try:
+        with connection(dsn) as conn, Live(console=console, auto_refresh=False) as live:
+            while True:
+                started = time.monotonic()
+                w.add(fetch_sample(conn))
+                live.update(_watch_table(w, interval), refresh=True)
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        console.print(f"[red]Health check error:[/red] {e}")
+        raise typer.Exit(code=1)
+
+
+def _lock_label(n: Dict) -> str:
+    from rich.markup import escape
+
+    if n["pid"] == 0:
+        return "[bold]prepared transaction[/bold] (see pg_prepared_xacts)"
+    who = " ".join(x for x in (n["user"], n["application"]) if x)
+    age = f", tx {n['xact_age_s']:,.0f}s" if n["xact_age_s"] is not None else ""
+    label = f"[bold]{n['pid']}[/bold] {escape(who)} [dim]{n['state'] or ''}{age}[/dim]"
+    if n["waiting_on"]:
+        label += f" [yellow]waits for {escape(n['waiting_on'])}[/yellow]"
+    query = " ".join(n["query"].split())[:160]
+    return label + (f"\n[dim]{escape(query)}[/dim]" if query else "")
+
+
+def _lock_tree(nodes: Dict[int, Dict], graph: Dict):
+    from rich.console import Group
+    from rich.tree import Tree
+
+    def add(parent, sub):
+        branch = parent.add(_lock_label(nodes[sub["pid"]]))
+        for child in sub["children"]:
+            add(branch, child)
+
+    parts = []
+    for root in graph["roots"]:
+        tree = Tree(f"[red]root blocker[/red] · {root['blocked']} blocked, chain depth {root['depth']}\n"
+                    + _lock_label(nodes[root["pid"]]))
+        for child in root["children"]:
+            add(tree, child)
+        parts.append(tree)
+    for cycle in graph["cycles"]:
+        tree = Tree(f"[bold red]cycle[/bold red] · {' ↔ '.join(map(str, cycle))} (deadlock not yet detected by the server)")
+        for pid in cycle:
+            tree.add(_lock_label(nodes[pid]))
+        parts.append(tree)
+    if not parts:
+        parts.append("[green]No sessions waiting on locks.")
+    return Group(*parts)
+
+
+def _lock_persistence_table(tracker):
+    from rich.table import Table
+    from rich.markup import escape
+
+    table = Table(title=f"Root blockers over {tracker.samples} samples")
+    table.add_column("pid", justify="right")
+    table.add_column("first seen", no_wrap=True)
+    table.add_column("persisted s", justify="right")
+    table.add_column("samples", justify="right")
+    table.add_column("max blocked", justify="right")
+    table.add_column("max depth", justify="right")
+    table.add_column("query", overflow="fold")
+    for s in tracker.summary():
+        table.add_row(
+            str(s["pid"]),
+            time.strftime("%H:%M:%S", time.localtime(s["first_seen"])),
+            f"{s['persisted_s']:,.1f}",
+            str(s["samples"]),
+            str(s["max_blocked"]),
+            str(s["max_depth"]),
+            escape(" ".join(s["query"].split())[:200]),
+        )
+    return table
+
+
+@app.command("locks")
+def locks(
+    dsn: str = typer.Option(None, help="Postgres DSN"),
+    watch: bool = typer.Option(False, help="Sample repeatedly and track how long each blocking chain persists"),
+    interval: float = typer.Option(2.0, min=0.1, help="Seconds between samples with --watch"),
+    samples: Optional[int] = typer.Option(None, min=1, help="Stop --watch after this many samples (default: until Ctrl-C)"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Show the lock wait-for graph: root blockers, blocking chains, cycles, and each session's relation and query."""
+    from .locks import ChainTracker, build_graph, fetch_nodes
+
+    tracker = ChainTracker()
+    nodes: Dict[int, Dict] = {}
+    graph = build_graph(nodes)
+    try:
+        with connection(dsn) as conn:
+            if not watch:
+                nodes = fetch_nodes(conn)
+                graph = build_graph(nodes)
+            else:
+                from rich.console import Group
+                from rich.live import Live
+
+                live_ctx = Live(console=console, auto_refresh=False) if output != "json" else None
+                try:
+                    if live_ctx:
+                        live_ctx.start()
+                    while samples is None or tracker.samples < samples:
+                        started = time.monotonic()
+                        nodes = fetch_nodes(conn)
+                        graph = build_graph(nodes)
+                        tracker.add(time.time(), nodes, graph)
+                        if live_ctx:
+                            live_ctx.update(Group(_lock_tree(nodes, graph), _lock_persistence_table(tracker)), refresh=True)
+                        if samples is None or tracker.samples < samples:
+                            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+                except KeyboardInterrupt:
+                    pass
+                finally:
+                    if live_ctx:
+                        live_ctx.stop()
+    except Exception as e:
+        console.print(f"[red]locks error:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    if output == "json":
+        data = {"nodes": list(nodes.values()), "roots": graph["roots"], "cycles": graph["cycles"]}
+        if watch:
+            data["persistence"] = tracker.summary()
+        console.print_json(data=data)
+    elif not watch:
+        console.print(_lock_tree(nodes, graph))
+        if graph["waiting"]:
+            console.print(f"[dim]{graph['waiting']} sessions waiting; terminating a root blocker releases its whole chain "
+                          "(SELECT pg_terminate_backend(pid)).")
+
+
 @app.command("slow-queries")
 def slow_queries(
     dsn: str = typer.Option(None, help="Postgres DSN"),
     limit: int = typer.Option(50, help="Limit results"),
-    order_by: str = typer.Option("total_time", help="Order by one of total_time, mean_time, calls"),
+    order_by: str = typer.Option("total_time", help="Order by one of total_time, mean_time, calls, blks_read"),
+    snapshot: bool = typer.Option(False, help="Store a pg_stat_statements snapshot locally"),
+    interval: Optional[float] = typer.Option(None, min=0.1, help="Sample twice, this many seconds apart, and rank the deltas"),
+    diff: Optional[List[str]] = typer.Option(None, help="Rank deltas since a stored snapshot (name, path or 'latest'); give twice to compare two snapshots"),
+    list_snapshots: bool = typer.Option(False, help="List stored snapshots and exit"),
+    explain: bool = typer.Option(False, help="EXPLAIN the top statements' generic plans (no ANALYZE, read-only) and flag risky nodes"),
+    explain_top: int = typer.Option(10, min=1, help="Statements to explain with --explain"),
+    plan_max_age: float = typer.Option(24.0, help="Hours a cached plan is reused before re-explaining"),
+    refresh_plans: bool = typer.Option(False, help="Re-explain even when a fresh cached plan exists"),
+    large_rows: int = typer.Option(100_000, help="Row count from which seq scans (and nested loops, /10) are flagged"),
+    statement_timeout: str = typer.Option("10s", help="Timeout for each EXPLAIN"),
+    dsn_file: Optional[Path] = typer.Option(None, exists=True, readable=True, help="File with one DSN (or 'label DSN') per line; checks all concurrently"),
+    concurrency: int = typer.Option(10, min=1, help="Databases checked at once with --dsn-file"),
+    timeout: float = typer.Option(10.0, min=0.5, help="Per-database deadline in seconds with --dsn-file"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
 ):
-    """List top queries from pg_stat_statements if available."""
-    valid_order = {"total_time", "mean_time", "calls"}
-    if order_by not in valid_order:
+    """List top queries from pg_stat_statements, cumulative or as deltas over an interval."""
+    if order_by not in statements.ORDER_KEYS:
         console.print(f"[yellow]Invalid order_by. Using total_time")
         order_by = "total_time"
+    if diff and len(diff) > 2:
+        console.print("[red]--diff takes at most two snapshots")
+        raise typer.Exit(code=2)
+    if dsn_file:
+        if snapshot or interval is not None or diff or list_snapshots:
+            console.print("[red]Snapshots and --interval work on a single --dsn")
+            raise typer.Exit(code=2)
+        params = {"order_by": order_by, "limit": limit}
+        _fleet_report(dsn_file, "slow-queries", params, concurrency, timeout, output)
+        return
 
     try:
-        import psycopg
-        from rich.table import Table
-        conn = psycopg.connect(dsn) if dsn else psycopg.connect()
-        conn.autocommit = True
-        with conn.cursor() as cur:
-            # Check extension
-            cur.execute("SELECT extname FROM pg_extension WHERE extname = 'pg_stat_statements'")
-            if not cur.fetchone():
+        with connection(dsn) as conn:
+            if not statements.has_extension(conn):
                 console.print("[yellow]pg_stat_statements is not enabled. Enable it to use this command.")
                 raise typer.Exit(code=1)
+            directory = statements.snapshot_dir(conn)
+            if list_snapshots:
+                for path in statements.list_snapshots(directory):
+                    console.print(path.stem)
+                return
 
-            # Columns differ across versions; fetch columns present
-            cur.execute("SELECT column_name FROM information_schema.columns WHERE table_name='pg_stat_statements'")
-            cols = {r[0] for r in cur.fetchall()}
-            mean_col = 'mean_time' if 'mean_time' in cols else None
-
-            if mean_col:
-                cur.execute(
-                    f"""
-                    SELECT query, calls, total_time, {mean_col}
-                    FROM pg_stat_statements
-                    ORDER BY {order_by} DESC
-                    LIMIT %s
-                    """,
-                    (limit,),
-                )
-                rows = cur.fetchall()
-                table = Table(title="Top queries (pg_stat_statements)")
-                table.add_column("calls", justify="right")
-                table.add_column("total_time ms", justify="right")
-                table.add_column("mean_time ms", justify="right")
-                table.add_column("query", overflow="fold")
-                for q, calls, total_time, mean_time in rows:
-                    table.add_row(str(calls), f"{total_time:.2f}", f"{mean_time:.2f}", (q or "")[:2000])
-                console.print(table)
+            window = None
+            if interval is not None or diff:
+                if diff:
+                    old = statements.load_snapshot(directory, diff[0])
+                    new = statements.load_snapshot(directory, diff[1]) if len(diff) > 1 else statements.capture(conn)
+                else:
+                    old = statements.capture(conn)
+                    time.sleep(interval)
+                    new = statements.capture(conn)
+                if snapshot:
+                    console.print(f"[green]Snapshot saved:[/green] {statements.save_snapshot(directory, new)}")
+                window = new["taken_at"] - old["taken_at"]
+                rows = statements.rank(statements.diff(old, new), order_by, limit)
             else:
-                # Older versions: compute mean on the fly
-                cur.execute(
-                    """
-                    SELECT query, calls, total_time, CASE WHEN calls>0 THEN total_time/calls ELSE 0 END AS mean_time
-                    FROM pg_stat_statements
-                    ORDER BY total_time DESC
-                    LIMIT %s
-                    """,
-                    (limit,),
+                if snapshot:
+                    path = statements.save_snapshot(directory, statements.capture(conn))
+                    console.print(f"[green]Snapshot saved:[/green] {path}")
+                rows = statements.top_statements(conn, order_by, limit)
+
+            plans = None
+            if explain:
+                from .explain import explain_statements
+                targets = [dict(r) for r in rows[:explain_top]]
+                if window is not None:
+                    full = statements.query_texts(conn, [r["queryid"] for r in targets])
+                    for r in targets:
+                        r["query"] = full.get(r["queryid"], r["query"])
+                plans = explain_statements(
+                    conn, targets, plan_max_age * 3600, refresh_plans, large_rows, statement_timeout,
                 )
-                rows = cur.fetchall()
-                table = Table(title="Top queries (pg_stat_statements)")
-                table.add_column("calls", justify="right")
-                table.add_column("total_time ms", justify="right")
-                table.add_column("mean_time ms", justify="right")
-                table.add_column("query", overflow="fold")
-                for q, calls, total_time, mean_time in rows:
-                    table.add_row(str(calls), f"{total_time:.2f}", f"{mean_time:.2f}", (q or "")[:2000])
-                console.print(table)
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]slow-queries error:[/red] {e}")
         raise typer.Exit(code=1)
+
+    if output == "json":
+        data = {"window_s": window, "order_by": order_by, "statements": rows}
+        if plans is not None:
+            data["plans"] = plans
+        console.print_json(data=data)
+        return
+
+    from rich.table import Table
+    if window is None:
+        table = Table(title="Top queries (pg_stat_statements, cumulative)")
+    else:
+        table = Table(title=f"Top queries over {window:.1f}s (pg_stat_statements deltas)")
+    table.add_column("calls", justify="right")
+    table.add_column("total_time ms", justify="right")
+    table.add_column("mean_time ms", justify="right")
+    table.add_column("blks read", justify="right")
+    table.add_column("query", overflow="fold")
+    for r in rows:
+        table.add_row(
+            str(r["calls"]),
+            f"{r['total_ms']:.2f}",
+            f"{r['mean_ms']:.2f}",
+            str(r["shared_blks_read"]),
+            (r["query"] or "")[:2000],
+        )
+    console.print(table)
+
+    if plans is not None:
+        pt = Table(title=f"Generic plans of the top {len(plans)} statements")
+        pt.add_column("queryid", no_wrap=True)
+        pt.add_column("mean ms", justify="right")
+        pt.add_column("plan")
+        pt.add_column("flags", overflow="fold")
+        pt.add_column("query", overflow="fold")
+        status_style = {"changed": "[bold yellow]", "new": "[cyan]", "error": "[red]", "skipped": "[dim]"}
+        for p in plans:
+            plan_col = status_style.get(p["status"], "") + p["status"]
+            if p.get("plan_hash"):
+                plan_col += f" {p['plan_hash'][:8]}"
+            flags = "\n".join(f"- {f}" for f in p["flags"]) or p.get("error", "")
+            mean = f"{p['mean_ms']:.2f}" if p.get("mean_ms") is not None else ""
+            pt.add_row(str(p["queryid"]), mean, plan_col, flags, (p["query"] or "")[:300])
+        console.print(pt)
+
+
+@app.command("index-advice")
+def index_advice(
+    dsn: str = typer.Option(None, help="Postgres DSN"),
+    min_rows: int = typer.Option(10_000, help="Ignore tables with fewer live rows (seq scans and foreign keys)"),
+    kind: Optional[List[str]] = typer.Option(None, help="Only these findings: seq-scan, missing-fk-index, unused, duplicate"),
+    limit: int = typer.Option(50, help="Findings to show"),
+    sql: bool = typer.Option(False, help="Print only the generated statements, as a script"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Suggest indexes to add or drop from usage statistics (seq scans, unindexed many2one, unused/duplicate indexes)."""
+    from .indexes import advise
+
+    try:
+        with connection(dsn) as conn:
+            findings, stats_reset = advise(conn, min_rows)
+    except Exception as e:
+        console.print(f"[red]index-advice error:[/red] {e}")
+        raise typer.Exit(code=1)
+    if kind:
+        findings = [f for f in findings if f["kind"] in kind]
+    findings = findings[:limit]
+
+    if output == "json":
+        console.print_json(data={"stats_reset": stats_reset, "findings": findings})
+        return
+    if sql:
+        for f in findings:
+            if f["sql"]:
+                print(f"-- [{f['impact']}] {f['kind']} {f['table']}: {f['detail']}")
+                print(f["sql"])
+        return
+    if not findings:
+        console.print("[green]No index findings.")
+        return
+
+    from rich.table import Table
+    table = Table(title="Index advice" + (f" (usage since {stats_reset})" if stats_reset else ""))
+    table.add_column("Impact")
+    table.add_column("Kind")
+    table.add_column("Table", overflow="fold")
+    table.add_column("Finding", overflow="fold")
+    table.add_column("Statement", overflow="fold")
+    colors = {"high": "red", "medium": "yellow", "low": "dim"}
+    for f in findings:
+        table.add_row(f"[{colors[f['impact']]}]{f['impact']}", f["kind"], f["table"], f["detail"], f["sql"] or "")
+    console.print(table)
+    console.print("[dim]Run CREATE/DROP INDEX CONCURRENTLY outside a transaction. Check replicas before dropping 'unused' indexes.")
+
+
+@app.command("bloat")
+def bloat(
+    dsn: str = typer.Option(None, help="Postgres DSN"),
+    min_pages: int = typer.Option(128, help="Skip relations smaller than this many pages (1 MiB at 8 KiB pages)"),
+    sample: int = typer.Option(0, min=0, help="Measure the N largest tables with pgstattuple_approx (needs the pgstattuple extension)"),
+    statement_timeout: str = typer.Option("30s", help="Timeout for each sampled measurement"),
+    table: Optional[List[str]] = typer.Option(None, help="Only these tables (and their indexes), e.g. mail_tracking_value"),
+    limit: int = typer.Option(30, help="Rows to show"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Estimate table and index bloat, dead tuples, vacuum recency and TOAST size, sorted by reclaimable bytes."""
+    from .bloat import analyze_bloat, has_pgstattuple, human_bytes
+
+    try:
+        with connection(dsn) as conn:
+            if sample and not has_pgstattuple(conn):
+                console.print("[yellow]pgstattuple is not installed; using catalog estimates only. "
+                              "Enable with: CREATE EXTENSION pgstattuple;")
+                sample = 0
+            results = analyze_bloat(conn, min_pages, sample, statement_timeout)
+    except Exception as e:
+        console.print(f"[red]bloat error:[/red] {e}")
+        raise typer.Exit(code=1)
+
+    if table:
+        wanted = set(table)
+        results = [
+            r for r in results
+            if r["name"].split(".", 1)[1] in wanted or r.get("table", "").split(".", 1)[-1] in wanted
+        ]
+    results = results[:limit]
+    for r in results:
+        r.pop("oid", None)
+
+    if output == "json":
+        console.print_json(data=results)
+        return
+    if not results:
+        console.print("[green]No relations above --min-pages.")
+        return
+
+    from rich.table import Table
+    t = Table(title="Bloat (sorted by reclaimable bytes)")
+    t.add_column("Kind")
+    t.add_column("Name", overflow="fold")
+    t.add_column("Size", justify="right")
+    t.add_column("Reclaimable", justify="right")
+    t.add_column("Bloat %", justify="right")
+    t.add_column("Dead tuples", justify="right")
+    t.add_column("Last vacuum", no_wrap=True)
+    t.add_column("Last analyze", no_wrap=True)
+    t.add_column("TOAST", justify="right")
+    t.add_column("Method", overflow="fold")
+    for r in results:
+        is_table = r["kind"] == "table"
+        t.add_row(
+            r["kind"],
+            r["name"] if is_table else f"{r['name']} ({r['table']})",
+            human_bytes(r["size"]),
+            human_bytes(r["reclaimable"]),
+            f"{r['bloat_pct']:.1f}" if r["bloat_pct"] is not None else "-",
+            f"{r['dead_tuples']:,}" if is_table else "",
+            (r["last_vacuum"] or "never")[:16] if is_table else "",
+            (r["last_analyze"] or "never")[:16] if is_table else "",
+            human_bytes(r["toast_size"]) if is_table else "",
+            r["method"],
+        )
+    console.print(t)
@@ -0,0 +1,164 @@
+"""Table and btree index bloat estimates from catalog statistics.
+
+The estimate compares the pages a relation occupies (``relpages``) with the
+pages its live rows need, sized from ``pg_stats`` average column widths,
+tuple/page overhead and the fillfactor. It reads only catalogs, so it is
+safe on a busy production server; relations never analyzed have no estimate.
+With ``pgstattuple`` installed, the largest tables can be measured instead
+with ``pgstattuple_approx``, which skips all-visible pages.
+"""
+import math
+from typing import Dict, List, Optional
+
+TUPLE_HEADER = 24  # HeapTupleHeader, MAXALIGNed
+LINE_POINTER = 4
+PAGE_HEADER = 24
+BTREE_SPECIAL = 16
+INDEX_TUPLE_HEADER = 8
+MAXALIGN = 8
+
+TABLES_SQL = """
+WITH widths AS (
+  SELECT schemaname, tablename, sum((1 - null_frac) * avg_width) AS width
+  FROM pg_stats
+  GROUP BY schemaname, tablename
+)
+SELECT c.oid, n.nspname, c.relname, c.relpages::bigint, c.reltuples::bigint, w.width,
+       coalesce((SELECT split_part(o, '=', 2)::int FROM unnest(c.reloptions) o WHERE o LIKE 'fillfactor=%%'), 100),
+       s.n_live_tup, s.n_dead_tup,
+       greatest(s.last_autovacuum, s.last_vacuum), greatest(s.last_autoanalyze, s.last_analyze),
+       pg_relation_size(c.oid),
+       CASE WHEN c.reltoastrelid = 0 THEN 0 ELSE pg_total_relation_size(c.reltoastrelid) END
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_stat_user_tables s ON s.relid = c.oid
+LEFT JOIN widths w ON w.schemaname = n.nspname AND w.tablename = c.relname
+WHERE c.relkind IN ('r', 'm') AND c.relpages >= %(min_pages)s
+"""
+INDEXES_SQL = """
+SELECT n.nspname, t.relname, ic.relname, ic.relpages::bigint, ic.reltuples::bigint,
+       sum(coalesce(st.avg_width, CASE WHEN a.attlen > 0 THEN a.attlen END)),
+       bool_and(st.avg_width IS NOT NULL OR a.attlen > 0),
+       coalesce((SELECT split_part(o, '=', 2)::int FROM unnest(ic.reloptions) o WHERE o LIKE 'fillfactor=%%'), 90),
+       pg_relation_size(ic.oid)
+FROM pg_index i
+JOIN pg_class ic ON ic.oid = i.indexrelid
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+JOIN pg_am am ON am.oid = ic.relam AND am.amname = 'btree'
+JOIN pg_attribute a ON a.attrelid = ic.oid AND a.attnum > 0
+LEFT JOIN pg_stats st ON st.schemaname = n.nspname AND st.tablename = t.relname AND st.attname = a.attname
+WHERE ic.relpages >= %(min_pages)s AND n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+GROUP BY n.nspname, t.relname, ic.relname, ic.relpages, ic.reltuples, ic.reloptions, ic.oid
+"""
+SAMPLE_SQL = "SELECT approx_free_space + dead_tuple_len, approx_tuple_percent FROM pgstattuple_approx(%s::regclass)"
+
+
+def _align(n: float) -> float:
+    return math.ceil(n / MAXALIGN) * MAXALIGN
+
+
+def expected_pages(rows: int, tuple_bytes: float, usable: float) -> int:
+    return math.ceil(rows * tuple_bytes / usable) if rows > 0 else 1
+
+
+def _bloat(pages: int, expected: int, block_size: int) -> Dict:
+    extra = max(0, pages - expected)
+    return {
+        "reclaimable": extra * block_size,
+        "bloat_pct": round(100 * extra / pages, 1) if pages else 0.0,
+    }
+
+
+def table_bloat(rows, block_size: int) -> List[Dict]:
+    out = []
+    for oid, schema, table, pages, tuples, width, ff, live, dead, vacuumed, analyzed, size, toast in rows:
+        r = {
+            "kind": "table",
+            "oid": oid,
+            "name": f"{schema}.{table}",
+            "size": size,
+            "toast_size": toast,
+            "dead_tuples": dead,
+            "live_tuples": live,
+            "last_vacuum": vacuumed.isoformat(timespec="seconds") if vacuumed else None,
+            "last_analyze": analyzed.isoformat(timespec="seconds") if analyzed else None,
+            "method": "estimate",
+        }
+        # reltuples is -1 (PG14+) or width missing until the table is analyzed
+        if width is None or tuples < 0:
+            r.update(reclaimable=None, bloat_pct=None, method="no stats (run ANALYZE)")
+        else:
+            tuple_bytes = TUPLE_HEADER + _align(float(width)) + LINE_POINTER
+            usable = (block_size - PAGE_HEADER) * ff / 100
+            r.update(_bloat(pages, expected_pages(tuples, tuple_bytes, usable), block_size))
+        out.append(r)
+    return out
+
+
+def index_bloat(rows, block_size: int) -> List[Dict]:
+    out = []
+    for schema, table, index, pages, tuples, width, has_stats, ff, size in rows:
+        r = {"kind": "index", "name": f"{schema}.{index}", "table": f"{schema}.{table}", "size": size, "method": "estimate"}
+        if not has_stats or width is None or tuples < 0:
+            r.update(reclaimable=None, bloat_pct=None, method="no stats (run ANALYZE)")
+        else:
+            tuple_bytes = INDEX_TUPLE_HEADER + _align(float(width)) + LINE_POINTER
+            usable = (block_size - PAGE_HEADER - BTREE_SPECIAL) * ff / 100
+            # One metapage plus leaf pages; inner pages are noise at this precision
+            r.update(_bloat(pages, expected_pages(tuples, tuple_bytes, usable) + 1, block_size))
+        out.append(r)
+    return out
+
+
+def has_pgstattuple(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple'")
+        return cur.fetchone() is not None
+
+
+def sample_tables(conn, tables: List[Dict], statement_timeout: str) -> None:
+    """Replace estimates with ``pgstattuple_approx`` measurements, each under a statement timeout."""
+    for t in tables:
+        try:
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+                cur.execute(SAMPLE_SQL, (t["oid"],))
+                free, _ = cur.fetchone()
+        except Exception as e:
+            t["method"] = f"estimate (sampling failed: {str(e).strip().splitlines()[0]})"
+            continue
+        t["reclaimable"] = int(free)
+        t["bloat_pct"] = round(100 * free / t["size"], 1) if t["size"] else 0.0
+        t["method"] = "pgstattuple_approx"
+
+
+def analyze_bloat(conn, min_pages: int, sample: int, statement_timeout: str) -> List[Dict]:
+    """Tables and btree indexes sorted by reclaimable bytes (unknown last).
+
+    ``sample`` largest tables are measured with pgstattuple_approx; the caller
+    checks that the extension is installed.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT current_setting('block_size')::int")
+        block_size = cur.fetchone()[0]
+        cur.execute(TABLES_SQL, {"min_pages": min_pages})
+        tables = table_bloat(cur.fetchall(), block_size)
+        cur.execute(INDEXES_SQL, {"min_pages": min_pages})
+        indexes = index_bloat(cur.fetchall(), block_size)
+    if sample:
+        largest = sorted(tables, key=lambda t: t["size"], reverse=True)[:sample]
+        sample_tables(conn, largest, statement_timeout)
+    results = tables + indexes
+    results.sort(key=lambda r: (r["reclaimable"] is None, -(r["reclaimable"] or 0)))
+    return results
+
+
+def human_bytes(n: Optional[float]) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n) < 1024:
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} TiB"
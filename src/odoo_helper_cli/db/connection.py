@@ -0,0 +1,58 @@
+"""Shared Postgres connections for the ``db`` commands.
+
+Connections are opened once per DSN and process, in autocommit mode, and
+reused by every command or sampling loop that asks for the same DSN. They are
+closed at interpreter exit, and a connection found closed or broken is
+replaced on the next request.
+"""
+import atexit
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+
+if TYPE_CHECKING:
+    import psycopg
+
+APPLICATION_NAME = "odoo-helper"
+
+_connections: Dict[str, "psycopg.Connection"] = {}
+
+
+def get_connection(dsn: Optional[str]) -> "psycopg.Connection":
+    """Open (or reuse) an autocommit connection; an empty DSN uses libpq defaults (PG* env vars)."""
+    import psycopg
+
+    key = dsn or ""
+    conn = _connections.get(key)
+    if conn is not None and not conn.closed and not conn.broken:
+        return conn
+    conn = psycopg.connect(key, autocommit=True, application_name=APPLICATION_NAME)
+    _connections[key] = conn
+    return conn
+
+
+def discard(dsn: Optional[str]) -> None:
+    conn = _connections.pop(dsn or "", None)
+    if conn is not None:
+        conn.close()
+
+
+def close_all() -> None:
+    while _connections:
+        _, conn = _connections.popitem()
+        conn.close()
+
+
+atexit.register(close_all)
+
+
+@contextmanager
+def connection(dsn: Optional[str]) -> Iterator["psycopg.Connection"]:
+    """Yield the shared connection for ``dsn``; drop it if the server side went away."""
+    import psycopg
+
+    conn = get_connection(dsn)
+    try:
+        yield conn
+    except psycopg.OperationalError:
+        discard(dsn)
+        raise
@@ -0,0 +1,189 @@
+"""Generic-plan EXPLAIN for normalized statements, with a local plan cache.
+
+pg_stat_statements keeps statements with ``$n`` placeholders, which cannot
+be run as-is. PostgreSQL 16+ explains them directly with ``GENERIC_PLAN``;
+older servers (12+) get a PREPARE plus ``EXPLAIN EXECUTE`` with NULL
+arguments under ``plan_cache_mode = force_generic_plan``. Nothing is
+executed (no ANALYZE) and every statement runs in a read-only transaction
+that is rolled back.
+
+Plans are cached per server by queryid together with a hash of the query
+text and of the plan shape (node types, relations, indexes, join types), so
+reruns only explain new or stale statements and can tell when a plan changed.
+"""
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import orjson
+
+from ..cache import cache_dir
+from .statements import server_key
+
+CACHE_VERSION = 1
+_EXPLAINABLE_RE = re.compile(r"^\s*\(?\s*(?:select|with|insert|update|delete|values|merge)\b", re.I)
+_PARAM_RE = re.compile(r"\$(\d+)")
+_PREPARED = "odoo_helper_explain"
+
+
+def explainable(query: str) -> bool:
+    return bool(query) and bool(_EXPLAINABLE_RE.match(query))
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+def _shape(node: Dict) -> List:
+    return [
+        node.get("Node Type"), node.get("Relation Name"), node.get("Index Name"), node.get("Join Type"),
+        [_shape(c) for c in node.get("Plans", [])],
+    ]
+
+
+def plan_hash(plan: Dict) -> str:
+    """Hash of the plan's structure; cost and row estimates are left out."""
+    return _sha(orjson.dumps(_shape(plan)))
+
+
+def explain_generic(conn, query: str, statement_timeout: str) -> Dict:
+    """Top plan node of the generic plan for ``query``."""
+    version = conn.info.server_version
+    if version < 120000:
+        raise RuntimeError("generic plans need PostgreSQL 12+ (plan_cache_mode)")
+    nparams = max((int(n) for n in _PARAM_RE.findall(query)), default=0)
+    prepared = False
+    try:
+        with conn.transaction(force_rollback=True), conn.cursor() as cur:
+            cur.execute("SET TRANSACTION READ ONLY")
+            cur.execute("SELECT set_config('statement_timeout', %s, true)", (statement_timeout,))
+            if version >= 160000:
+                cur.execute(f"EXPLAIN (GENERIC_PLAN, FORMAT JSON) {query}")
+            else:
+                cur.execute("SELECT set_config('plan_cache_mode', 'force_generic_plan', true)")
+                cur.execute(f"PREPARE {_PREPARED} AS {query}")
+                prepared = True
+                args = f"({', '.join(['NULL'] * nparams)})" if nparams else ""
+                cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE {_PREPARED}{args}")
+            doc = cur.fetchone()[0]
+    finally:
+        # Prepared statements are not transactional; drop it if it survived the rollback
+        if prepared:
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(f"DEALLOCATE {_PREPARED}")
+            except Exception:
+                pass
+    if isinstance(doc, (str, bytes)):
+        doc = orjson.loads(doc)
+    return doc[0]["Plan"]
+
+
+def _walk(node: Dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from _walk(child)
+
+
+def plan_flags(plan: Dict, reltuples: Dict[str, float], work_mem: int, large_rows: int) -> List[str]:
+    """Seq scans on large tables, nested loops over many outer rows, sorts likely to spill."""
+    flags = []
+    for node in _walk(plan):
+        kind = node.get("Node Type")
+        if kind == "Seq Scan":
+            rel = node.get("Relation Name")
+            rows = reltuples.get(rel, 0)
+            if rows >= large_rows:
+                flags.append(f"seq scan on {rel} (~{rows:,.0f} rows)")
+        elif kind == "Nested Loop":
+            children = node.get("Plans", [])
+            outer = children[0].get("Plan Rows", 0) if children else 0
+            if outer >= large_rows // 10 or node.get("Plan Rows", 0) >= large_rows:
+                flags.append(f"nested loop over ~{outer:,.0f} outer rows (~{node.get('Plan Rows', 0):,.0f} out)")
+        elif kind in ("Sort", "Incremental Sort"):
+            est = node.get("Plan Rows", 0) * node.get("Plan Width", 0)
+            if work_mem and est > work_mem:
+                keys = ", ".join(node.get("Sort Key", []))[:80]
+                flags.append(f"sort on {keys} likely spills to disk (~{est / (1 << 20):,.1f} MiB > work_mem)")
+    return flags
+
+
+def _cache_path(conn) -> Path:
+    return cache_dir("plans") / f"{server_key(conn)}.json"
+
+
+def _load_cache(path: Path) -> Dict:
+    try:
+        data = orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data.get("plans", {}) if data.get("version") == CACHE_VERSION else {}
+
+
+def _save_cache(path: Path, plans: Dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps({"version": CACHE_VERSION, "plans": plans}))
+    tmp.replace(path)
+
+
+def explain_statements(
+    conn,
+    statements: List[Dict],
+    max_age_s: float,
+    refresh: bool,
+    large_rows: int,
+    statement_timeout: str,
+) -> List[Dict]:
+    """Plan, flags and cache status (``cached``/``new``/``changed``/``same``/``error``) per statement."""
+    path = _cache_path(conn)
+    cache = _load_cache(path)
+    now = time.time()
+    out = []
+    for st in statements:
+        qid, query = st.get("queryid"), st.get("query") or ""
+        r = {"queryid": qid, "query": query, "mean_ms": st.get("mean_ms"), "flags": []}
+        if not qid or not explainable(query):
+            r.update(status="skipped", error="not an explainable statement")
+            out.append(r)
+            continue
+        qsha = _sha(query.encode("utf-8", "replace"))
+        entry: Optional[Dict] = cache.get(qid)
+        fresh = entry and entry["query_sha"] == qsha and now - entry["explained_at"] < max_age_s
+        if fresh and not refresh:
+            r.update(status="cached", plan=entry["plan"], plan_hash=entry["plan_hash"])
+        else:
+            try:
+                plan = explain_generic(conn, query, statement_timeout)
+            except Exception as e:
+                msg = str(e).strip()
+                r.update(status="error", error=msg.splitlines()[0] if msg else type(e).__name__)
+                out.append(r)
+                continue
+            h = plan_hash(plan)
+            if entry and entry["query_sha"] == qsha:
+                r["status"] = "same" if entry["plan_hash"] == h else "changed"
+                if entry["plan_hash"] != h:
+                    r["previous_plan_hash"] = entry["plan_hash"]
+            else:
+                r["status"] = "new"
+            r.update(plan=plan, plan_hash=h)
+            cache[qid] = {"query_sha": qsha, "plan_hash": h, "plan": plan, "explained_at": now}
+        out.append(r)
+    _save_cache(path, cache)
+
+    # Flags use current table sizes and work_mem, also for cached plans
+    rels = sorted({n["Relation Name"] for r in out if "plan" in r for n in _walk(r["plan"]) if n.get("Relation Name")})
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_size_bytes(current_setting('work_mem'))")
+        work_mem = cur.fetchone()[0]
+        cur.execute(
+            "SELECT r, (SELECT reltuples FROM pg_class WHERE oid = to_regclass(r)) FROM unnest(%s::text[]) r",
+            (rels,),
+        )
+        reltuples = {name: float(n or 0) for name, n in cur.fetchall()}
+    for r in out:
+        if "plan" in r:
+            r["flags"] = plan_flags(r["plan"], reltuples, work_mem, large_rows)
+    return out
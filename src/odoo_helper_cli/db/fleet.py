@@ -0,0 +1,113 @@
+"""Run one ``db`` check against many databases concurrently.
+
+Each target gets its own async connection; a semaphore bounds how many are
+open at once and every target has its own deadline covering connect and
+query, so a dead or slow node only costs its own timeout.
+"""
+import asyncio
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .connection import APPLICATION_NAME
+from .health import HEALTH_SQL, health_row
+from .statements import EXTENSION_SQL, statement_rows, top_statements_sql
+
+# (label, dsn)
+Target = Tuple[str, str]
+
+
+def _label(dsn: str) -> str:
+    try:
+        from psycopg.conninfo import conninfo_to_dict
+        info = conninfo_to_dict(dsn)
+    except Exception:
+        return dsn
+    host = info.get("host") or "local"
+    port = f":{info['port']}" if info.get("port") else ""
+    return f"{host}{port}/{info.get('dbname') or ''}"
+
+
+def read_dsn_file(path: Path) -> List[Target]:
+    """One target per line: ``dsn`` or ``label dsn``; blank lines and ``#`` comments are skipped.
+
+    The first word is a label unless it already looks like part of a DSN
+    (a URI or a ``key=value`` pair).
+    """
+    targets = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        first, _, rest = line.partition(" ")
+        if rest and "=" not in first and "://" not in first:
+            targets.append((first, rest.strip()))
+        else:
+            targets.append((_label(line), line))
+    return targets
+
+
+async def _ping(cur, params: Dict):
+    await cur.execute("SELECT 1")
+    return (await cur.fetchone())[0]
+
+
+async def _health(cur, params: Dict):
+    started = time.perf_counter()
+    await cur.execute(HEALTH_SQL, {"threshold": params["long_tx_threshold"]})
+    return health_row(await cur.fetchone(), time.perf_counter() - started)
+
+
+async def _slow_queries(cur, params: Dict):
+    await cur.execute(EXTENSION_SQL)
+    if await cur.fetchone() is None:
+        raise RuntimeError("pg_stat_statements is not enabled")
+    await cur.execute(top_statements_sql(cur.connection.info.server_version, params["order_by"]), (params["limit"],))
+    return statement_rows(await cur.fetchall())
+
+
+CHECKS = {"ping": _ping, "health": _health, "slow-queries": _slow_queries}
+
+
+async def _run_check(check: str, dsn: str, params: Dict, timeout: float):
+    import psycopg
+
+    conn = await psycopg.AsyncConnection.connect(
+        dsn, autocommit=True, application_name=APPLICATION_NAME, connect_timeout=max(1, math.ceil(timeout)),
+    )
+    try:
+        async with conn.cursor() as cur:
+            return await CHECKS[check](cur, params)
+    finally:
+        await conn.close()
+
+
+async def _probe(target: Target, check: str, params: Dict, timeout: float, sem: asyncio.Semaphore) -> Dict:
+    label, dsn = target
+    async with sem:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(_run_check(check, dsn, params, timeout), timeout)
+            out = {"target": label, "ok": True, "result": result}
+        except asyncio.TimeoutError:
+            out = {"target": label, "ok": False, "error": f"timed out after {timeout:g}s"}
+        except Exception as e:
+            msg = str(e).strip()
+            out = {"target": label, "ok": False, "error": msg.splitlines()[0] if msg else type(e).__name__}
+        out["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return out
+
+
+async def _fan_out(targets: List[Target], check: str, params: Dict, concurrency: int, timeout: float) -> List[Dict]:
+    sem = asyncio.Semaphore(max(1, concurrency))
+    return list(await asyncio.gather(*(_probe(t, check, params, timeout, sem) for t in targets)))
+
+
+def run_fleet(targets: List[Target], check: str, params: Dict, concurrency: int, timeout: float) -> List[Dict]:
+    """Results in target order; failures carry ``error`` instead of ``result``."""
+    if sys.platform == "win32":
+        # psycopg's async connections need a selector loop on Windows
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    return asyncio.run(_fan_out(targets, check, params, concurrency, timeout))
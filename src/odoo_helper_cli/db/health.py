@@ -0,0 +1,115 @@
+"""Database health probes collected in a single round trip."""
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+# Every probe is a scalar subquery of one statement, so the whole check costs
+# one network round trip; long-running queries come back as a JSON array.
+HEALTH_SQL = """
+SELECT
+  version(),
+  a.active,
+  a.idle,
+  a.total,
+  (SELECT count(*) FROM pg_locks WHERE NOT granted),
+  to_regclass('public.ir_model_data') IS NOT NULL,
+  (SELECT coalesce(json_agg(json_build_object('pid', l.pid, 'duration', l.duration::text, 'query', l.query)
+                            ORDER BY l.duration DESC), '[]'::json)
+   FROM (SELECT pid, now() - query_start AS duration, coalesce(left(query, 140), '') AS query
+         FROM pg_stat_activity
+         WHERE state = 'active' AND now() - query_start > %(threshold)s::interval
+         ORDER BY duration DESC
+         LIMIT 10) l)
+FROM (
+  SELECT
+    coalesce(sum((state = 'active')::int), 0) AS active,
+    coalesce(sum((state = 'idle')::int), 0)   AS idle,
+    count(*)                                  AS total
+  FROM pg_stat_activity
+  WHERE pid <> pg_backend_pid()
+) a
+"""
+
+
+def health_row(row, elapsed: float) -> Dict:
+    version, active, idle, total, waiting_locks, has_imd, long_running = row
+    return {
+        "version": version,
+        "active": active,
+        "idle": idle,
+        "total": total,
+        "waiting_locks": waiting_locks,
+        "has_ir_model_data": has_imd,
+        "long_running": long_running,
+        "elapsed_ms": round(elapsed * 1000, 2),
+    }
+
+
+def fetch_health(conn, long_tx_threshold: str) -> Dict:
+    """Run all health probes; ``elapsed_ms`` is the client-side round-trip time."""
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute(HEALTH_SQL, {"threshold": long_tx_threshold})
+        row = cur.fetchone()
+    return health_row(row, time.perf_counter() - started)
+
+
+# One cheap statement per watch tick: activity and lock gauges plus the
+# cumulative counters of the current database, stamped with server time.
+SAMPLE_SQL = """
+SELECT
+  extract(epoch FROM clock_timestamp()),
+  (SELECT count(*) FILTER (WHERE state = 'active') FROM pg_stat_activity WHERE pid <> pg_backend_pid()),
+  (SELECT count(*) FILTER (WHERE state = 'idle') FROM pg_stat_activity WHERE pid <> pg_backend_pid()),
+  (SELECT count(*) FILTER (WHERE state = 'idle in transaction') FROM pg_stat_activity),
+  (SELECT count(*) FROM pg_locks WHERE NOT granted),
+  d.xact_commit, d.xact_rollback,
+  d.tup_returned + d.tup_fetched,
+  d.tup_inserted + d.tup_updated + d.tup_deleted,
+  d.blks_read, d.blks_hit
+FROM pg_stat_database d
+WHERE d.datname = current_database()
+"""
+_SAMPLE_FIELDS = (
+    "at", "active", "idle", "idle_in_tx", "waiting_locks",
+    "commits", "rollbacks", "tup_read", "tup_written", "blks_read", "blks_hit",
+)
+_COUNTERS = ("commits", "rollbacks", "tup_read", "tup_written")
+
+
+def fetch_sample(conn) -> Dict:
+    with conn.cursor() as cur:
+        cur.execute(SAMPLE_SQL)
+        row = cur.fetchone()
+    sample = dict(zip(_SAMPLE_FIELDS, row))
+    sample["at"] = float(sample["at"])
+    return sample
+
+
+class HealthWatch:
+    """Ring buffer of the last ``size`` ticks: gauges plus per-second rates since the previous sample."""
+
+    def __init__(self, size: int = 60):
+        self.history: Deque[Dict] = deque(maxlen=size)
+        self._last: Optional[Dict] = None
+
+    def add(self, sample: Dict) -> Dict:
+        prev, self._last = self._last, sample
+        row = {k: sample[k] for k in ("at", "active", "idle", "idle_in_tx", "waiting_locks")}
+        dt = sample["at"] - prev["at"] if prev else 0.0
+        for k in _COUNTERS:
+            delta = sample[k] - prev[k] if prev else -1
+            # No previous sample, or counters went backwards after a stats reset
+            row[f"{k}_s"] = delta / dt if dt > 0 and delta >= 0 else None
+        if prev:
+            hit = sample["blks_hit"] - prev["blks_hit"]
+            read = sample["blks_read"] - prev["blks_read"]
+            row["hit_ratio"] = hit / (hit + read) if hit >= 0 and read >= 0 and hit + read else None
+        else:
+            row["hit_ratio"] = None
+        self.history.append(row)
+        return row
+
+    def peak(self, key: str):
+        values = [r[key] for r in self.history if r.get(key) is not None]
+        return max(values) if values else None
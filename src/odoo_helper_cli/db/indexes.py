@@ -0,0 +1,208 @@
+"""Index advice from table/index usage statistics and the catalog.
+
+Four kinds of findings, each with an impact level and a generated statement:
+
+- ``seq-scan``: large tables read mostly by sequential scans;
+- ``missing-fk-index``: single-column foreign keys (Odoo many2one) whose
+  column leads no index, so lookups and parent deletes scan the table;
+- ``unused``: non-unique indexes never scanned since the stats reset;
+- ``duplicate``: indexes identical to, or a leading prefix of, another one.
+
+Usage counters start at the last stats reset and only cover this server, so
+``unused`` findings need checking against replicas before dropping anything.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Odoo tables that grow fastest; missing indexes there hurt earliest
+HOT_TABLES = {
+    "mail_message", "mail_tracking_value", "mail_followers", "mail_notification", "ir_attachment",
+    "account_move_line", "account_move", "stock_move", "stock_move_line", "bus_bus",
+}
+LEVELS = ("high", "medium", "low")
+
+SEQ_SCAN_SQL = """
+SELECT schemaname, relname, seq_scan, seq_tup_read, coalesce(idx_scan, 0), n_live_tup
+FROM pg_stat_user_tables
+WHERE n_live_tup >= %(min_rows)s AND seq_scan > coalesce(idx_scan, 0)
+"""
+MISSING_FK_SQL = """
+SELECT n.nspname, t.relname, a.attname, c.confrelid::regclass::text, c.conname, coalesce(st.n_live_tup, 0)
+FROM pg_constraint c
+JOIN pg_class t ON t.oid = c.conrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = c.conkey[1]
+LEFT JOIN pg_stat_user_tables st ON st.relid = c.conrelid
+WHERE c.contype = 'f'
+  AND array_length(c.conkey, 1) = 1
+  AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+  AND coalesce(st.n_live_tup, 0) >= %(min_rows)s
+  AND NOT EXISTS (SELECT 1 FROM pg_index i WHERE i.indrelid = c.conrelid AND i.indkey[0] = c.conkey[1])
+"""
+UNUSED_SQL = """
+SELECT s.schemaname, s.relname, s.indexrelname, pg_relation_size(s.indexrelid),
+       t.n_tup_ins + t.n_tup_upd + t.n_tup_del
+FROM pg_stat_user_indexes s
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+JOIN pg_stat_user_tables t ON t.relid = s.relid
+WHERE s.idx_scan = 0
+  AND NOT i.indisunique AND NOT i.indisprimary
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = s.indexrelid)
+"""
+INDEXES_SQL = """
+SELECT n.nspname, t.relname, ic.relname, i.indkey::text, i.indclass::text,
+       coalesce(pg_get_expr(i.indexprs, i.indrelid), ''), coalesce(pg_get_expr(i.indpred, i.indrelid), ''),
+       am.amname, i.indisunique OR i.indisprimary, pg_relation_size(i.indexrelid)
+FROM pg_index i
+JOIN pg_class ic ON ic.oid = i.indexrelid
+JOIN pg_class t ON t.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+JOIN pg_am am ON am.oid = ic.relam
+WHERE n.nspname NOT IN ('pg_catalog', 'information_schema', 'pg_toast')
+"""
+STATS_RESET_SQL = "SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()"
+
+_PLAIN_IDENT_RE = re.compile(r"^[a-z_][a-z0-9_$]*$")
+
+
+def quote_ident(name: str) -> str:
+    return name if _PLAIN_IDENT_RE.match(name) else '"' + name.replace('"', '""') + '"'
+
+
+def _qualified(schema: str, name: str) -> str:
+    return quote_ident(name) if schema == "public" else f"{quote_ident(schema)}.{quote_ident(name)}"
+
+
+def _level(score: float, high: float, medium: float) -> str:
+    return "high" if score >= high else "medium" if score >= medium else "low"
+
+
+def create_index_sql(schema: str, table: str, column: str) -> str:
+    # Odoo names single-column indexes <table>_<column>_index
+    name = f"{table}_{column}_index"[:63]
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote_ident(name)} "
+        f"ON {_qualified(schema, table)} ({quote_ident(column)});"
+    )
+
+
+def drop_index_sql(schema: str, index: str) -> str:
+    return f"DROP INDEX CONCURRENTLY IF EXISTS {_qualified(schema, index)};"
+
+
+def missing_fk_findings(rows) -> List[Dict]:
+    out = []
+    for schema, table, column, target, conname, live in rows:
+        hot = table in HOT_TABLES
+        # Hot Odoo tables grow into trouble, so they rank as if ten times larger
+        score = live * (10 if hot else 1)
+        out.append({
+            "kind": "missing-fk-index",
+            "table": f"{schema}.{table}",
+            "detail": f"{column} → {target} ({conname}) has no index; {live:,} rows" + (" (hot Odoo table)" if hot else ""),
+            "score": score,
+            "impact": _level(score, 1_000_000, 10_000),
+            "sql": create_index_sql(schema, table, column),
+        })
+    return out
+
+
+def seq_scan_findings(rows, fk_by_table: Dict[str, List[str]]) -> List[Dict]:
+    out = []
+    for schema, table, seq_scan, seq_tup_read, idx_scan, live in rows:
+        avg = seq_tup_read // max(seq_scan, 1)
+        fk_sql = fk_by_table.get(f"{schema}.{table}", [])
+        out.append({
+            "kind": "seq-scan",
+            "table": f"{schema}.{table}",
+            "detail": (
+                f"{seq_scan:,} seq scans vs {idx_scan:,} index scans, ~{avg:,} rows each, {live:,} live rows"
+                + ("; unindexed foreign keys below" if fk_sql else "; find the filtering columns with slow-queries")
+            ),
+            "score": seq_tup_read,
+            "impact": _level(seq_tup_read, 1e10, 1e8),
+            "sql": "\n".join(fk_sql) or None,
+        })
+    return out
+
+
+def unused_findings(rows) -> List[Dict]:
+    out = []
+    for schema, table, index, size, writes in rows:
+        out.append({
+            "kind": "unused",
+            "table": f"{schema}.{table}",
+            "detail": f"{index}: never scanned, {size / (1 << 20):,.1f} MiB, maintained on {writes:,} row writes",
+            "score": size,
+            "impact": _level(size, 1 << 30, 100 << 20),
+            "sql": drop_index_sql(schema, index),
+        })
+    return out
+
+
+def duplicate_findings(rows) -> List[Dict]:
+    """Exact duplicates and btree indexes whose columns lead another btree index."""
+    by_table: Dict[Tuple[str, str], List[Tuple]] = defaultdict(list)
+    for row in rows:
+        by_table[(row[0], row[1])].append(row)
+    out = []
+    for (schema, table), idx in by_table.items():
+        flagged = set()
+        for a in idx:
+            _, _, a_name, a_key, a_cls, a_expr, a_pred, a_am, a_unique, a_size = a
+            if a_unique or a_name in flagged:
+                continue
+            for b in idx:
+                _, _, b_name, b_key, b_cls, b_expr, b_pred, b_am, b_unique, _ = b
+                if b is a or b_name in flagged or a_am != b_am or a_expr != b_expr or a_pred != b_pred:
+                    continue
+                if (a_key, a_cls) == (b_key, b_cls):
+                    # Keep one of two identical non-unique indexes: the first by name
+                    if not b_unique and a_name < b_name:
+                        continue
+                    reason = f"same definition as {b_name}"
+                elif a_am == "btree" and not a_expr and b_key.startswith(a_key + " ") and b_cls.startswith(a_cls + " "):
+                    reason = f"leading columns of {b_name}"
+                else:
+                    continue
+                flagged.add(a_name)
+                out.append({
+                    "kind": "duplicate",
+                    "table": f"{schema}.{table}",
+                    "detail": f"{a_name}: {reason}, {a_size / (1 << 20):,.1f} MiB",
+                    "score": a_size,
+                    "impact": _level(a_size, 1 << 30, 100 << 20),
+                    "sql": drop_index_sql(schema, a_name),
+                })
+                break
+    return out
+
+
+def advise(conn, min_rows: int) -> Tuple[List[Dict], Optional[str]]:
+    """All findings ranked by impact level, then score; plus the stats reset time."""
+    params = {"min_rows": min_rows}
+    with conn.cursor() as cur:
+        cur.execute(MISSING_FK_SQL, params)
+        fk_rows = cur.fetchall()
+        cur.execute(SEQ_SCAN_SQL, params)
+        seq_rows = cur.fetchall()
+        cur.execute(UNUSED_SQL)
+        unused_rows = cur.fetchall()
+        cur.execute(INDEXES_SQL)
+        index_rows = cur.fetchall()
+        cur.execute(STATS_RESET_SQL)
+        row = cur.fetchone()
+    stats_reset = row[0].isoformat(timespec="seconds") if row and row[0] else None
+
+    fk = missing_fk_findings(fk_rows)
+    fk_by_table: Dict[str, List[str]] = defaultdict(list)
+    for f in fk:
+        fk_by_table[f["table"]].append(f["sql"])
+    dup = duplicate_findings(index_rows)
+    dup_sql = {f["sql"] for f in dup}
+    # An unused duplicate is reported once, as a duplicate
+    unused = [f for f in unused_findings(unused_rows) if f["sql"] not in dup_sql]
+    findings = fk + seq_scan_findings(seq_rows, fk_by_table) + unused + dup
+    findings.sort(key=lambda f: (LEVELS.index(f["impact"]), -f["score"]))
+    return findings, stats_reset
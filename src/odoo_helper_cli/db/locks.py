@@ -0,0 +1,160 @@
+"""Lock wait-for graph from ``pg_blocking_pids``.
+
+Only sessions waiting on a heavyweight lock can have blockers, so
+``pg_blocking_pids`` is called for those alone; their blockers are added as
+nodes. Edges point from waiter to blocker. Roots are blockers that wait on
+nobody: ending them releases everything below. Cycles are deadlocks that the
+server has not resolved yet (it checks after ``deadlock_timeout``).
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+LOCKS_SQL = """
+WITH w AS (
+  SELECT pid, pg_blocking_pids(pid) AS blockers
+  FROM pg_stat_activity
+  WHERE wait_event_type = 'Lock'
+), nodes AS (
+  SELECT pid FROM w
+  UNION
+  SELECT unnest(blockers) FROM w
+)
+SELECT n.pid, coalesce(w.blockers, '{}'::int[]), a.usename, a.application_name, a.state,
+       extract(epoch FROM a.xact_start)::float8, extract(epoch FROM now())::float8,
+       left(a.query, 300),
+       (SELECT string_agg(DISTINCT coalesce(l.relation::regclass::text, l.locktype) || ' (' || l.mode || ')', ', ')
+        FROM pg_locks l WHERE l.pid = n.pid AND NOT l.granted)
+FROM nodes n
+LEFT JOIN pg_stat_activity a ON a.pid = n.pid
+LEFT JOIN w ON w.pid = n.pid
+"""
+
+
+def fetch_nodes(conn) -> Dict[int, Dict]:
+    """Sessions in the wait-for graph by pid; pid 0 stands for prepared transactions."""
+    with conn.cursor() as cur:
+        cur.execute(LOCKS_SQL)
+        rows = cur.fetchall()
+    nodes = {}
+    for pid, blockers, user, app, state, xact_start, now, query, waiting_on in rows:
+        nodes[pid] = {
+            "pid": pid,
+            "blocked_by": sorted(set(blockers)),
+            "user": user,
+            "application": app,
+            "state": state if pid else "prepared transaction",
+            "xact_start": xact_start,
+            "xact_age_s": round(now - xact_start, 1) if xact_start else None,
+            "query": query or "",
+            "waiting_on": waiting_on,
+        }
+    return nodes
+
+
+def _waiters(nodes: Dict[int, Dict]) -> Dict[int, List[int]]:
+    out: Dict[int, List[int]] = {pid: [] for pid in nodes}
+    for pid, n in nodes.items():
+        for b in n["blocked_by"]:
+            out.setdefault(b, []).append(pid)
+    for lst in out.values():
+        lst.sort()
+    return out
+
+
+def find_cycles(nodes: Dict[int, Dict]) -> List[List[int]]:
+    """Strongly connected components with a cycle (Tarjan, iterative)."""
+    index: Dict[int, int] = {}
+    low: Dict[int, int] = {}
+    on_stack: Set[int] = set()
+    stack: List[int] = []
+    cycles = []
+    counter = 0
+    for start in nodes:
+        if start in index:
+            continue
+        work: List[Tuple[int, Iterable[int]]] = [(start, iter(nodes[start]["blocked_by"]))]
+        index[start] = low[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in nodes:
+                    continue
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(nodes[w]["blocked_by"])))
+                    break
+                if w in on_stack:
+                    low[v] = min(low[v], index[w])
+            else:
+                work.pop()
+                if work:
+                    low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                if low[v] == index[v]:
+                    comp = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        comp.append(w)
+                        if w == v:
+                            break
+                    if len(comp) > 1 or v in nodes[v]["blocked_by"]:
+                        cycles.append(sorted(comp))
+    return cycles
+
+
+def build_graph(nodes: Dict[int, Dict]) -> Dict:
+    """Roots with their blocked trees, longest chain depth and total blocked sessions, plus cycles."""
+    waiters = _waiters(nodes)
+
+    def subtree(pid: int, seen: Set[int]) -> Dict:
+        seen.add(pid)
+        children = [subtree(w, seen) for w in waiters.get(pid, []) if w not in seen]
+        return {
+            "pid": pid,
+            "children": children,
+            "blocked": sum(1 + c["blocked"] for c in children),
+            "depth": 1 + max((c["depth"] for c in children), default=0),
+        }
+
+    roots = []
+    for pid, n in nodes.items():
+        if not n["blocked_by"] and waiters.get(pid):
+            roots.append(subtree(pid, set()))
+    roots.sort(key=lambda r: (r["blocked"], r["depth"]), reverse=True)
+    return {"roots": roots, "cycles": find_cycles(nodes), "waiting": sum(1 for n in nodes.values() if n["blocked_by"])}
+
+
+class ChainTracker:
+    """How long each root blocker has been seen across samples, keyed by (pid, transaction start)."""
+
+    def __init__(self):
+        self.roots: Dict[Tuple[int, Optional[float]], Dict] = {}
+        self.samples = 0
+
+    def add(self, at: float, nodes: Dict[int, Dict], graph: Dict) -> None:
+        self.samples += 1
+        for r in graph["roots"]:
+            n = nodes[r["pid"]]
+            key = (r["pid"], n["xact_start"])
+            seen = self.roots.get(key)
+            if seen is None:
+                seen = self.roots[key] = {
+                    "pid": r["pid"], "first_seen": at, "samples": 0, "max_blocked": 0, "max_depth": 0,
+                    "query": n["query"],
+                }
+            seen["last_seen"] = at
+            seen["samples"] += 1
+            seen["max_blocked"] = max(seen["max_blocked"], r["blocked"])
+            seen["max_depth"] = max(seen["max_depth"], r["depth"])
+
+    def summary(self) -> List[Dict]:
+        out = []
+        for s in self.roots.values():
+            out.append({**s, "persisted_s": round(s["last_seen"] - s["first_seen"], 1)})
+        out.sort(key=lambda s: (s["persisted_s"], s["max_blocked"]), reverse=True)
+        return out
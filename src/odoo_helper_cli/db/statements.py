@@ -0,0 +1,186 @@
+"""pg_stat_statements capture, local snapshots and interval diffs.
+
+Counters in pg_stat_statements are cumulative since the last stats reset, so
+"what is slow right now" is the difference of two captures. Snapshots are
+stored compactly (one row array per statement) as orjson files under
+``~/.cache/odoo-helper/pgss/<server>/``.
+"""
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import orjson
+
+from ..cache import cache_dir
+
+SNAPSHOT_VERSION = 1
+# Stored per statement, in this order, after the key
+FIELDS = ("calls", "total_ms", "rows", "shared_blks_read", "shared_blks_hit", "query")
+ORDER_KEYS = {
+    "total_time": "total_ms",
+    "mean_time": "mean_ms",
+    "calls": "calls",
+    "blks_read": "shared_blks_read",
+}
+QUERY_TEXT_MAX = 2000
+
+
+def timing_columns(server_version: int) -> Tuple[str, str]:
+    """(total, mean) column names: PostgreSQL 13 renamed them to ``*_exec_time``."""
+    if server_version >= 130000:
+        return "total_exec_time", "mean_exec_time"
+    return "total_time", "mean_time"
+
+
+EXTENSION_SQL = "SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'"
+
+
+def has_extension(conn) -> bool:
+    with conn.cursor() as cur:
+        cur.execute(EXTENSION_SQL)
+        return cur.fetchone() is not None
+
+
+def top_statements_sql(server_version: int, order_by: str) -> str:
+    """Cumulative top statements of the current database, ordered server-side; takes a limit parameter."""
+    total_col, mean_col = timing_columns(server_version)
+    order_col = {
+        "total_time": total_col, "mean_time": mean_col, "calls": "calls", "blks_read": "shared_blks_read",
+    }[order_by]
+    return f"""
+        SELECT queryid::text, query, calls, {total_col}, {mean_col}, shared_blks_read
+        FROM pg_stat_statements
+        WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+        ORDER BY {order_col} DESC
+        LIMIT %s
+    """
+
+
+def statement_rows(rows) -> List[Dict]:
+    return [
+        {"queryid": qid, "query": q, "calls": calls, "total_ms": total, "mean_ms": mean, "shared_blks_read": blks}
+        for qid, q, calls, total, mean, blks in rows
+    ]
+
+
+def top_statements(conn, order_by: str, limit: int) -> List[Dict]:
+    with conn.cursor() as cur:
+        cur.execute(top_statements_sql(conn.info.server_version, order_by), (limit,))
+        return statement_rows(cur.fetchall())
+
+
+def query_texts(conn, queryids: List[str]) -> Dict[str, str]:
+    """Full statement text by queryid (snapshots keep a truncated copy)."""
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT queryid::text, query FROM pg_stat_statements
+            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+              AND queryid::text = ANY(%s)
+            """,
+            (queryids,),
+        )
+        return dict(cur.fetchall())
+
+
+def capture(conn) -> Dict:
+    """Every statement of the current database, keyed by ``userid:queryid``."""
+    total_col, _ = timing_columns(conn.info.server_version)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"""
+            SELECT userid::text || ':' || queryid::text, calls, {total_col}, rows,
+                   shared_blks_read, shared_blks_hit, left(query, %s)
+            FROM pg_stat_statements
+            WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+              AND queryid IS NOT NULL
+            """,
+            (QUERY_TEXT_MAX,),
+        )
+        rows = {r[0]: list(r[1:]) for r in cur.fetchall()}
+    return {
+        "version": SNAPSHOT_VERSION,
+        "taken_at": time.time(),
+        "server_version": conn.info.server_version,
+        "fields": list(FIELDS),
+        "rows": rows,
+    }
+
+
+def server_key(conn) -> str:
+    """``<dbname>-<hash of host:port/dbname>``: stable per database, without credentials."""
+    info = conn.info
+    digest = hashlib.sha1(f"{info.host}:{info.port}/{info.dbname}".encode()).hexdigest()[:12]
+    return f"{info.dbname}-{digest}"
+
+
+def snapshot_dir(conn) -> Path:
+    return cache_dir("pgss", server_key(conn))
+
+
+def save_snapshot(directory: Path, snap: Dict) -> Path:
+    name = time.strftime("%Y%m%dT%H%M%S", time.localtime(snap["taken_at"]))
+    path = directory / f"{name}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(orjson.dumps(snap))
+    tmp.replace(path)
+    return path
+
+
+def list_snapshots(directory: Path) -> List[Path]:
+    return sorted(directory.glob("*.json"))
+
+
+def load_snapshot(directory: Path, ref: str) -> Dict:
+    """Load by path, by name (with or without .json) or ``latest``."""
+    if ref == "latest":
+        snaps = list_snapshots(directory)
+        if not snaps:
+            raise FileNotFoundError(f"no snapshots in {directory}")
+        path = snaps[-1]
+    else:
+        path = Path(ref)
+        if not path.exists():
+            path = directory / (ref if ref.endswith(".json") else f"{ref}.json")
+    snap = orjson.loads(path.read_bytes())
+    if snap.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"{path}: unsupported snapshot version")
+    return snap
+
+
+def diff(old: Dict, new: Dict) -> List[Dict]:
+    """Per-statement deltas between two snapshots; statements without new calls are dropped.
+
+    A statement whose counters went backwards was reset (pg_stat_statements_reset()
+    or eviction), so its new values are taken as the delta.
+    """
+    elapsed = new["taken_at"] - old["taken_at"]
+    out = []
+    before = old["rows"]
+    for key, cur in new["rows"].items():
+        calls, total, rows, blks_read, blks_hit, query = cur
+        prev = before.get(key)
+        if prev is not None and prev[0] <= calls and prev[1] <= total:
+            calls, total = calls - prev[0], total - prev[1]
+            rows, blks_read, blks_hit = rows - prev[2], blks_read - prev[3], blks_hit - prev[4]
+        if calls <= 0:
+            continue
+        out.append({
+            "queryid": key.split(":", 1)[1],
+            "query": query,
+            "calls": calls,
+            "total_ms": total,
+            "mean_ms": total / calls,
+            "rows": rows,
+            "shared_blks_read": blks_read,
+            "shared_blks_hit": blks_hit,
+            "calls_s": calls / elapsed if elapsed > 0 else None,
+        })
+    return out
+
+
+def rank(entries: List[Dict], order_by: str, limit: int) -> List[Dict]:
+    key = ORDER_KEYS[order_by]
+    return sorted(entries, key=lambda e: e[key], reverse=True)[:limit]
+
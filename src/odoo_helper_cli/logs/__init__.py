@@ -1,172 +1,63 @@
+import os
+import sqlite3
+import time
+from datetime import datetime
 import typer
 from rich.console import Console
 from pathlib import Path
-from datetime import datetime
-from typing import List, Dict, Optional
-import re
+from itertools import chain
+from typing import Iterable, List, Dict, Optional, Tuple
+
+from ..cache import cache_dir
+from . import store
+from .follow import Follower, default_checkpoint
+from .hints import get_engine
+from .index import ensure_index, seek_range
+from .parallel import analyze_parallel, map_chunks, plan_chunks
+from .perf import PerfStats, aggregate, merge_stats, perf_chunk
+from .parser import GroupTable, block_record, in_window, iter_blocks, merge_by_time, parse_user_ts
+from .reader import expand_paths, is_gzip, iter_lines, rotated_files
 
 app = typer.Typer()
 console = Console()
 
 
-@app.command("analyze")
-def analyze(
-    path: Path = typer.Option(..., exists=True, readable=True, help="Path to odoo.log"),
-    since: str = typer.Option(None, help="Start time (e.g., '2025-01-01 00:00:00')"),
-    until: str = typer.Option(None, help="End time"),
-    group: bool = typer.Option(True, help="Group repeated tracebacks"),
-    suggest: bool = typer.Option(True, help="Show Odoo-specific hints"),
-    output: str = typer.Option("rich", help="Output format: rich|json"),
-):
-    """Analyze Odoo server logs and surface errors with actionable hints."""
+def _sources(patterns: List[str], rotated: bool) -> Dict[str, List[Path]]:
+    """Map each log given on the command line to its files (rotated siblings first)."""
     try:
-        lines = path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    except Exception as e:
+        paths = expand_paths(patterns)
+    except FileNotFoundError as e:
         console.print(f"[red]Failed to read log: {e}")
         raise typer.Exit(code=1)
+    return {str(p): rotated_files(p) if rotated else [p] for p in paths}
 
-    ts_re = re.compile(r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})?)")
-    def parse_ts(line: str) -> Optional[datetime]:
-        m = ts_re.match(line)
-        if not m:
-            return None
-        raw = m.group("ts").replace(",", ".")
-        fmts = ["%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"]
-        for f in fmts:
-            try:
-                return datetime.strptime(raw, f)
-            except Exception:
-                continue
-        return None
-
-    def parse_user_ts(s: Optional[str]) -> Optional[datetime]:
-        if not s:
-            return None
-        for f in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
-            try:
-                return datetime.strptime(s, f)
-            except Exception:
-                continue
-        return None
-
-    since_dt = parse_user_ts(since)
-    until_dt = parse_user_ts(until)
-
-    # Collect traceback blocks with metadata
-    blocks: List[Dict] = []
-    i = 0
-    n = len(lines)
-    while i < n:
-        line = lines[i]
-        if "Traceback (most recent call last):" in line:
-            # Backtrack to nearest timestamp for this block
-            ts = None
-            for j in range(i, max(-1, i - 5), -1):
-                ts = parse_ts(lines[j]) or ts
-                if ts:
-                    break
-            block = [line]
-            i += 1
-            while i < n:
-                block.append(lines[i])
-                # Stop if we hit a new timestamped log line (likely next record)
-                if ts_re.match(lines[i]) and i != len(block) - 1:
-                    block.pop()  # don't include the next record header
-                    break
-                # Heuristic end: blank line separating records
-                if lines[i].strip() == "" and len(block) > 1:
-                    break
-                i += 1
-            # Extract exception line (usually the last non-empty line)
-            exc_line = next((l for l in reversed(block) if l.strip()), "")
-            m = re.match(r"^(?P<exc>[A-Za-z_][\w.]*)(?::\s*(?P<msg>.*))?", exc_line.strip())
-            exc = m.group("exc") if m else "UnknownException"
-            msg = (m.group("msg") or "").strip() if m else exc_line.strip()
-
-            # Time filter
-            if since_dt or until_dt:
-                ts_ok = True
-                if since_dt and (not ts or ts < since_dt):
-                    ts_ok = False
-                if until_dt and (not ts or ts > until_dt):
-                    ts_ok = False
-                if not ts_ok:
-                    i += 1
-                    continue
-
-            blocks.append({
-                "timestamp": ts.isoformat() if ts else None,
-                "exception": exc,
-                "message": msg,
-                "snippet": "\n".join(block[-20:]),
-            })
-        else:
-            i += 1
-
-    # Grouping
-    if group:
-        groups: Dict[str, Dict] = {}
-        for b in blocks:
-            key = f"{b['exception']}|{(b['message'] or '')[:120]}"
-            g = groups.setdefault(key, {
-                "exception": b["exception"],
-                "message": b["message"],
-                "count": 0,
-                "first_ts": b["timestamp"],
-                "examples": [],
-            })
-            g["count"] += 1
-            if not g["first_ts"] and b["timestamp"]:
-                g["first_ts"] = b["timestamp"]
-            if len(g["examples"]) < 3:
-                g["examples"].append(b["snippet"])
-
-        results = list(groups.values())
-    else:
-        results = [{
-            "exception": b["exception"],
-            "message": b["message"],
-            "timestamp": b["timestamp"],
-            "snippet": b["snippet"],
-            "count": 1,
-        } for b in blocks]
-
-    # Hints
-    hint_rules = [
-        (re.compile(r"External ID|xmlid|No matching record found for external id", re.I),
-         "External ID not found. Check ir.model.data, data XML load order, and module dependency sequence."),
-        (re.compile(r"duplicate key value violates unique constraint|UniqueViolation", re.I),
-         "Unique constraint violation. Identify offending records; consider cleanup SQL and ensure data XML doesn't insert duplicates."),
-        (re.compile(r"psycopg\..*OperationalError|could not connect to server|connection refused", re.I),
-         "Database connectivity issue. Verify DSN, service availability, and locks during migrations."),
-        (re.compile(r"QWebException|Could not render|view architecture.*error|XPath|has no field", re.I),
-         "View/QWeb error. Inspect the mentioned XML/view, ensure fields exist and XPath targets match after updates."),
-        (re.compile(r"KeyError: '.*' in.*ir\.ui\.view|render", re.I),
-         "Template key error. Check context variables and t-foreach/t-as names in QWeb."),
-        (re.compile(r"cache miss|missing dependency|_inherit.*not found", re.I),
-         "Model inheritance conflict. Ensure module dependencies and load order; verify _name vs _inherit correctness."),
-        (re.compile(r'relation ".*" does not exist|column ".*" does not exist', re.I),
-         "Broken DB schema after update. Run -u for impacted modules and validate migrations/ORM field definitions."),
-    ]
-
-    def mk_hints(text: str) -> List[str]:
-        out = []
-        for rx, hint in hint_rules:
-            if rx.search(text or ""):
-                out.append(hint)
-        return out
 
-    if suggest:
-        for r in results:
-            joined = f"{r.get('exception','')} {r.get('message','')}\n{''.join(r.get('examples', []))}"
-            r["hints"] = mk_hints(joined)
+def _window_ranges(files: List[Path], since: Optional[int], until: Optional[int]) -> Dict[Path, Tuple[int, Optional[int]]]:
+    """Byte windows of plain files covering [since, until], from the timestamp index."""
+    ranges: Dict[Path, Tuple[int, Optional[int]]] = {}
+    if since is not None or until is not None:
+        for f in files:
+            if not is_gzip(f):
+                ranges[f] = seek_range(ensure_index(f), since, until)
+    return ranges
 
-    # Output
+
+def _add_hints(results: List[Dict], rules: Optional[List[Path]]) -> None:
+    try:
+        engine = get_engine(rules or [])
+    except (OSError, ValueError) as e:
+        console.print(f"[red]Failed to load rule pack: {e}")
+        raise typer.Exit(code=2)
+    for r in results:
+        joined = f"{r.get('exception','')} {r.get('message','')}\n{''.join(r.get('examples', []))}"
+        r["hints"] = engine.hints(joined)
+
+
+def _render(results: List[Dict], output: str, show_sources: bool) -> None:
     if output == "json":
         console.print_json(data=results)
         return
 
-    # Rich output
     if not results:
         console.print("[green]No tracebacks found in the selected range.")
         return
@@ -178,14 +69,384 @@ def analyze(
     table.add_column("Message", overflow="fold")
     table.add_column("First Seen", no_wrap=True)
     table.add_column("Hints", overflow="fold")
+    if show_sources:
+        table.add_column("Sources", overflow="fold")
 
     for r in sorted(results, key=lambda x: x.get("count", 1), reverse=True):
         hints = "\n- " + "\n- ".join(r.get("hints", [])) if r.get("hints") else ""
-        table.add_row(
+        row = [
             str(r.get("count", 1)),
             r.get("exception", ""),
             (r.get("message") or "").strip()[:200],
             (r.get("first_ts") or r.get("timestamp") or "")[:23],
             hints.strip(),
+        ]
+        if show_sources:
+            per_source = r.get("sources") or {r.get("source", ""): 1}
+            row.append("\n".join(f"{src}: {n}" for src, n in sorted(per_source.items(), key=lambda kv: -kv[1])))
+        table.add_row(*row)
+    console.print(table)
+
+
+@app.command("analyze")
+def analyze(
+    path: List[str] = typer.Option(..., help="Path or glob of odoo.log (plain or .gz); repeat for several nodes"),
+    rotated: bool = typer.Option(False, help="Also read rotated siblings (odoo.log.1 … .N[.gz]), oldest first"),
+    since: str = typer.Option(None, help="Start time (e.g., '2025-01-01 00:00:00')"),
+    until: str = typer.Option(None, help="End time"),
+    group: bool = typer.Option(True, help="Group repeated tracebacks"),
+    fingerprint: bool = typer.Option(True, help="Group by normalized fingerprint instead of exact exception|message"),
+    top: Optional[int] = typer.Option(None, min=1, help="Keep at most K groups (Space-Saving heavy hitters; counts become upper bounds)"),
+    suggest: bool = typer.Option(True, help="Show Odoo-specific hints"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+    jobs: int = typer.Option(1, help="Worker processes for parsing (0 = all cores)"),
+    index: bool = typer.Option(True, help="Seek via a cached timestamp index when --since/--until is set"),
+    rules: Optional[List[Path]] = typer.Option(None, exists=True, readable=True, help="Extra hint rule pack (TOML/YAML); repeatable"),
+):
+    """Analyze Odoo server logs and surface errors with actionable hints."""
+    since_ms = parse_user_ts(since)
+    until_ms = parse_user_ts(until)
+    sources = _sources(path, rotated)
+    files = [f for fs in sources.values() for f in fs]
+    # Several sources are merged by time and counted per source
+    labels = {f: label for label, fs in sources.items() for f in fs} if len(sources) > 1 else None
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    grouping = GroupTable(fingerprints=fingerprint, top=top) if group else None
+
+    try:
+        ranges = _window_ranges(files, since_ms, until_ms) if index else {}
+        if jobs > 1:
+            results = analyze_parallel(files, jobs, since_ms, until_ms, grouping, ranges, labels)
+        else:
+            def source_blocks(fs: List[Path]) -> Iterable[Dict]:
+                # Traceback blocks are streamed file by file; nothing holds the whole log
+                blocks = chain.from_iterable(iter_blocks(iter_lines(f, *ranges.get(f, (0, None)))) for f in fs)
+                if since_ms is not None or until_ms is not None:
+                    blocks = (b for b in blocks if in_window(b["ts"], since_ms, until_ms))
+                return blocks
+
+            if labels:
+                blocks = merge_by_time([(label, source_blocks(fs)) for label, fs in sources.items()])
+            else:
+                blocks = source_blocks(files)
+            if grouping is not None:
+                for b in blocks:
+                    grouping.add(b)
+                results = grouping.results()
+            else:
+                results = [block_record(b) for b in blocks]
+    except OSError as e:
+        console.print(f"[red]Failed to read log: {e}")
+        raise typer.Exit(code=1)
+
+    if suggest:
+        _add_hints(results, rules)
+    _render(results, output, show_sources=bool(labels))
+
+
+@app.command("follow")
+def follow(
+    path: Path = typer.Option(..., exists=True, readable=True, help="Path to odoo.log"),
+    interval: float = typer.Option(10.0, help="Seconds between delta summaries"),
+    checkpoint: Optional[Path] = typer.Option(None, help="Checkpoint file (default: under ~/.cache/odoo-helper/follow)"),
+    reset: bool = typer.Option(False, help="Ignore any existing checkpoint"),
+    from_end: bool = typer.Option(False, help="Without a checkpoint, skip existing content instead of reading it"),
+    fingerprint: bool = typer.Option(True, help="Group by normalized fingerprint instead of exact exception|message"),
+    top: Optional[int] = typer.Option(None, min=1, help="Keep at most K groups (Space-Saving heavy hitters)"),
+    once: bool = typer.Option(False, help="Process what is new, emit one summary and exit (for cron)"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Tail odoo.log and report new or increased traceback groups, resuming from a checkpoint."""
+    from rich.table import Table
+
+    ck = checkpoint or default_checkpoint(path)
+    fol = Follower(path, ck, GroupTable(fingerprints=fingerprint, top=top))
+    if reset or not fol.load():
+        if from_end:
+            fol.skip_to_end()
+
+    def emit() -> None:
+        rows = fol.delta()
+        now = datetime.now().isoformat(timespec="seconds")
+        if output == "json":
+            if rows or once:
+                console.print_json(data={"at": now, "groups": rows}, indent=None)
+            return
+        if not rows:
+            if once:
+                console.print("[green]No new tracebacks.")
+            return
+        table = Table(title=f"New/increased tracebacks @ {now}")
+        table.add_column("Δ", justify="right")
+        table.add_column("Total", justify="right")
+        table.add_column("Exception")
+        table.add_column("Message", overflow="fold")
+        for r in rows:
+            table.add_row(
+                f"[bold red]+{r['delta']}" if r["new"] else f"+{r['delta']}",
+                str(r["count"]),
+                r["exception"],
+                (r["message"] or "").strip()[:200],
+            )
+        console.print(table)
+
+    try:
+        while True:
+            fol.poll()
+            emit()
+            fol.save()
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        fol.save()
+    except OSError as e:
+        console.print(f"[red]Failed to follow log: {e}")
+        raise typer.Exit(code=1)
+
+
+@app.command("perf")
+def perf(
+    path: List[str] = typer.Option(..., help="Path or glob of odoo.log (plain or .gz); repeatable"),
+    rotated: bool = typer.Option(False, help="Also read rotated siblings (odoo.log.1 … .N[.gz]), oldest first"),
+    since: str = typer.Option(None, help="Start time (e.g., '2025-01-01 00:00:00')"),
+    until: str = typer.Option(None, help="End time"),
+    by: str = typer.Option("route", help="Aggregate per route or per model (call_kw/call_button)"),
+    sort: str = typer.Option("total", help="Order by total (summed latency), p95 or count"),
+    limit: int = typer.Option(30, help="Rows to show"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+    jobs: int = typer.Option(1, help="Worker processes for parsing (0 = all cores)"),
+    index: bool = typer.Option(True, help="Seek via a cached timestamp index when --since/--until is set"),
+):
+    """Per-route or per-model request latency and SQL query distributions from werkzeug lines."""
+    if by not in {"route", "model"}:
+        console.print("[red]--by must be 'route' or 'model'")
+        raise typer.Exit(code=2)
+    sort_keys = {
+        "total": lambda st: st.latency.total,
+        "p95": lambda st: st.latency.quantile(0.95),
+        "count": lambda st: st.count,
+    }
+    if sort not in sort_keys:
+        console.print("[yellow]Invalid sort. Using total")
+        sort = "total"
+
+    since_ms = parse_user_ts(since)
+    until_ms = parse_user_ts(until)
+    files = [f for fs in _sources(path, rotated).values() for f in fs]
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+
+    stats: Dict[str, PerfStats] = {}
+    try:
+        ranges = _window_ranges(files, since_ms, until_ms) if index else {}
+        if jobs > 1:
+            for part in map_chunks(perf_chunk, plan_chunks(files, jobs, ranges), jobs, since_ms, until_ms, by):
+                merge_stats(stats, part)
+        else:
+            for f in files:
+                merge_stats(stats, aggregate(iter_lines(f, *ranges.get(f, (0, None))), by, since_ms, until_ms))
+    except OSError as e:
+        console.print(f"[red]Failed to read log: {e}")
+        raise typer.Exit(code=1)
+
+    ranked = sorted(stats.items(), key=lambda kv: sort_keys[sort](kv[1]), reverse=True)[:limit]
+    if output == "json":
+        console.print_json(data=[{by: key, **st.to_dict()} for key, st in ranked])
+        return
+    if not ranked:
+        console.print("[yellow]No werkzeug request lines with timing found. Is log_level at least info?")
+        return
+
+    from rich.table import Table
+    table = Table(title=f"Request performance by {by}")
+    table.add_column(by.capitalize(), overflow="fold")
+    table.add_column("Count", justify="right")
+    table.add_column("p50 ms", justify="right")
+    table.add_column("p95 ms", justify="right")
+    table.add_column("p99 ms", justify="right")
+    table.add_column("Total s", justify="right")
+    table.add_column("SQL p95 ms", justify="right")
+    table.add_column("Queries p95", justify="right")
+    table.add_column("5xx", justify="right")
+    for key, st in ranked:
+        lat = st.latency.summary(1000)
+        table.add_row(
+            key,
+            str(st.count),
+            f"{lat['p50']:.1f}",
+            f"{lat['p95']:.1f}",
+            f"{lat['p99']:.1f}",
+            f"{st.latency.total:.1f}",
+            f"{st.sql_time.quantile(0.95) * 1000:.1f}",
+            f"{st.queries.quantile(0.95):.0f}",
+            str(st.errors) if st.errors else "",
         )
     console.print(table)
+
+
+def _default_store() -> Path:
+    return cache_dir("store") / "logs.sqlite"
+
+
+@app.command("ingest")
+def ingest(
+    path: List[str] = typer.Option(..., help="Path or glob of odoo.log (plain or .gz); repeat for several nodes"),
+    rotated: bool = typer.Option(False, help="Also ingest rotated siblings (odoo.log.1 … .N[.gz])"),
+    db: Optional[Path] = typer.Option(None, help="SQLite store (default: under ~/.cache/odoo-helper/store)"),
+):
+    """Parse logs into a local SQLite store; reruns only read what was appended."""
+    sources = _sources(path, rotated)
+    db = db or _default_store()
+    started = time.perf_counter()
+    try:
+        conn = store.connect(db)
+    except sqlite3.Error as e:
+        console.print(f"[red]Failed to open store {db}: {e}")
+        raise typer.Exit(code=1)
+    try:
+        before = conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+        for label, files in sources.items():
+            for f in files:
+                # Only the newest file of a source is still being written to
+                store.ingest_file(conn, label, f, live=f == files[-1] and not is_gzip(f))
+        rows = conn.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+    except OSError as e:
+        console.print(f"[red]Failed to read log: {e}")
+        raise typer.Exit(code=1)
+    except sqlite3.Error as e:
+        console.print(f"[red]Failed to write store {db}: {e}")
+        raise typer.Exit(code=1)
+    finally:
+        conn.close()
+    console.print(
+        f"[green]Ingested {rows - before} new blocks into {db} in {time.perf_counter() - started:.2f}s ({rows} stored)"
+    )
+
+
+@app.command("query")
+def query(
+    db: Optional[Path] = typer.Option(None, help="SQLite store written by 'logs ingest'"),
+    since: str = typer.Option(None, help="Start time (e.g., '2025-01-01 00:00:00')"),
+    until: str = typer.Option(None, help="End time"),
+    group: bool = typer.Option(True, help="Group by fingerprint"),
+    fingerprint: Optional[str] = typer.Option(None, help="Only this fingerprint"),
+    exception: Optional[str] = typer.Option(None, help="Only this exception type"),
+    limit: int = typer.Option(100, help="Groups (or blocks with --no-group) to return"),
+    suggest: bool = typer.Option(True, help="Show Odoo-specific hints"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+    rules: Optional[List[Path]] = typer.Option(None, exists=True, readable=True, help="Extra hint rule pack (TOML/YAML); repeatable"),
+):
+    """Query tracebacks from the SQLite store by time window and fingerprint."""
+    db = db or _default_store()
+    if not db.exists():
+        console.print(f"[red]No store at {db}. Run 'logs ingest' first.")
+        raise typer.Exit(code=1)
+    since_ms = parse_user_ts(since)
+    until_ms = parse_user_ts(until)
+    try:
+        conn = store.connect(db)
+    except sqlite3.Error as e:
+        console.print(f"[red]Failed to open store {db}: {e}")
+        raise typer.Exit(code=1)
+    try:
+        if group:
+            results = store.query_groups(conn, since_ms, until_ms, fingerprint, exception, limit)
+        else:
+            results = list(store.query_blocks(conn, since_ms, until_ms, fingerprint, exception, limit))
+        show_sources = conn.execute("SELECT COUNT(DISTINCT source) FROM files").fetchone()[0] > 1
+    except sqlite3.Error as e:
+        console.print(f"[red]Failed to query store {db}: {e}")
+        raise typer.Exit(code=1)
+    finally:
+        conn.close()
+    if suggest:
+        _add_hints(results, rules)
+    _render(results, output, show_sources)
+
+
+@app.command("bench")
+def bench(
+    size_mb: float = typer.Option(50.0, help="Size of the synthetic log in MiB"),
+    seed: int = typer.Option(42, help="Generator seed; same parameters and seed give the same log"),
+    traceback_ratio: float = typer.Option(0.05, help="Fraction of records that are tracebacks"),
+    werkzeug_ratio: float = typer.Option(0.6, help="Fraction of records that are werkzeug access lines"),
+    cardinality: int = typer.Option(50, help="Distinct error sites tracebacks are drawn from"),
+    only: Optional[List[str]] = typer.Option(None, help="Run only these benchmarks (repeatable)"),
+    repeat: int = typer.Option(3, min=1, help="Runs per benchmark; the fastest is kept"),
+    baseline: Optional[Path] = typer.Option(None, help="Baseline file (default: under ~/.cache/odoo-helper/bench)"),
+    save_baseline: bool = typer.Option(False, help="Store these results as the new baseline"),
+    threshold: float = typer.Option(0.15, min=0.0, help="Allowed slowdown / RSS growth vs the baseline (fraction)"),
+    keep_log: Optional[Path] = typer.Option(None, help="Write the synthetic log here and keep it"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Benchmark parsing, grouping, perf and hint matching on a deterministic synthetic log."""
+    import tempfile
+    from . import benchmark as benchmarks
+
+    names = only or list(benchmarks.BENCHMARKS)
+    unknown = [n for n in names if n not in benchmarks.BENCHMARKS]
+    if unknown:
+        console.print(f"[red]Unknown benchmark(s): {', '.join(unknown)}. Available: {', '.join(benchmarks.BENCHMARKS)}")
+        raise typer.Exit(code=2)
+    params = {
+        "size_mb": size_mb, "seed": seed, "traceback_ratio": traceback_ratio,
+        "werkzeug_ratio": werkzeug_ratio, "cardinality": cardinality,
+    }
+    baseline = baseline or cache_dir("bench") / "logs-baseline.json"
+    # Before running, so a broken baseline does not cost a full run
+    try:
+        base = benchmarks.load_baseline(baseline)
+    except ValueError as e:
+        if not save_baseline:
+            console.print(f"[red]{e}")
+            raise typer.Exit(code=1)
+        base = None  # about to be replaced
+
+    with tempfile.TemporaryDirectory(prefix="odoo-helper-bench-") as tmp:
+        log = keep_log or Path(tmp) / "odoo.log"
+        benchmarks.generate_log(log, **params)
+        results = benchmarks.run(names, log, repeat)
+
+    regressions: List[Dict] = []
+    if base and base["params"] == params:
+        regressions = benchmarks.compare(results, base["results"], threshold)
+    elif base and not save_baseline and output != "json":
+        console.print("[yellow]Baseline was recorded with different generator parameters; not comparing.")
+    if save_baseline:
+        try:
+            benchmarks.save_baseline(baseline, params, results)
+        except OSError as e:
+            console.print(f"[red]Failed to save baseline {baseline}: {e}")
+            raise typer.Exit(code=1)
+
+    if output == "json":
+        console.print_json(data={"params": params, "results": results, "regressions": regressions})
+    else:
+        from rich.table import Table
+        table = Table(title=f"Log pipeline benchmarks ({size_mb:g} MiB synthetic log, best of {repeat})")
+        table.add_column("Benchmark")
+        table.add_column("Seconds", justify="right")
+        table.add_column("MB/s", justify="right")
+        table.add_column("Peak RSS MB", justify="right")
+        table.add_column("Details", overflow="fold")
+        for name, r in results.items():
+            details = ", ".join(f"{k}={v}" for k, v in r.items() if k not in {"seconds", "mb_s", "peak_rss_mb"})
+            table.add_row(name, f"{r['seconds']:.3f}", f"{r['mb_s']:.1f}", f"{r['peak_rss_mb']:.1f}", details)
+        console.print(table)
+        if "parse" in results and "group" in results:
+            cost = results["group"]["seconds"] - results["parse"]["seconds"]
+            console.print(f"Grouping cost over parsing: {cost:.3f}s")
+        if "timestamps" in results and "timestamps-strptime" in results:
+            fast, slow = results["timestamps"]["seconds"], results["timestamps-strptime"]["seconds"]
+            console.print(f"Timestamp decoding: {fast:.3f}s vs {slow:.3f}s with strptime (reading included in both)")
+        for reg in regressions:
+            console.print(
+                f"[red]Regression in {reg['benchmark']}: {reg['metric']} {reg['current']} vs baseline {reg['baseline']}"
+            )
+        if save_baseline:
+            console.print(f"[green]Baseline saved to {baseline}")
+    if regressions:
+        raise typer.Exit(code=1)
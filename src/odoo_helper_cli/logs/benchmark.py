@@ -0,0 +1,305 @@
+"""Reproducible offline benchmarks for the log pipeline.
+
+``generate_log`` writes a synthetic odoo.log that is byte-identical for the
+same parameters and seed: a mix of werkzeug access lines, plain records and
+tracebacks drawn from ``cardinality`` distinct error sites. Each benchmark
+runs in a fresh interpreter so its peak RSS is its own, and the best of
+``repeat`` runs is reported.
+"""
+import multiprocessing
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import orjson
+
+from .hints import BUILTIN_RULES, HintEngine
+from .parser import GroupTable, _parse_ts_slow, decode_ts, iter_blocks
+from .perf import aggregate
+from .reader import iter_lines
+
+BASELINE_VERSION = 1
+_START = datetime(2025, 1, 1)
+_MODULES = ["sale", "stock", "account", "purchase", "mrp", "hr", "website_sale", "point_of_sale", "project", "crm"]
+_MODELS = ["sale.order", "stock.picking", "account.move", "res.partner", "product.product", "mrp.production"]
+_LOGGERS = ["odoo.modules.registry", "odoo.addons.base.models.ir_cron", "odoo.models", "odoo.service.server"]
+_ERRORS = [
+    ("psycopg2.errors.UniqueViolation", 'duplicate key value violates unique constraint "{model}_name_uniq"'),
+    ("psycopg2.errors.UndefinedColumn", 'column "x_studio_{module}" does not exist'),
+    ("odoo.exceptions.MissingError", "Record does not exist or has been deleted. (Record: {model}({n},))"),
+    ("odoo.exceptions.AccessError", "You are not allowed to access '{model}' records. (uid {n})"),
+    ("KeyError", "'{model}'"),
+    ("ValueError", "External ID not found in the system: '{module}.record_{n}'"),
+    ("odoo.addons.base.models.qweb.QWebException", "Error while render the template '{module}.report_{n}'"),
+]
+
+
+def _site(rng: random.Random, i: int) -> Dict[str, str]:
+    """One error site: exception template plus the application frames raising it."""
+    exc, msg = _ERRORS[i % len(_ERRORS)]
+    module = _MODULES[rng.randrange(len(_MODULES))]
+    model = _MODELS[rng.randrange(len(_MODELS))]
+    frames = [
+        '  File "/opt/odoo/odoo/http.py", line 1650, in _serve_db',
+        "    return service_model.retrying(self._serve_ir_http, self.env)",
+        f'  File "/opt/odoo/addons/{module}/models/{model.split(".")[0]}.py", line {100 + i}, in action_{i}',
+        f"    self._check_{i}()",
+        f'  File "/opt/odoo/odoo/models.py", line 5000, in _check_{i}',
+        "    raise err",
+    ]
+    return {"exc": exc, "msg": msg, "module": module, "model": model, "frames": "\n".join(frames)}
+
+
+def generate_log(
+    path: Path,
+    size_mb: float,
+    seed: int = 42,
+    traceback_ratio: float = 0.05,
+    werkzeug_ratio: float = 0.6,
+    cardinality: int = 50,
+) -> int:
+    """Write a deterministic synthetic odoo.log of about ``size_mb`` MiB; returns its size."""
+    rng = random.Random(seed)
+    sites = [_site(rng, i) for i in range(max(1, cardinality))]
+    target = int(size_mb * (1 << 20))
+    written = 0
+    ts = _START
+    buf: List[str] = []
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        while written < target:
+            ts += timedelta(milliseconds=rng.randrange(1, 400))
+            stamp = f"{ts:%Y-%m-%d %H:%M:%S},{ts.microsecond // 1000:03d} {rng.randrange(1000, 1100)}"
+            r = rng.random()
+            if r < traceback_ratio:
+                s = sites[rng.randrange(len(sites))]
+                msg = s["msg"].format(model=s["model"], module=s["module"], n=rng.randrange(1, 100000))
+                rec = (
+                    f"{stamp} ERROR prod odoo.http: Exception during request handling.\n"
+                    f"Traceback (most recent call last):\n{s['frames']}\n{s['exc']}: {msg}\n"
+                )
+            elif r < traceback_ratio + werkzeug_ratio:
+                model = _MODELS[rng.randrange(len(_MODELS))]
+                if rng.random() < 0.5:
+                    route = f"/web/dataset/call_kw/{model}/{rng.choice(('read', 'search_read', 'write', 'name_search'))}"
+                else:
+                    route = f"/web/image/{model}/{rng.randrange(1, 50000)}/image_128"
+                status = 500 if rng.random() < 0.01 else 200
+                rec = (
+                    f"{stamp} INFO prod werkzeug: 10.0.0.{rng.randrange(1, 255)} - - "
+                    f'[{ts:%d/%b/%Y %H:%M:%S}] "POST {route} HTTP/1.1" {status} - '
+                    f"{rng.randrange(1, 200)} {rng.expovariate(50):.3f} {rng.expovariate(10):.3f}\n"
+                )
+            else:
+                level = "WARNING" if rng.random() < 0.1 else "INFO"
+                rec = f"{stamp} {level} prod {rng.choice(_LOGGERS)}: processed {rng.randrange(1, 10000)} records\n"
+            buf.append(rec)
+            written += len(rec)
+            if len(buf) >= 4096:
+                fh.write("".join(buf))
+                buf = []
+        fh.write("".join(buf))
+    return path.stat().st_size
+
+
+# In-house-style rules that fire on generated tracebacks, so matching regexes are timed too
+_HIT_PATTERNS = [
+    r"UniqueViolation.*_name_uniq",
+    r'column "x_studio_\w+" does not exist',
+    r"MissingError.*Record does not exist",
+    r"not allowed to access '[\w.]+' records",
+    r"External ID not found.*record_\d+",
+    r"render the template '\w+\.report_\d+'",
+]
+# Their longest literal occurs in generated tracebacks but the full regex never matches
+_NEAR_MISS_PATTERNS = [
+    r'duplicate key value violates unique constraint "\w+_code_uniq"',
+    r"External ID not found in the system: '\w+\.missing_\d+'",
+    r"You are not allowed to access '[\w.]+' records\. \(uid 0\)",
+]
+
+
+def synthetic_rules(n: int, seed: int = 42) -> List[Dict]:
+    """Built-in hint rules padded with ``n`` in-house-style rules.
+
+    One in ten matches generated tracebacks, one in ten passes the literal
+    prefilter but not its regex, and the rest match nothing.
+    """
+    rng = random.Random(seed)
+    rules = list(BUILTIN_RULES)
+    for i in range(n):
+        word = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(8))
+        if i % 10 == 0:
+            pattern = rf"{_HIT_PATTERNS[i // 10 % len(_HIT_PATTERNS)]}|custom_{word}_{i}"
+        elif i % 10 == 5:
+            pattern = rf"{_NEAR_MISS_PATTERNS[i // 10 % len(_NEAR_MISS_PATTERNS)]}|custom_{word}_{i}"
+        else:
+            pattern = rf"{word}_{i}.*(?:failed|error)|custom_{word}\.\w+ not found"
+        rules.append({"id": f"synthetic-{i}", "pattern": pattern, "hint": f"Synthetic rule {i}.", "ignore_case": True})
+    return rules
+
+
+# Each benchmark reads the log and returns its own metrics; timing is added by the runner
+
+def _bench_parse(log: Path):
+    n = sum(1 for _ in iter_blocks(iter_lines(log)))
+    return {"blocks": n}
+
+
+def _bench_group(log: Path):
+    table = GroupTable(fingerprints=True)
+    for b in iter_blocks(iter_lines(log)):
+        table.add(b)
+    return {"groups": len(table.results())}
+
+
+def _bench_group_exact(log: Path):
+    table = GroupTable(fingerprints=False)
+    for b in iter_blocks(iter_lines(log)):
+        table.add(b)
+    return {"groups": len(table.results())}
+
+
+def _bench_perf(log: Path):
+    return {"routes": len(aggregate(iter_lines(log), "route", None, None))}
+
+
+def _bench_timestamps(log: Path):
+    n = 0
+    for line in iter_lines(log):
+        decode_ts(line)
+        n += 1
+    return {"lines": n}
+
+
+def _bench_timestamps_strptime(log: Path):
+    # Reference for "timestamps": the same stream through the strptime path
+    n = 0
+    for line in iter_lines(log):
+        _parse_ts_slow(line)
+        n += 1
+    return {"lines": n}
+
+
+def _bench_hints(log: Path):
+    rules = synthetic_rules(200)
+    texts = [f"{b['exception']} {b['message']}\n{b['snippet']}" for b in iter_blocks(iter_lines(log))]
+    engine = HintEngine(rules)
+    compiled = [re.compile(r["pattern"], re.I) for r in rules]
+    started = time.perf_counter()
+    found = sum(len(engine.hints(t)) for t in texts)
+    fast = time.perf_counter() - started
+    # The one-regex-per-rule reference is slow; a sample is enough for its rate
+    sample = texts[:200]
+    started = time.perf_counter()
+    for t in sample:
+        [r.search(t) for r in compiled]
+    slow = time.perf_counter() - started
+    return {
+        "rules": len(rules),
+        "hints": found,
+        "engine_blocks_s": round(len(texts) / fast) if fast else 0,
+        "sequential_blocks_s": round(len(sample) / slow) if slow else 0,
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[Path], Dict]] = {
+    "parse": _bench_parse,
+    "group": _bench_group,
+    "group-exact": _bench_group_exact,
+    "perf": _bench_perf,
+    "timestamps": _bench_timestamps,
+    "timestamps-strptime": _bench_timestamps_strptime,
+    "hints": _bench_hints,
+}
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _child(name: str, log: str, conn) -> None:
+    started = time.perf_counter()
+    extra = BENCHMARKS[name](Path(log))
+    conn.send({"seconds": time.perf_counter() - started, "peak_rss_mb": _peak_rss_mb(), **extra})
+    conn.close()
+
+
+def run_one(name: str, log: Path) -> Dict:
+    """Run one benchmark in a fresh interpreter (spawned, so RSS is not inherited)."""
+    ctx = multiprocessing.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(name, str(log), send))
+    proc.start()
+    send.close()
+    try:
+        result = recv.recv()
+    except EOFError:
+        raise RuntimeError(f"benchmark {name} crashed (exit code {proc.exitcode})")
+    finally:
+        proc.join()
+    return result
+
+
+def run(names: List[str], log: Path, repeat: int) -> Dict[str, Dict]:
+    """Best-of-``repeat`` results per benchmark, with MB/s over the log size."""
+    size_mb = log.stat().st_size / (1 << 20)
+    out = {}
+    for name in names:
+        runs = [run_one(name, log) for _ in range(max(1, repeat))]
+        best = min(runs, key=lambda r: r["seconds"])
+        best["peak_rss_mb"] = round(min(r["peak_rss_mb"] for r in runs), 1)
+        best["mb_s"] = round(size_mb / best["seconds"], 2)
+        best["seconds"] = round(best["seconds"], 3)
+        out[name] = best
+    return out
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    """Stored baseline, or None if there is none (or it predates ``BASELINE_VERSION``).
+
+    Raises ``ValueError`` for a file that is unreadable or not a baseline.
+    """
+    try:
+        raw = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise ValueError(f"Cannot read baseline {path}: {e}")
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Baseline {path} is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"Baseline {path} is not a JSON object")
+    if data.get("version") != BASELINE_VERSION:
+        return None
+    if not isinstance(data.get("params"), dict) or not isinstance(data.get("results"), dict):
+        raise ValueError(f"Baseline {path} has no params/results")
+    return data
+
+
+def save_baseline(path: Path, params: Dict, results: Dict[str, Dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps(
+        {"version": BASELINE_VERSION, "params": params, "results": results}, option=orjson.OPT_INDENT_2
+    ))
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """Throughput drops and peak RSS growth beyond ``threshold`` (a fraction)."""
+    regressions = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if cur["mb_s"] < base["mb_s"] * (1 - threshold):
+            regressions.append({"benchmark": name, "metric": "mb_s", "baseline": base["mb_s"], "current": cur["mb_s"]})
+        if cur["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+            regressions.append({
+                "benchmark": name, "metric": "peak_rss_mb", "baseline": base["peak_rss_mb"], "current": cur["peak_rss_mb"],
+            })
+    return regressions
@@ -0,0 +1,59 @@
+"""Stable traceback signatures that ignore volatile values.
+
+Messages are masked (numbers, UUIDs, hex ids and addresses, quoted literals)
+and combined with the innermost application frames (file:function), so
+``MissingError: Record 4711 does not exist`` and the same error for record
+4712 raised from the same code land in one group.
+"""
+import hashlib
+import re
+from typing import List
+
+_MASK_RE = re.compile(
+    r"(?P<uuid>\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b)"
+    r"|(?P<addr>\b0x[0-9a-fA-F]+\b)"
+    r"|(?P<hexid>\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b)"
+    r"|(?P<quoted>'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<num>(?<![\w.])-?\d+(?:\.\d+)?\b)"
+)
+_MASKS = {"uuid": "<uuid>", "addr": "0x?", "hexid": "<hex>", "quoted": "'?'", "num": "?"}
+_FRAME_RE = re.compile(r'^\s*File "(?P<file>[^"]+)", line \d+, in (?P<func>\S+)')
+# Frames in these locations are interpreter/library plumbing, not application code
+_LIBRARY_MARKERS = ("/lib/python", "\\lib\\", "site-packages", "dist-packages", "<frozen", "<string>")
+_APP_MARKERS = ("/odoo/", "/addons/", "\\odoo\\", "\\addons\\")
+# Innermost frames hashed into the signature
+SIGNATURE_FRAMES = 3
+
+
+def mask_message(msg: str) -> str:
+    return _MASK_RE.sub(lambda m: _MASKS[m.lastgroup], msg or "")
+
+
+def _short_path(path: str) -> str:
+    """Drop install-specific prefixes so signatures match across hosts."""
+    norm = path.replace("\\", "/")
+    for anchor in ("/addons/", "/odoo/"):
+        i = norm.rfind(anchor)
+        if i != -1:
+            return norm[i + 1:]
+    return norm.rsplit("/", 1)[-1]
+
+
+def app_frames(snippet: str) -> List[str]:
+    """``file:function`` of the innermost application frames, innermost last."""
+    frames = []
+    for line in snippet.splitlines():
+        m = _FRAME_RE.match(line)
+        if m:
+            frames.append((m.group("file"), m.group("func")))
+    app = [
+        f for f in frames
+        if any(k in f[0] for k in _APP_MARKERS) or not any(k in f[0] for k in _LIBRARY_MARKERS)
+    ] or frames
+    return [f"{_short_path(p)}:{fn}" for p, fn in app[-SIGNATURE_FRAMES:]]
+
+
+def fingerprint(exception: str, message: str, snippet: str) -> str:
+    """16-hex-digit signature of exception type, masked message and app frames."""
+    parts = [exception, mask_message(message)[:120]] + app_frames(snippet)
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8", "ignore")).hexdigest()[:16]
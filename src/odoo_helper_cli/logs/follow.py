@@ -0,0 +1,142 @@
+"""Incremental tail analysis with a persisted checkpoint.
+
+The checkpoint records the byte offset of the last complete line consumed,
+the inode it belongs to, the scanner state (look-back lines and any open
+traceback block) and the group counts, so a restarted ``logs follow`` only
+reads what was appended since.
+"""
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import orjson
+
+from ..cache import cache_dir
+from .parser import BlockScanner, GroupTable
+from .reader import iter_complete_lines
+
+CHECKPOINT_VERSION = 3
+
+
+def default_checkpoint(log: Path) -> Path:
+    digest = hashlib.sha1(str(log.resolve()).encode()).hexdigest()[:16]
+    return cache_dir("follow") / f"{digest}.json"
+
+
+class Follower:
+    """Tail state for one log file."""
+
+    def __init__(self, log: Path, checkpoint: Path, table: GroupTable):
+        self.log = log
+        self.checkpoint = checkpoint
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self.scanner = BlockScanner()
+        self.table = table
+        # Group counts at the last emitted summary
+        self.reported: Dict[str, int] = {}
+
+    def load(self) -> bool:
+        """Restore from the checkpoint; returns False when there is none to use."""
+        try:
+            data = orjson.loads(self.checkpoint.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return False
+        if (
+            data.get("version") != CHECKPOINT_VERSION
+            or data.get("path") != str(self.log.resolve())
+            or data.get("grouping") != self._grouping()
+        ):
+            return False
+        self.inode = data["inode"]
+        self.offset = data["offset"]
+        self.scanner = BlockScanner.from_state(data["scanner"])
+        self.table.merge(data["groups"])
+        self.reported = data["reported"]
+        return True
+
+    def save(self) -> None:
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "path": str(self.log.resolve()),
+            "inode": self.inode,
+            "offset": self.offset,
+            "scanner": self.scanner.state(),
+            "grouping": self._grouping(),
+            "groups": self.table.groups,
+            "reported": self.reported,
+        }
+        tmp = self.checkpoint.with_name(self.checkpoint.name + ".tmp")
+        tmp.write_bytes(orjson.dumps(data))
+        os.replace(tmp, self.checkpoint)
+
+    def _grouping(self) -> Dict:
+        return {"fingerprints": self.table.fingerprints, "top": self.table.top}
+
+    def skip_to_end(self) -> None:
+        """Start from the current end of the log instead of replaying history."""
+        st = self.log.stat()
+        with open(self.log, "rb") as fh:
+            fh.seek(max(0, st.st_size - 65536))
+            tail = fh.read()
+        self.inode = st.st_ino
+        self.offset = st.st_size - len(tail) + tail.rfind(b"\n") + 1
+
+    def _consume(self, path: Path, start: int) -> int:
+        """Feed complete lines from ``start``; returns the offset after the last one."""
+        pos = start
+        for _, pos, line in iter_complete_lines(path, start):
+            b = self.scanner.feed(line)
+            if b is not None:
+                self.table.add(b)
+        return pos
+
+    def _rotated_predecessor(self) -> Optional[Path]:
+        """The file the checkpointed inode was renamed to, if still around."""
+        for cand in sorted(self.log.parent.glob(self.log.name + ".*")):
+            try:
+                if cand.stat().st_ino == self.inode:
+                    return cand
+            except OSError:
+                continue
+        return None
+
+    def poll(self) -> None:
+        """Read whatever was appended since the last poll, following rotation."""
+        st = self.log.stat()
+        if self.inode is not None and (st.st_ino != self.inode or st.st_size < self.offset):
+            if st.st_ino != self.inode:
+                # Finish the tail of the rotated file before switching over
+                old = self._rotated_predecessor()
+                if old is not None and not old.name.endswith(".gz"):
+                    self._consume(old, self.offset)
+            b = self.scanner.flush()
+            if b is not None:
+                self.table.add(b)
+            self.scanner = BlockScanner()
+            self.offset = 0
+        self.inode = st.st_ino
+        if st.st_size > self.offset:
+            self.offset = self._consume(self.log, self.offset)
+
+    def delta(self) -> List[Dict]:
+        """Groups that are new or grew since the previous call."""
+        out = []
+        for key, g in self.table.groups.items():
+            before = self.reported.get(key, 0)
+            if g["count"] > before:
+                out.append({
+                    "exception": g["exception"],
+                    "message": g["message"],
+                    "count": g["count"],
+                    "delta": g["count"] - before,
+                    "new": before == 0,
+                    "first_ts": g["first_ts"],
+                })
+                self.reported[key] = g["count"]
+        if len(self.reported) > len(self.table.groups):
+            # Forget groups evicted from a capped table
+            self.reported = {k: v for k, v in self.reported.items() if k in self.table.groups}
+        out.sort(key=lambda r: r["delta"], reverse=True)
+        return out
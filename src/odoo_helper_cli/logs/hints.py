@@ -0,0 +1,111 @@
+r"""Odoo-specific hints for traceback groups, with loadable rule packs.
+
+A rule pack is a TOML or YAML file holding a list of rules::
+
+    [[rules]]
+    id = "mail-template"
+    pattern = 'mail\.template.*render'
+    hint = "Mail template rendering failed. Check the template's QWeb/inline expressions."
+    ignore_case = true   # optional, default true
+
+YAML packs use the same keys under a top-level ``rules:`` list (or are a
+bare list). All rules, built-in and loaded, share one literal prefilter pass
+over each text (see :mod:`odoo_helper_cli.matcher`); only rules whose
+required literals occur run their full regex.
+"""
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+from ..matcher import MultiPattern
+
+BUILTIN_RULES: List[Dict] = [
+    {"id": "external-id",
+     "pattern": r"External ID|xmlid|No matching record found for external id",
+     "hint": "External ID not found. Check ir.model.data, data XML load order, and module dependency sequence."},
+    {"id": "unique-violation",
+     "pattern": r"duplicate key value violates unique constraint|UniqueViolation",
+     "hint": "Unique constraint violation. Identify offending records; consider cleanup SQL and ensure data XML doesn't insert duplicates."},
+    {"id": "db-connectivity",
+     "pattern": r"psycopg\..*OperationalError|could not connect to server|connection refused",
+     "hint": "Database connectivity issue. Verify DSN, service availability, and locks during migrations."},
+    {"id": "view-qweb",
+     "pattern": r"QWebException|Could not render|view architecture.*error|XPath|has no field",
+     "hint": "View/QWeb error. Inspect the mentioned XML/view, ensure fields exist and XPath targets match after updates."},
+    {"id": "template-key",
+     "pattern": r"KeyError: '.*' in.*ir\.ui\.view|render",
+     "hint": "Template key error. Check context variables and t-foreach/t-as names in QWeb."},
+    {"id": "inheritance",
+     "pattern": r"cache miss|missing dependency|_inherit.*not found",
+     "hint": "Model inheritance conflict. Ensure module dependencies and load order; verify _name vs _inherit correctness."},
+    {"id": "schema",
+     "pattern": r'relation ".*" does not exist|column ".*" does not exist',
+     "hint": "Broken DB schema after update. Run -u for impacted modules and validate migrations/ORM field definitions."},
+]
+
+
+class HintEngine:
+    """Compiled rule set; ``hints()`` reports every matching rule in rule order."""
+
+    def __init__(self, rules: Sequence[Dict]):
+        self.rules = list(rules)
+        self.matcher = MultiPattern([
+            (r["pattern"], re.I if r.get("ignore_case", True) else 0) for r in self.rules
+        ])
+
+    def hints(self, text: str) -> List[str]:
+        return [self.rules[i]["hint"] for i in self.matcher.search_all(text or "")]
+
+
+def _parse_pack(path: Path) -> List[Dict]:
+    if path.suffix.lower() in {".yaml", ".yml"}:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("PyYAML is required for YAML rule packs (pip install 'odoo-helper-cli[rules]')")
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    else:
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("tomli is required for TOML rule packs on Python < 3.11")
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    rules = data.get("rules", []) if isinstance(data, dict) else data
+    if not isinstance(rules, list):
+        raise ValueError(f"{path}: expected a list of rules")
+    out = []
+    for i, r in enumerate(rules):
+        if not isinstance(r, dict) or not r.get("pattern") or not r.get("hint"):
+            raise ValueError(f"{path}: rule #{i + 1} needs 'pattern' and 'hint'")
+        try:
+            re.compile(r["pattern"])
+        except re.error as e:
+            raise ValueError(f"{path}: rule {r.get('id', i + 1)}: invalid pattern: {e}")
+        out.append({
+            "id": str(r.get("id", f"{path.stem}-{i + 1}")),
+            "pattern": r["pattern"],
+            "hint": r["hint"],
+            "ignore_case": bool(r.get("ignore_case", True)),
+        })
+    return out
+
+
+@lru_cache(maxsize=16)
+def _engine(packs: Tuple[Tuple[str, int, int], ...], builtin: bool) -> HintEngine:
+    rules = list(BUILTIN_RULES) if builtin else []
+    for path, _, _ in packs:
+        rules.extend(_parse_pack(Path(path)))
+    return HintEngine(rules)
+
+
+def get_engine(packs: Sequence[Path] = (), builtin: bool = True) -> HintEngine:
+    """Compiled engine for the given packs, reused until a pack file changes."""
+    key = []
+    for p in packs:
+        st = p.stat()
+        key.append((str(p.resolve()), st.st_mtime_ns, st.st_size))
+    return _engine(tuple(key), builtin)
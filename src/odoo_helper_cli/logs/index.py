@@ -0,0 +1,98 @@
+"""Cached timestamp→offset index per log so time-windowed reads can seek.
+
+The index samples one record header roughly every ``INDEX_STEP`` bytes, so
+building it costs a handful of seeks rather than a full read. It is keyed on
+the file's inode and size: a different inode (rotation) or a smaller size
+(truncation) discards it, growth extends it from where it stopped.
+"""
+import hashlib
+import os
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from ..cache import cache_dir
+from .parser import decode_ts
+from .reader import next_header
+
+INDEX_VERSION = 2
+INDEX_STEP = 1 << 20
+# Odoo workers share one file, so timestamps are only roughly ordered
+SEEK_SLACK_MS = 60_000
+
+
+def index_path(log: Path) -> Path:
+    """Index file under the cache dir, keyed on the log's resolved path.
+
+    Kept out of the log directory so rotated-set globs (``odoo.log*``) never
+    pick it up as a log.
+    """
+    digest = hashlib.sha1(str(log.resolve()).encode()).hexdigest()[:16]
+    return cache_dir("index") / f"{digest}.idx"
+
+
+def _load(p: Path) -> Optional[Dict]:
+    try:
+        idx = orjson.loads(p.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return idx if isinstance(idx, dict) and idx.get("version") == INDEX_VERSION else None
+
+
+def _still_valid(idx: Dict, fh, st: os.stat_result) -> bool:
+    if idx.get("inode") != st.st_ino or st.st_size < idx.get("size", 0):
+        return False
+    # Guard against copytruncate followed by regrowth past the old size
+    if idx["entries"]:
+        ts, off = idx["entries"][-1]
+        # Entries are header offsets: the line there must still carry the same timestamp
+        fh.seek(off)
+        return decode_ts(fh.readline().decode("utf-8", "ignore")) == ts
+    return True
+
+
+def ensure_index(log: Path) -> Dict:
+    """Load, validate and extend the index for ``log``; persisting is best effort."""
+    p = index_path(log)
+    st = log.stat()
+    idx = _load(p)
+    with open(log, "rb") as fh:
+        if idx is None or not _still_valid(idx, fh, st):
+            idx = {"version": INDEX_VERSION, "inode": st.st_ino, "size": 0, "next": 0, "entries": []}
+        if st.st_size == idx["size"]:
+            return idx
+        entries = idx["entries"]
+        pos = idx["next"]
+        while pos < st.st_size:
+            hit = next_header(fh, pos)
+            if hit is None:
+                break
+            off, ts = hit
+            if not entries or off > entries[-1][1]:
+                entries.append([ts, off])
+            pos = off + INDEX_STEP
+    idx["next"] = pos
+    idx["size"] = st.st_size
+    try:
+        p.write_bytes(orjson.dumps(idx))
+    except OSError:
+        pass
+    return idx
+
+
+def seek_range(idx: Dict, since: Optional[int], until: Optional[int]) -> Tuple[int, Optional[int]]:
+    """Byte window (start, end-or-None) holding every record in [since, until] (epoch ms)."""
+    entries = idx["entries"]
+    stamps = [e[0] for e in entries]
+    start, end = 0, None
+    if since is not None:
+        i = bisect_left(stamps, since - SEEK_SLACK_MS)
+        if i > 0:
+            start = entries[i - 1][1]
+    if until is not None:
+        i = bisect_right(stamps, until + SEEK_SLACK_MS)
+        if i < len(entries):
+            end = entries[i][1]
+    return start, end
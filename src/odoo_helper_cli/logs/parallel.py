@@ -0,0 +1,156 @@
+"""Multi-process log analysis over byte ranges aligned to record headers."""
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .parser import GroupTable, block_record, in_window, iter_blocks
+from .reader import is_gzip, iter_lines, next_header
+
+# (path, start offset, end offset or None for EOF)
+Chunk = Tuple[str, int, Optional[int]]
+
+# Chunks smaller than this are not worth a process hop
+MIN_CHUNK_BYTES = 1 << 20
+
+
+def plan_chunks(
+    files: List[Path],
+    jobs: int,
+    ranges: Optional[Dict[Path, Tuple[int, Optional[int]]]] = None,
+) -> List[Chunk]:
+    """Split plain files into up to ``jobs`` ranges each; gzip files stay whole.
+
+    ``ranges`` optionally narrows a file to a (start, end) byte window, as
+    returned by the timestamp index.
+    """
+    chunks: List[Chunk] = []
+    for f in files:
+        if is_gzip(f):
+            chunks.append((str(f), 0, None))
+            continue
+        start, end = (ranges or {}).get(f, (0, None))
+        span = (end if end is not None else f.stat().st_size) - start
+        parts = max(1, min(jobs, span // MIN_CHUNK_BYTES))
+        bounds = [start]
+        with open(f, "rb") as fh:
+            for k in range(1, parts):
+                hit = next_header(fh, start + span * k // parts)
+                if hit is None or (end is not None and hit[0] >= end):
+                    break
+                if hit[0] > bounds[-1]:
+                    bounds.append(hit[0])
+        ends = bounds[1:] + [end]
+        chunks.extend((str(f), s, e) for s, e in zip(bounds, ends))
+    return chunks
+
+
+def map_chunks(fn: Callable, chunks: List[Chunk], jobs: int, *args) -> Iterator:
+    """Apply ``fn(chunk, *args)`` over a process pool, yielding results in chunk order."""
+    n = len(chunks)
+    with ProcessPoolExecutor(max_workers=min(jobs, n) or 1) as pool:
+        yield from pool.map(fn, chunks, *([a] * n for a in args))
+
+
+def analyze_chunk(
+    chunk: Chunk,
+    since: Optional[int],
+    until: Optional[int],
+    table: Optional[GroupTable],
+    labels: Optional[Dict[str, str]] = None,
+):
+    """Parse one chunk; fills and returns ``table``, or block records when it is None.
+
+    ``labels`` maps file paths to source labels for multi-source runs, in
+    command-line order. The result then comes with the :func:`merge_by_time`
+    position of each record, or of the first blocks (one per example) of
+    each group, so the parent can order them as a serial run would.
+    """
+    path, start, end = chunk
+    blocks = iter_blocks(iter_lines(Path(path), start, end))
+    if since is not None or until is not None:
+        blocks = (b for b in blocks if in_window(b["ts"], since, until))
+    if not labels:
+        if table is None:
+            return [block_record(b) for b in blocks]
+        for b in blocks:
+            table.add(b)
+        return table.groups
+
+    positions = _positions(blocks, labels, path, start)
+    if table is None:
+        return [(pos, block_record(b)) for pos, b in positions]
+    orders: Dict[str, List[Tuple]] = {}
+    for pos, b in positions:
+        table.add(b)
+        seen = orders.setdefault(table.key(b), [])
+        if len(seen) < 3:
+            seen.append(pos)
+    return table.groups, orders
+
+
+def _positions(blocks, labels: Dict[str, str], path: str, start: int):
+    """Tag blocks with their source and yield (merge position, block).
+
+    The position sorts like :func:`merge_by_time`'s key: timestamp (the last
+    one seen for blocks without), then source, then place in the source.
+    """
+    label = labels[path]
+    source = list(dict.fromkeys(labels.values())).index(label)
+    where = (list(labels).index(path), start)
+    last = -1
+    for seq, b in enumerate(blocks):
+        b["source"] = label
+        if b["ts"] is not None:
+            last = b["ts"]
+        yield (last, source) + where + (seq,), b
+
+
+def _merge_sources(table: GroupTable, parts) -> None:
+    """Merge per-chunk groups of several sources in serial (time) order."""
+    firsts = []
+    examples: Dict[str, List[Tuple]] = {}
+    for groups, orders in parts:
+        for key, g in groups.items():
+            firsts.append((orders[key][0], key, g))
+            examples.setdefault(key, []).extend(zip(orders[key], g["examples"]))
+    # Group order, exception and message come from the earliest block, as in a serial run
+    firsts.sort(key=lambda f: f[0])
+    for _, key, g in firsts:
+        table.merge({key: g}, earliest=True)
+    for key, g in table.groups.items():
+        g["examples"] = [snippet for _, snippet in sorted(examples[key], key=lambda e: e[0])[:3]]
+
+
+def analyze_parallel(
+    files: List[Path],
+    jobs: int,
+    since: Optional[int],
+    until: Optional[int],
+    table: Optional[GroupTable],
+    ranges: Optional[Dict[Path, Tuple[int, Optional[int]]]] = None,
+    labels: Optional[Dict[Path, str]] = None,
+) -> List[Dict]:
+    """Run ``analyze_chunk`` over a process pool and merge results as a serial run would.
+
+    Each worker gets an empty copy of ``table`` (same grouping options).
+    With several sources (``labels``) records, groups and examples are
+    ordered as in the serial k-way merge by time. Capped tables (``top``)
+    are approximate either way.
+    """
+    str_labels = {str(p): label for p, label in labels.items()} if labels else None
+    chunks = plan_chunks(files, jobs, ranges)
+    # Arguments are pickled lazily by the pool, so workers must get a table
+    # the parent never mutates
+    empty = GroupTable(table.fingerprints, table.top) if table is not None else None
+    parts = map_chunks(analyze_chunk, chunks, jobs, since, until, empty, str_labels)
+    if table is None:
+        if str_labels:
+            positioned = sorted((r for part in parts for r in part), key=lambda r: r[0])
+            return [r for _, r in positioned]
+        return [r for part in parts for r in part]
+    if str_labels:
+        _merge_sources(table, parts)
+        return table.results()
+    for part in parts:
+        table.merge(part)
+    return table.results()
@@ -0,0 +1,333 @@
+"""Streaming traceback block detection and grouping for Odoo logs."""
+import heapq
+import re
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .fingerprint import fingerprint
+
+TS_RE = re.compile(r"^(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})?)")
+EXC_RE = re.compile(r"^(?P<exc>[A-Za-z_][\w.]*)(?::\s*(?P<msg>.*))?")
+TRACEBACK_MARK = "Traceback (most recent call last):"
+# Lines searched (current one included) for the timestamp of a traceback
+LOOKBACK_LINES = 5
+# Tail of each block kept for the snippet; the exception line lives there too
+SNIPPET_LINES = 20
+
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MS = timedelta(milliseconds=1)
+# "YYYY-MM-DD HH:MM:SS" -> epoch seconds; records of one second share a prefix
+_SECOND_CACHE: Dict[str, Optional[int]] = {}
+_SECOND_CACHE_MAX = 4096
+
+
+def to_epoch_ms(dt: datetime) -> int:
+    """Naive datetimes are read as UTC, so epoch values keep the log's wall clock."""
+    return (dt - _EPOCH) // _ONE_MS
+
+
+def format_ts(ms: Optional[int]) -> Optional[str]:
+    """ISO form used in output, identical to ``datetime.isoformat()`` of the parsed stamp."""
+    if ms is None:
+        return None
+    return (_EPOCH + ms * _ONE_MS).isoformat()
+
+
+def _parse_ts_slow(line: str) -> Optional[int]:
+    m = TS_RE.match(line)
+    if not m:
+        return None
+    raw = m.group("ts").replace(",", ".")
+    for f in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return to_epoch_ms(datetime.strptime(raw, f))
+        except Exception:
+            continue
+    return None
+
+
+def _decode_second(key: str) -> Optional[int]:
+    try:
+        dt = datetime(
+            int(key[0:4]), int(key[5:7]), int(key[8:10]),
+            int(key[11:13]), int(key[14:16]), int(key[17:19]),
+        )
+    except ValueError:
+        return None
+    return (dt - _EPOCH) // _ONE_MS // 1000
+
+
+def decode_ts(line: str) -> Optional[int]:
+    """Epoch milliseconds of the leading ``YYYY-MM-DD HH:MM:SS[,mmm]`` stamp, or None.
+
+    The fixed Odoo layout is decoded by slicing, with the per-second part
+    cached; anything else goes through the regex/strptime path.
+    """
+    if len(line) < 19 or line[4] != "-" or line[7] != "-" or line[10] != " " or line[13] != ":" or line[16] != ":":
+        return None
+    key = line[:19]
+    sec = _SECOND_CACHE.get(key, -1)
+    if sec == -1:
+        if not (key[0:4] + key[5:7] + key[8:10] + key[11:13] + key[14:16] + key[17:19]).isdigit():
+            return None
+        sec = _decode_second(key)
+        if sec is None:
+            # Unusual digits or out-of-range fields: let strptime decide
+            return _parse_ts_slow(line)
+        if len(_SECOND_CACHE) >= _SECOND_CACHE_MAX:
+            _SECOND_CACHE.clear()
+        _SECOND_CACHE[key] = sec
+    ms = 0
+    if len(line) >= 23 and line[19] == "," and line[20:23].isdigit():
+        ms = int(line[20:23])
+    return sec * 1000 + ms
+
+
+def parse_user_ts(s: Optional[str]) -> Optional[int]:
+    if not s:
+        return None
+    for f in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return to_epoch_ms(datetime.strptime(s, f))
+        except Exception:
+            continue
+    return None
+
+
+def in_window(ts: Optional[int], since: Optional[int], until: Optional[int]) -> bool:
+    """Blocks without a timestamp are excluded as soon as a window is given.
+
+    All values are epoch milliseconds, see ``decode_ts``.
+    """
+    if since is not None and (ts is None or ts < since):
+        return False
+    if until is not None and (ts is None or ts > until):
+        return False
+    return True
+
+
+class BlockScanner:
+    """Incremental traceback detector.
+
+    Lines are fed one at a time and a finished block is returned as soon as
+    the next record header or a separating blank line is seen. Only a few
+    lines of look-back and the tail of the current block are held, so memory
+    does not depend on the size of the log.
+    """
+
+    def __init__(self):
+        self.recent: Deque[str] = deque(maxlen=LOOKBACK_LINES - 1)
+        self.block: Optional[Deque[str]] = None
+        self.ts: Optional[int] = None
+        self.offset: Optional[int] = None
+
+    def feed(self, line: str, offset: Optional[int] = None) -> Optional[Dict]:
+        """Consume one line; ``offset`` (its byte position) is kept for the block start."""
+        done = None
+        if self.block is not None:
+            if TS_RE.match(line):
+                # A new record header closes the block and is scanned below
+                done = self._finish()
+            else:
+                self.block.append(line)
+                if not line.strip():
+                    done = self._finish()
+                self.recent.append(line)
+                return done
+        if TRACEBACK_MARK in line:
+            ts = decode_ts(line)
+            if ts is None:
+                for prev in reversed(self.recent):
+                    ts = decode_ts(prev)
+                    if ts is not None:
+                        break
+            self.ts = ts
+            self.offset = offset
+            self.block = deque([line], maxlen=SNIPPET_LINES)
+        self.recent.append(line)
+        return done
+
+    def state(self) -> Dict:
+        """JSON-serializable snapshot, used by ``logs follow`` checkpoints."""
+        return {
+            "recent": list(self.recent),
+            "block": list(self.block) if self.block is not None else None,
+            "ts": self.ts,
+            "offset": self.offset,
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> "BlockScanner":
+        scanner = cls()
+        scanner.recent.extend(state.get("recent") or [])
+        if state.get("block") is not None:
+            scanner.block = deque(state["block"], maxlen=SNIPPET_LINES)
+        scanner.ts = state.get("ts")
+        scanner.offset = state.get("offset")
+        return scanner
+
+    def flush(self) -> Optional[Dict]:
+        """Close the block still open at end of input, if any."""
+        return self._finish() if self.block is not None else None
+
+    def _finish(self) -> Dict:
+        block, ts, offset = self.block, self.ts, self.offset
+        self.block, self.ts, self.offset = None, None, None
+        # Exception line is usually the last non-empty line
+        exc_line = next((l for l in reversed(block) if l.strip()), "")
+        m = EXC_RE.match(exc_line.strip())
+        return {
+            "ts": ts,
+            "exception": m.group("exc") if m else "UnknownException",
+            "message": (m.group("msg") or "").strip() if m else exc_line.strip(),
+            "snippet": "\n".join(block),
+            "offset": offset,
+        }
+
+
+def iter_blocks(lines: Iterable[str]) -> Iterator[Dict]:
+    """Yield traceback blocks from an iterable of log lines."""
+    scanner = BlockScanner()
+    for line in lines:
+        b = scanner.feed(line)
+        if b is not None:
+            yield b
+    b = scanner.flush()
+    if b is not None:
+        yield b
+
+
+def block_record(b: Dict) -> Dict:
+    """Ungrouped output row for a block."""
+    rec = {
+        "exception": b["exception"],
+        "message": b["message"],
+        "timestamp": format_ts(b["ts"]),
+        "snippet": b["snippet"],
+        "count": 1,
+    }
+    if "source" in b:
+        rec["source"] = b["source"]
+    return rec
+
+
+def merge_by_time(streams: Sequence[Tuple[str, Iterable[Dict]]]) -> Iterator[Dict]:
+    """K-way merge of per-source block streams into global time order.
+
+    Each block is tagged with its source label. Only one pending block per
+    source is held, so memory grows with the number of sources, not their
+    size. Blocks without a timestamp keep their place behind the previous
+    block of the same source.
+    """
+    def keyed(idx: int, label: str, blocks: Iterable[Dict]):
+        last = -1
+        for seq, b in enumerate(blocks):
+            b["source"] = label
+            if b["ts"] is not None:
+                last = b["ts"]
+            yield last, idx, seq, b
+
+    for *_, b in heapq.merge(*(keyed(i, label, s) for i, (label, s) in enumerate(streams))):
+        yield b
+
+
+class GroupTable:
+    """Traceback groups, keyed by fingerprint (or legacy exception|message).
+
+    With ``top`` set the table never holds more than ``top`` groups and uses
+    the Space-Saving scheme: a new key evicts the smallest group and inherits
+    its count, recorded as ``error``. Any group seen more than total/top
+    times is guaranteed to stay, and its count is over by at most ``error``.
+    """
+
+    def __init__(self, fingerprints: bool = True, top: Optional[int] = None):
+        self.fingerprints = fingerprints
+        self.top = top
+        self.groups: Dict[str, Dict] = {}
+        # One (count at push, key) entry per group; refreshed lazily on eviction
+        self._heap: List[Tuple[int, str]] = []
+
+    def key(self, b: Dict) -> str:
+        if self.fingerprints:
+            return fingerprint(b["exception"], b["message"], b["snippet"])
+        return f"{b['exception']}|{(b['message'] or '')[:120]}"
+
+    def add(self, b: Dict) -> None:
+        key = self.key(b)
+        ts = format_ts(b["ts"])
+        g = self.groups.get(key)
+        if g is None:
+            g = self._new_group(key, {
+                "exception": b["exception"],
+                "message": b["message"],
+                "count": 0,
+                "first_ts": ts,
+                "examples": [],
+            })
+        g["count"] += 1
+        if not g["first_ts"] and ts:
+            g["first_ts"] = ts
+        if len(g["examples"]) < 3:
+            g["examples"].append(b["snippet"])
+        src = b.get("source")
+        if src is not None:
+            sources = g.setdefault("sources", {})
+            sources[src] = sources.get(src, 0) + 1
+
+    def _new_group(self, key: str, g: Dict) -> Dict:
+        if self.fingerprints:
+            g["fingerprint"] = key
+        if self.top:
+            g["error"] = 0
+            if len(self.groups) >= self.top:
+                floor = self._evict()
+                g["count"] = g["error"] = floor
+            heapq.heappush(self._heap, (g["count"], key))
+        self.groups[key] = g
+        return g
+
+    def _evict(self) -> int:
+        """Drop the smallest group and return its count."""
+        while True:
+            count, key = heapq.heappop(self._heap)
+            current = self.groups[key]["count"]
+            if current == count:
+                del self.groups[key]
+                return count
+            heapq.heappush(self._heap, (current, key))
+
+    def merge(self, groups: Dict[str, Dict], earliest: bool = False) -> None:
+        """Fold in groups from a later chunk of the same input.
+
+        Uncapped tables end up exactly as a serial pass would leave them;
+        capped ones sum overlapping counts and keep the ``top`` largest.
+        With ``earliest`` (chunks of different sources) ``first_ts`` becomes
+        the minimum instead of the first one seen.
+        """
+        for key, g in groups.items():
+            cur = self.groups.get(key)
+            if cur is None:
+                self.groups[key] = g
+                continue
+            cur["count"] += g["count"]
+            if self.top:
+                cur["error"] += g["error"]
+            if g["first_ts"] and (not cur["first_ts"] or (earliest and g["first_ts"] < cur["first_ts"])):
+                cur["first_ts"] = g["first_ts"]
+            for src, n in g.get("sources", {}).items():
+                sources = cur.setdefault("sources", {})
+                sources[src] = sources.get(src, 0) + n
+            room = 3 - len(cur["examples"])
+            if room > 0:
+                cur["examples"].extend(g["examples"][:room])
+        if self.top and len(self.groups) > self.top:
+            keep = heapq.nlargest(self.top, self.groups.items(), key=lambda kv: kv[1]["count"])
+            self.groups = dict(keep)
+        if self.top:
+            self._heap = [(g["count"], k) for k, g in self.groups.items()]
+            heapq.heapify(self._heap)
+
+    def results(self) -> List[Dict]:
+        return list(self.groups.values())
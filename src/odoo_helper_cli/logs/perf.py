@@ -0,0 +1,169 @@
+"""Request latency and SQL-count analytics from Odoo werkzeug access lines.
+
+Odoo appends three numbers to each werkzeug line: the number of SQL
+queries, the time spent in SQL and the remaining (Python) time, both in
+seconds. Distributions are kept in mergeable log-bucketed sketches, so
+memory depends on the number of routes, not on the number of requests.
+"""
+import math
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+from .parser import decode_ts
+from .reader import iter_lines
+
+WERKZEUG_RE = re.compile(
+    r'werkzeug: .*?"(?P<method>[A-Z]+) (?P<path>\S+) [^"]*" (?P<status>\d{3}) \S+ '
+    r"(?P<queries>\d+) (?P<sql>\d+(?:\.\d+)?) (?P<py>\d+(?:\.\d+)?)\s*$"
+)
+_CALL_KW_RE = re.compile(r"^/web/dataset/(?:call_kw|call_button)/(?P<model>[\w.]+)(?:/(?P<method>\w+))?")
+_ID_SEGMENT_RE = re.compile(r"/(?:\d+|[0-9a-f]{8,}|[0-9a-f-]{36})(?=/|$)")
+_SLUG_ID_RE = re.compile(r"-\d+(?=/|$)")
+
+
+class QuantileSketch:
+    """DDSketch-style quantile sketch with relative error ``alpha``.
+
+    Values land in logarithmic buckets; quantiles are within ``alpha`` of the
+    true value and sketches merge exactly by adding bucket counts.
+    """
+
+    def __init__(self, alpha: float = 0.01):
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero = 0
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, x: float) -> None:
+        self.count += 1
+        self.total += x
+        if x > self.max:
+            self.max = x
+        if x <= 1e-9:
+            self.zero += 1
+            return
+        k = math.ceil(math.log(x) / self._log_gamma)
+        self.buckets[k] = self.buckets.get(k, 0) + 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.zero += other.zero
+        for k, c in other.buckets.items():
+            self.buckets[k] = self.buckets.get(k, 0) + c
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for k in sorted(self.buckets):
+            seen += self.buckets[k]
+            if seen > rank:
+                return min(2 * self.gamma ** k / (self.gamma + 1), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, float]:
+        return {
+            "p50": round(self.quantile(0.50) * scale, 3),
+            "p95": round(self.quantile(0.95) * scale, 3),
+            "p99": round(self.quantile(0.99) * scale, 3),
+            "max": round(self.max * scale, 3),
+            "avg": round(self.total / self.count * scale, 3) if self.count else 0.0,
+        }
+
+
+class PerfStats:
+    """Per-key request counters and latency/SQL sketches."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.latency = QuantileSketch()
+        self.sql_time = QuantileSketch()
+        self.queries = QuantileSketch()
+
+    def add(self, status: int, queries: int, sql: float, py: float) -> None:
+        self.count += 1
+        if status >= 500:
+            self.errors += 1
+        self.latency.add(sql + py)
+        self.sql_time.add(sql)
+        self.queries.add(queries)
+
+    def merge(self, other: "PerfStats") -> None:
+        self.count += other.count
+        self.errors += other.errors
+        self.latency.merge(other.latency)
+        self.sql_time.merge(other.sql_time)
+        self.queries.merge(other.queries)
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "errors_5xx": self.errors,
+            "latency_ms": self.latency.summary(1000),
+            "sql_ms": self.sql_time.summary(1000),
+            "queries": self.queries.summary(),
+        }
+
+
+def normalize_route(path: str) -> str:
+    """Collapse ids and slugs so ``/shop/product/chair-42`` and ``-43`` share a route."""
+    path = path.split("?", 1)[0]
+    m = _CALL_KW_RE.match(path)
+    if m:
+        return path[:m.end()]
+    path = _ID_SEGMENT_RE.sub("/<id>", path)
+    return _SLUG_ID_RE.sub("-<id>", path)
+
+
+def route_model(path: str) -> Optional[str]:
+    m = _CALL_KW_RE.match(path)
+    return m.group("model") if m else None
+
+
+def aggregate(lines: Iterable[str], by: str, since: Optional[int], until: Optional[int]) -> Dict[str, PerfStats]:
+    """Fold werkzeug lines into ``{route or model: PerfStats}``."""
+    out: Dict[str, PerfStats] = {}
+    windowed = since is not None or until is not None
+    for line in lines:
+        if "werkzeug:" not in line:
+            continue
+        m = WERKZEUG_RE.search(line)
+        if not m:
+            continue
+        if windowed:
+            ts = decode_ts(line)
+            if ts is None or (since is not None and ts < since) or (until is not None and ts > until):
+                continue
+        path = m.group("path")
+        key = route_model(path) if by == "model" else f"{m.group('method')} {normalize_route(path)}"
+        if key is None:
+            continue
+        st = out.get(key)
+        if st is None:
+            st = out[key] = PerfStats()
+        st.add(int(m.group("status")), int(m.group("queries")), float(m.group("sql")), float(m.group("py")))
+    return out
+
+
+def perf_chunk(chunk, since: Optional[int], until: Optional[int], by: str) -> Dict[str, PerfStats]:
+    path, start, end = chunk
+    return aggregate(iter_lines(Path(path), start, end), by, since, until)
+
+
+def merge_stats(dst: Dict[str, PerfStats], src: Dict[str, PerfStats]) -> None:
+    for key, st in src.items():
+        cur = dst.get(key)
+        if cur is None:
+            dst[key] = st
+        else:
+            cur.merge(st)
@@ -0,0 +1,107 @@
+"""Incremental readers for plain, gzip-compressed and rotated Odoo logs."""
+import glob
+import gzip
+import re
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Sequence, Tuple
+
+from .parser import decode_ts
+
+GZIP_MAGIC = b"\x1f\x8b"
+_ROTATED_SUFFIX = re.compile(r"^\.(\d+)(\.gz)?$")
+
+
+def is_gzip(path: Path) -> bool:
+    """Detect gzip files by magic bytes so renamed archives are handled too."""
+    with open(path, "rb") as fh:
+        return fh.read(2) == GZIP_MAGIC
+
+
+def open_binary(path: Path) -> IO[bytes]:
+    """Open a log for binary reading, decompressing gzip transparently."""
+    return gzip.open(path, "rb") if is_gzip(path) else open(path, "rb")
+
+
+def iter_lines(path: Path, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """Yield decoded lines (without line endings) one at a time.
+
+    ``start``/``end`` are byte offsets; reading stops at the first line that
+    begins at or after ``end``.
+    """
+    with open_binary(path) as fh:
+        if start:
+            fh.seek(start)
+        pos = start
+        for raw in fh:
+            if end is not None and pos >= end:
+                break
+            pos += len(raw)
+            yield raw.decode("utf-8", "ignore").rstrip("\r\n")
+
+
+def iter_complete_lines(path: Path, start: int = 0) -> Iterator[Tuple[int, int, str]]:
+    """Yield (offset, next offset, line) for newline-terminated lines from ``start``.
+
+    A trailing partial line (still being written) is left for the next read.
+    """
+    with open_binary(path) as fh:
+        if start:
+            fh.seek(start)
+        pos = start
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                break
+            end = pos + len(raw)
+            yield pos, end, raw.decode("utf-8", "ignore").rstrip("\r\n")
+            pos = end
+
+
+def next_header(fh: IO[bytes], offset: int) -> Optional[Tuple[int, int]]:
+    """Offset and epoch-ms timestamp of the first line at/after ``offset`` with a parseable timestamp.
+
+    Splitting or seeking only on such lines keeps every traceback, and the
+    header its timestamp is taken from, on the same side of the cut.
+    """
+    fh.seek(offset)
+    if offset:
+        fh.readline()  # skip the partial line we landed in
+    while True:
+        pos = fh.tell()
+        raw = fh.readline()
+        if not raw:
+            return None
+        ts = decode_ts(raw.decode("utf-8", "ignore"))
+        if ts is not None:
+            return pos, ts
+
+
+def expand_paths(patterns: Sequence[str]) -> List[Path]:
+    """Resolve ``--path`` values, expanding globs the shell left quoted, without duplicates."""
+    out: List[Path] = []
+    for pat in patterns:
+        if any(c in pat for c in "*?["):
+            matches = [Path(m) for m in sorted(glob.glob(pat))]
+            if not matches:
+                raise FileNotFoundError(f"no files match {pat}")
+        else:
+            matches = [Path(pat)]
+            if not matches[0].is_file():
+                raise FileNotFoundError(f"not a file: {pat}")
+        for p in matches:
+            if p.is_file() and p not in out:
+                out.append(p)
+    return out
+
+
+def rotated_files(path: Path) -> List[Path]:
+    """Return ``path`` preceded by its rotated siblings (``odoo.log.N[.gz]``), oldest first."""
+    found = []
+    prefix = path.name
+    for cand in path.parent.iterdir():
+        if not cand.name.startswith(prefix) or cand == path:
+            continue
+        m = _ROTATED_SUFFIX.match(cand.name[len(prefix):])
+        if m and cand.is_file():
+            found.append((int(m.group(1)), cand))
+    found.sort(key=lambda x: x[0], reverse=True)
+    return [p for _, p in found] + [path]
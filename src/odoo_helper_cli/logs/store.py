@@ -0,0 +1,184 @@
+"""Local SQLite store of parsed traceback blocks for repeated querying.
+
+Ingest is incremental: each physical file (source label + inode) remembers
+the offset of the last complete line read and the scanner state, so a rerun
+only parses what was appended. Blocks are keyed on (source, start offset,
+timestamp, fingerprint), which also survives renaming (``odoo.log`` →
+``odoo.log.1``) and compression, so re-ingesting is a no-op.
+"""
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import orjson
+
+from .fingerprint import fingerprint
+from .parser import BlockScanner, format_ts
+from .reader import is_gzip, iter_complete_lines
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    source TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    scanner TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, inode)
+);
+CREATE TABLE IF NOT EXISTS blocks (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    ukey TEXT NOT NULL,
+    ts INTEGER,
+    exception TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    message TEXT,
+    snippet TEXT,
+    file TEXT NOT NULL,
+    UNIQUE (source, ukey)
+);
+CREATE INDEX IF NOT EXISTS blocks_ts ON blocks (ts);
+CREATE INDEX IF NOT EXISTS blocks_fingerprint ON blocks (fingerprint, ts);
+"""
+BATCH_SIZE = 5000
+_INSERT = (
+    "INSERT OR IGNORE INTO blocks (source, ukey, ts, exception, fingerprint, message, snippet, file) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def connect(db: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(db))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row(source: str, path: Path, b: Dict) -> Tuple:
+    fp = fingerprint(b["exception"], b["message"], b["snippet"])
+    ukey = f"{b['offset']}:{b['ts']}:{fp}"
+    return (source, ukey, b["ts"], b["exception"], fp, b["message"], b["snippet"], str(path))
+
+
+def ingest_file(conn: sqlite3.Connection, source: str, path: Path, live: bool) -> int:
+    """Ingest new blocks of one file; returns the number of rows offered.
+
+    ``live`` marks the file still being written: its open block is kept in
+    the scanner state instead of being closed at end of file.
+    """
+    inode = path.stat().st_ino
+    row = conn.execute(
+        "SELECT offset, scanner, complete FROM files WHERE source = ? AND inode = ?", (source, inode)
+    ).fetchone()
+    if row and row[2]:
+        return 0
+    start = row[0] if row else 0
+    if live and path.stat().st_size < start:
+        start = 0  # truncated in place
+    scanner = BlockScanner.from_state(orjson.loads(row[1])) if row and row[1] and start else BlockScanner()
+
+    batch: List[Tuple] = []
+    offered = 0
+    pos = start
+    for off, pos, line in iter_complete_lines(path, start):
+        b = scanner.feed(line, off)
+        if b is not None:
+            batch.append(_row(source, path, b))
+            if len(batch) >= BATCH_SIZE:
+                with conn:
+                    conn.executemany(_INSERT, batch)
+                offered += len(batch)
+                batch = []
+    if not live:
+        b = scanner.flush()
+        if b is not None:
+            batch.append(_row(source, path, b))
+    with conn:
+        conn.executemany(_INSERT, batch)
+        conn.execute(
+            "INSERT INTO files (source, inode, path, offset, scanner, complete) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (source, inode) DO UPDATE SET path = excluded.path, offset = excluded.offset, "
+            "scanner = excluded.scanner, complete = excluded.complete",
+            (source, inode, str(path), pos, orjson.dumps(scanner.state()).decode(), int(not live and is_gzip(path))),
+        )
+    return offered + len(batch)
+
+
+def _where(since: Optional[int], until: Optional[int], fp: Optional[str], exception: Optional[str]) -> Tuple[str, List]:
+    clauses, args = [], []
+    if since is not None:
+        clauses.append("ts >= ?")
+        args.append(since)
+    if until is not None:
+        clauses.append("ts <= ?")
+        args.append(until)
+    if fp:
+        clauses.append("fingerprint = ?")
+        args.append(fp)
+    if exception:
+        clauses.append("exception = ?")
+        args.append(exception)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def query_groups(
+    conn: sqlite3.Connection,
+    since: Optional[int],
+    until: Optional[int],
+    fp: Optional[str],
+    exception: Optional[str],
+    limit: int,
+) -> List[Dict]:
+    """Grouped results shaped like ``logs analyze`` output, largest groups first."""
+    where, args = _where(since, until, fp, exception)
+    # SQLite takes bare columns from the row that produced MIN(ts)
+    rows = conn.execute(
+        f"SELECT fingerprint, exception, message, MIN(ts), COUNT(*) FROM blocks{where} "
+        "GROUP BY fingerprint ORDER BY COUNT(*) DESC LIMIT ?",
+        args + [limit],
+    ).fetchall()
+    results = []
+    for fpr, exc, msg, first, count in rows:
+        ex_where, ex_args = _where(since, until, fpr, None)
+        examples = [r[0] for r in conn.execute(
+            f"SELECT snippet FROM blocks{ex_where} ORDER BY ts, id LIMIT 3", ex_args
+        )]
+        sources = dict(conn.execute(
+            f"SELECT source, COUNT(*) FROM blocks{ex_where} GROUP BY source", ex_args
+        ).fetchall())
+        results.append({
+            "exception": exc,
+            "message": msg,
+            "count": count,
+            "first_ts": format_ts(first),
+            "fingerprint": fpr,
+            "examples": examples,
+            "sources": sources,
+        })
+    return results
+
+
+def query_blocks(
+    conn: sqlite3.Connection,
+    since: Optional[int],
+    until: Optional[int],
+    fp: Optional[str],
+    exception: Optional[str],
+    limit: int,
+) -> Iterator[Dict]:
+    where, args = _where(since, until, fp, exception)
+    for ts, exc, msg, snippet, fpr, source in conn.execute(
+        f"SELECT ts, exception, message, snippet, fingerprint, source FROM blocks{where} ORDER BY ts, id LIMIT ?",
+        args + [limit],
+    ):
+        yield {
+            "exception": exc,
+            "message": msg,
+            "timestamp": format_ts(ts),
+            "snippet": snippet,
+            "count": 1,
+            "fingerprint": fpr,
+            "source": source,
+        }
@@ -0,0 +1,156 @@
+"""Match many regexes against a text, paying regex cost only for likely hits.
+
+Each pattern is parsed once to find literals of which at least one must
+occur in any match. The literals of all patterns are merged into one trie,
+compiled to a single regex (``(?=(lit(?:…)?|…))``) so that one scan of the
+text reports every literal present, whatever the number of patterns; one
+lowercased copy of the text is scanned the same way for case-insensitive
+literals. Only patterns whose literals were found (or that have none) run
+their full regex. CPython's ``re`` does not build a trie for a plain
+``a|b|c`` alternation, which is why the trie is spelled out.
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Sequence, Set, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+# Shorter literals filter too little to be worth checking
+MIN_LITERAL = 3
+
+# (literal, case-insensitive); literal is lowercased when case-insensitive
+Literal = Tuple[str, bool]
+
+
+def _pick(best: Optional[FrozenSet[Literal]], cand: Optional[FrozenSet[Literal]]):
+    """Prefer the alternative set whose shortest literal is longest."""
+    if not cand or min(len(s) for s, _ in cand) < MIN_LITERAL:
+        return best
+    if best is None or min(len(s) for s, _ in cand) > min(len(s) for s, _ in best):
+        return cand
+    return best
+
+
+def _required(items, icase: bool) -> Optional[FrozenSet[Literal]]:
+    """Literals of which one appears in every match of ``items``, or None if unknown."""
+    best = None
+    run: List[str] = []
+
+    def lit(chars: List[str]) -> Optional[FrozenSet[Literal]]:
+        s = "".join(chars)
+        if icase and not s.isascii():
+            return None  # see the folding note in MultiPattern.candidates
+        return frozenset({(s.lower() if icase else s, icase)})
+
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        if run:
+            best = _pick(best, lit(run))
+            run = []
+        if op == sre_parse.SUBPATTERN:
+            add_flags, del_flags, sub = av[1], av[2], av[3]
+            inner_icase = (icase or bool(add_flags & re.I)) and not (del_flags & re.I)
+            best = _pick(best, _required(sub, inner_icase))
+        elif op == sre_parse.BRANCH:
+            alts = [_required(b, icase) for b in av[1]]
+            if all(alts):
+                best = _pick(best, frozenset().union(*alts))
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            best = _pick(best, _required(av[2], icase))
+    if run:
+        best = _pick(best, lit(run))
+    return best
+
+
+def required_literals(pattern: str, flags: int = 0) -> Optional[FrozenSet[Literal]]:
+    """Necessary literals for ``pattern``; None when no useful prefilter exists."""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    return _required(parsed, bool(parsed.state.flags & re.I))
+
+
+def _trie_source(node: Dict) -> str:
+    alts = [re.escape(ch) + _trie_source(sub) for ch, sub in sorted(node.items()) if ch]
+    if not alts:
+        return ""
+    body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+    # Greedy: the longest literal at a position wins, its prefixes are recovered after
+    return f"(?:{body})?" if "" in node else body
+
+
+class LiteralScan:
+    """Every literal from a fixed set that occurs in a text, found in one regex pass."""
+
+    def __init__(self, literals: Iterable[str]):
+        self.literals: Set[str] = set(literals)
+        self.lengths = sorted({len(s) for s in self.literals})
+        trie: Dict = {}
+        for word in self.literals:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[""] = True
+        # Zero-width lookahead, so overlapping literals at later positions are still seen
+        self.regex = re.compile(f"(?=({_trie_source(trie)}))") if trie else None
+
+    def found(self, text: str) -> Set[str]:
+        out: Set[str] = set()
+        if self.regex is None:
+            return out
+        seen: Set[str] = set()
+        for m in self.regex.finditer(text):
+            longest = m.group(1)
+            if longest in seen:
+                continue
+            seen.add(longest)
+            for n in self.lengths:
+                if n > len(longest):
+                    break
+                if longest[:n] in self.literals:
+                    out.add(longest[:n])
+        return out
+
+
+class MultiPattern:
+    """A fixed set of regexes searched together against one text at a time."""
+
+    def __init__(self, patterns: Sequence[Tuple[str, int]]):
+        self._regexes: List[Pattern] = [re.compile(p, f) for p, f in patterns]
+        self._literals = [required_literals(p, f) for p, f in patterns]
+        # Patterns without a usable literal always run their regex
+        self._always = [i for i, lits in enumerate(self._literals) if lits is None]
+        self._owners: Dict[Literal, List[int]] = {}
+        for i, lits in enumerate(self._literals):
+            for lit in lits or ():
+                self._owners.setdefault(lit, []).append(i)
+        self._icase_patterns = sorted({i for (_, icase), idx in self._owners.items() if icase for i in idx})
+        self._exact = LiteralScan(s for s, icase in self._owners if not icase)
+        self._folded = LiteralScan(s for s, icase in self._owners if icase)
+
+    def __len__(self) -> int:
+        return len(self._regexes)
+
+    def candidates(self, text: str) -> List[int]:
+        """Indices of patterns whose prefilter passes (a superset of the matches), ascending."""
+        cand = set(self._always)
+        for s in self._exact.found(text):
+            cand.update(self._owners[(s, False)])
+        if self._icase_patterns:
+            # Unicode case folding has a few non-ASCII surprises (e.g. 'ſ' ~ 's'),
+            # so case-insensitive literals only prefilter ASCII text
+            if text.isascii():
+                for s in self._folded.found(text.lower()):
+                    cand.update(self._owners[(s, True)])
+            else:
+                cand.update(self._icase_patterns)
+        return sorted(cand)
+
+    def search_all(self, text: str) -> List[int]:
+        """Indices of every pattern that matches somewhere in ``text``, ascending."""
+        return [i for i in self.candidates(text) if self._regexes[i].search(text)]
@@ -1,10 +1,17 @@
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 from pathlib import Path
-import re
-import ast
-from typing import Dict, List, Optional
+import os
+import sys
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from .. import __version__
+from .modules import DependencyGraph, check_inherits, discover, manifest_file, model_index, read_manifest
+from .output import BaselineFilter, JsonlWriter, SarifWriter, fingerprint, load_baseline
+from .rules import KNOWN_VERSIONS, RULES, STEP_NOTES
+from .scanner import iter_scan
 
 app = typer.Typer()
 console = Console()
@@ -13,133 +20,229 @@ console = Console()
 @app.command("plan")
 def plan(frm: int = typer.Option(..., "--from"), to: int = typer.Option(..., "--to")):
     """Generate a migration checklist with common breaking areas between versions."""
-    items_by_version = {
-        (14, 15): [
-            "Python 3.8 baseline, review deprecated APIs in mail, website.",
-            "ORM: check compute/store fields definitions; onchange API cleanup.",
-            "JS/QWeb: Owl adoption starts; legacy widgets may break.",
-        ],
-        (15, 16): [
-            "Discussed mail/thread refactors; check chatter overrides.",
-            "Accounting changes; report templates adjustments.",
-            "New assets pipeline; verify web/assets bundle names.",
-        ],
-        (16, 17): [
-            "Owl v2 widespread; legacy qweb widgets removal.",
-            "HTTP controllers typing; check request.params usages.",
-            "Models cleanup: deprecated fields/APIs removed.",
-        ],
-    }
     table = Table(title=f"Migration Checklist {frm} → {to}")
     table.add_column("Area")
     table.add_column("Notes", overflow="fold")
 
-    for (f, t), notes in items_by_version.items():
-        if frm <= f and to >= t:
-            table.add_row(f"{f} → {t}", "\n".join(f"- {n}" for n in notes))
+    steps = [v for v in KNOWN_VERSIONS if frm < v <= to]
+    for v in steps:
+        notes = [f"- {n}" for n in STEP_NOTES.get(v, [])]
+        titles = list(dict.fromkeys(r["title"] for r in RULES if r["version"] == v))
+        if titles:
+            notes.append("Checked by `migrate scan`:")
+            notes.extend(f"- {t}" for t in titles)
+        table.add_row(f"{v - 1} → {v}", "\n".join(notes))
 
     if len(table.rows) == 0:
-        console.print("[yellow]No predefined notes for this version range. Use --from/--to within 14–17.")
+        console.print(f"[yellow]No predefined notes for this version range. Known target versions: "
+                      f"{', '.join(map(str, KNOWN_VERSIONS))}.")
     else:
         console.print(table)
 
 
-@app.command("scan")
-def scan(
-    path: Path = typer.Option(..., exists=True, file_okay=False, help="Module directory"),
-    odoo_version: Optional[int] = typer.Option(None, help="Target Odoo version"),
-):
-    """Static scan for _inherit/_name conflicts, manifest depends, and deprecated patterns."""
-    root = Path(path)
-    issues: List[str] = []
-
-    # Manifest parsing
-    manifest_file = None
-    for cand in (root / "__manifest__.py", root / "__openerp__.py"):
-        if cand.exists():
-            manifest_file = cand
-            break
-    depends: List[str] = []
+def _addons_paths(values: List[str]) -> List[Path]:
+    """Repeated and/or comma-separated paths, as in odoo.conf's addons_path."""
+    paths = [Path(p.strip()).expanduser() for v in values for p in v.split(",") if p.strip()]
+    for p in paths:
+        if not p.is_dir():
+            console.print(f"[red]Addons path not found: {p}")
+            raise typer.Exit(code=2)
+    return paths
+
+
+def _drain(modules: Dict) -> Iterator[Dict]:
+    for m in modules.values():
+        yield from m.findings
+        m.findings.clear()
+
+
+def _addons_findings(paths: List[Path], frm: int, to: int, jobs: int, use_cache: bool, ctx: Dict) -> Iterator[Dict]:
+    """Findings for every module of the addons paths as they are produced; ``ctx`` gets the graph and counts."""
+    modules, findings = discover(paths)
+    graph = DependencyGraph(modules)
+    graph.add_findings()
+    ctx.update(modules=modules, graph=graph)
+    yield from findings
+    yield from _drain(modules)
+
+    # Module names are unique after discovery, so "<module>/<file>" keys files across paths
+    files: Dict[str, Dict] = {}
+    for ap in paths:
+        dirs = [m.path for m in modules.values() if m.addons_path == ap]
+        if not dirs:
+            continue
+        for rel, result in iter_scan(ap, frm, to, jobs, use_cache, dirs, ctx["counts"]):
+            files[rel] = result
+            mod, name = rel.split("/", 1)
+            for f in result["findings"]:
+                yield {"module": mod, "file": name, **f}
+
+    def module_of(rel: str) -> str:
+        return rel.split("/", 1)[0]
+
+    # Cross-module checks need every module's models, so they come last
+    check_inherits(graph, files, module_of, model_index(files, module_of))
+    yield from _drain(modules)
+
+
+def _module_findings(root: Path, frm: int, to: int, jobs: int, use_cache: bool, ctx: Dict) -> Iterator[Dict]:
+    """Findings for one module as they are produced; ``ctx`` gets its depends and counts."""
     name = root.name
-    if manifest_file:
+    mf = manifest_file(root)
+    ctx["depends"] = []
+    if mf:
         try:
-            data = manifest_file.read_text(encoding="utf-8")
-            obj = ast.literal_eval(compile(data, str(manifest_file), 'eval'))
-            depends = list(obj.get('depends', [])) if isinstance(obj, dict) else []
+            ctx["depends"] = [str(d) for d in read_manifest(mf).get("depends", [])]
         except Exception as e:
-            issues.append(f"Failed to parse manifest: {manifest_file.name}: {e}")
+            yield {"module": name, "rule": "manifest-parse", "file": mf.name, "line": None,
+                   "message": f"Failed to parse manifest: {e}"}
     else:
-        issues.append("Manifest file not found (__manifest__.py).")
+        yield {"module": name, "rule": "manifest-missing", "file": None, "line": None,
+               "message": "Manifest file not found (__manifest__.py)."}
 
-    # Python model scan
-    model_defs: Dict[str, Dict] = {}
-    for py in root.rglob("*.py"):
-        try:
-            code = py.read_text(encoding="utf-8")
-        except Exception:
-            continue
+    # One pass over the module's files: models and every rule of the range together
+    for rel, result in iter_scan(root, frm, to, jobs, use_cache, counts=ctx["counts"]):
+        for f in result["findings"]:
+            yield {"module": name, "file": rel, **f}
+
+
+def _identified(findings: Iterable[Dict], tree: bool) -> Iterator[Dict]:
+    """Add the path relative to the scanned directory and the baseline fingerprint."""
+    for f in findings:
+        out = {k: f.get(k) for k in ("rule", "module", "file", "line", "message")}
+        out["path"] = "/".join(p for p in (f["module"] if tree else None, f["file"]) if p) or None
+        out["fingerprint"] = fingerprint(out)
+        yield out
+
+
+@app.command("scan")
+def scan(
+    path: Optional[Path] = typer.Option(None, exists=True, file_okay=False, help="Module directory"),
+    addons_path: Optional[List[str]] = typer.Option(None, help="Scan every module of these addons directories (repeatable or comma-separated, first wins)"),
+    frm: Optional[int] = typer.Option(None, "--from", help="Current Odoo version; only rules for later changes apply"),
+    odoo_version: Optional[int] = typer.Option(None, "--to", "--odoo-version", "--odoo_version", help="Target Odoo version (default: all known rules)"),
+    jobs: int = typer.Option(0, help="Worker processes for analysis (0 = all cores)"),
+    cache: bool = typer.Option(True, help="Reuse cached per-file results for unchanged files"),
+    show_order: bool = typer.Option(False, help="With --addons-path, print the dependency install order"),
+    output: str = typer.Option("rich", help="Output format: rich|jsonl|sarif (jsonl and sarif stream to stdout)"),
+    baseline: Optional[Path] = typer.Option(None, exists=True, dir_okay=False, readable=True, help="Earlier jsonl or sarif report; only findings not in it are reported"),
+):
+    """Static scan for _inherit/_name conflicts, manifest depends, and deprecated patterns."""
+    if bool(path) == bool(addons_path):
+        console.print("[red]Give either --path (one module) or --addons-path")
+        raise typer.Exit(code=2)
+    if output not in ("rich", "jsonl", "sarif"):
+        console.print("[red]--output must be rich, jsonl or sarif")
+        raise typer.Exit(code=2)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    start = frm if frm is not None else KNOWN_VERSIONS[0] - 1
+    target = odoo_version if odoo_version is not None else KNOWN_VERSIONS[-1]
+    if start >= target:
+        console.print("[red]--from must be lower than the target version")
+        raise typer.Exit(code=2)
+    known = None
+    if baseline:
         try:
-            tree = ast.parse(code)
-        except Exception:
-            continue
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                # look for assignments _name/_inherit
-                _name = None
-                _inherit = None
-                for assign in [n for n in node.body if isinstance(n, ast.Assign)]:
-                    for t in assign.targets:
-                        if isinstance(t, ast.Name) and t.id in {"_name", "_inherit"}:
-                            try:
-                                val = ast.literal_eval(assign.value)
-                            except Exception:
-                                val = None
-                            if t.id == "_name":
-                                _name = val
-                            else:
-                                _inherit = val
-                if _name or _inherit:
-                    model_defs[node.name] = {"_name": _name, "_inherit": _inherit, "file": str(py.relative_to(root))}
-
-    # Analyze model conflicts
-    for cls, d in model_defs.items():
-        if d["_name"] and d["_inherit"]:
-            issues.append(f"Class {cls} defines both _name ({d['_name']}) and _inherit ({d['_inherit']}). Ensure this is intended (new model vs extension).")
-        if not d["_name"] and not d["_inherit"]:
-            issues.append(f"Class {cls} in {d['file']} lacks _name/_inherit; if it's a model, define one.")
-
-    # Simple deprecated patterns
-    deprecated_rx = [
-        re.compile(r"@api\.(multi)\b"),
-        re.compile(r"@api\.(v7|v8)\b"),
-    ]
-    for py in root.rglob("*.py"):
+            known = BaselineFilter(load_baseline(baseline))
+        except ValueError as e:
+            console.print(f"[red]Invalid baseline:[/red] {e}")
+            raise typer.Exit(code=2)
+
+    ctx: Dict = {"counts": {}}
+    if addons_path:
+        findings = _addons_findings(_addons_paths(addons_path), start, target, jobs, cache, ctx)
+    else:
+        findings = _module_findings(Path(path), start, target, jobs, cache, ctx)
+    findings = _identified(findings, tree=bool(addons_path))
+    if known is not None:
+        findings = (f for f in findings if known.is_new(f))
+
+    if output != "rich":
+        writer = JsonlWriter(sys.stdout.buffer) if output == "jsonl" else SarifWriter(sys.stdout.buffer, __version__)
+        n = 0
         try:
-            text = py.read_text(encoding="utf-8")
-        except Exception:
-            continue
-        for rx in deprecated_rx:
-            if rx.search(text):
-                issues.append(f"Deprecated API usage in {py.relative_to(root)}: pattern {rx.pattern}")
+            for f in findings:
+                writer.write(f)
+                n += 1
+        finally:
+            writer.close()
+        counts = ctx["counts"]
+        err = Console(stderr=True)
+        err.print(f"[dim]{n} findings" + (f" ({known.suppressed} in baseline)" if known else "")
+                  + f"; {counts.get('analyzed', 0)} files analyzed, {counts.get('cached', 0)} from cache")
+        return
+
+    findings = list(findings)
+    suppressed = known.suppressed if known else None
+    if addons_path:
+        _report_addons(findings, ctx, odoo_version, show_order, suppressed)
+        return
 
     # Output report
-    console.print(f"Scanning module: [bold]{name}[/bold]")
-    table = Table(title="Findings")
+    findings.sort(key=lambda f: (f["file"] or "", f["line"] or 0))
+    depends = ctx["depends"]
+    console.print(f"Scanning module: [bold]{Path(path).name}[/bold]")
+    table = Table(title="Findings" if suppressed is None else f"New findings ({suppressed} in baseline)")
     table.add_column("Type")
+    table.add_column("Location", overflow="fold")
     table.add_column("Detail", overflow="fold")
 
     if depends:
-        table.add_row("depends", ", ".join(depends))
+        table.add_row("depends", "", ", ".join(depends))
     else:
-        table.add_row("depends", "(none)")
+        table.add_row("depends", "", "(none)")
 
-    if issues:
-        for it in issues:
-            table.add_row("issue", it)
+    if findings:
+        for it in findings:
+            table.add_row(it["rule"], escape(_location(it)), escape(it["message"]))
     else:
-        table.add_row("info", "No obvious issues found.")
+        table.add_row("info", "", "No obvious issues found.")
 
     if odoo_version:
-        table.add_row("target", f"Odoo {odoo_version}")
+        table.add_row("target", "", f"Odoo {odoo_version}")
 
     console.print(table)
+    counts = ctx["counts"]
+    console.print(f"[dim]{counts['analyzed'] + counts['cached']} files: {counts['analyzed']} analyzed, {counts['cached']} from cache")
+
+
+def _location(f: Dict) -> str:
+    return f"{f['file']}:{f['line']}" if f["line"] else (f["file"] or "")
+
+
+def _report_addons(
+    findings: List[Dict], ctx: Dict, odoo_version: Optional[int], show_order: bool, suppressed: Optional[int],
+) -> None:
+    modules, graph, counts = ctx["modules"], ctx["graph"], ctx["counts"]
+    console.print(
+        f"Scanned [bold]{len(modules)}[/bold] modules, {counts.get('analyzed', 0) + counts.get('cached', 0)} files "
+        f"({counts.get('analyzed', 0)} analyzed, {counts.get('cached', 0)} from cache)"
+        + (f", target Odoo {odoo_version}" if odoo_version else "")
+    )
+    if graph.cycles:
+        for cycle in graph.cycles:
+            console.print(f"[red]Dependency cycle:[/red] {' → '.join(cycle)}")
+    if graph.missing:
+        absent = sorted({d for ds in graph.missing.values() for d in ds})
+        console.print(f"[yellow]Missing dependencies:[/yellow] {', '.join(absent)}")
+    stuck = len(modules) - len(graph.order)
+    if stuck:
+        console.print(f"[yellow]{stuck} modules cannot be ordered (in or behind a dependency cycle)")
+    if show_order:
+        console.print("[bold]Install order:[/bold] " + ", ".join(graph.order))
+
+    if not findings:
+        console.print("[green]No obvious issues found." if suppressed is None else f"[green]No new findings ({suppressed} in baseline).")
+        return
+    rank = {n: i for i, n in enumerate(graph.order)}
+    findings.sort(key=lambda f: (rank.get(f["module"], len(rank)), f["module"], f["file"] or "", f["line"] or 0))
+    title = f"Findings ({len(findings)})" if suppressed is None else f"New findings ({len(findings)}, {suppressed} in baseline)"
+    table = Table(title=title)
+    table.add_column("Module")
+    table.add_column("Type")
+    table.add_column("Location", overflow="fold")
+    table.add_column("Detail", overflow="fold")
+    for f in findings:
+        table.add_row(f["module"], f["rule"], escape(_location(f)), escape(f["message"]))
+    console.print(table)
@@ -0,0 +1,241 @@
+"""Addons-path discovery, the manifest dependency graph and ``_inherit`` cross-checks.
+
+Modules are found once across every addons path (the first path providing a
+module wins, as in Odoo). The graph gives an install order (Kahn's
+algorithm), cycles and missing dependencies; each module's transitive
+dependencies are computed once in that order and reused by the model checks.
+"""
+import ast
+import heapq
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MANIFEST_NAMES = ("__manifest__.py", "__openerp__.py")
+
+
+def manifest_file(module_dir: Path) -> Optional[Path]:
+    for name in MANIFEST_NAMES:
+        cand = module_dir / name
+        if cand.is_file():
+            return cand
+    return None
+
+
+def read_manifest(path: Path) -> Dict:
+    """The manifest dict; raises ``ValueError`` when it is not a literal dict."""
+    obj = ast.literal_eval(path.read_text(encoding="utf-8"))
+    if not isinstance(obj, dict):
+        raise ValueError("manifest is not a dict")
+    return obj
+
+
+class Module:
+    def __init__(self, name: str, path: Path, addons_path: Path):
+        self.name = name
+        self.path = path
+        self.addons_path = addons_path
+        self.depends: List[str] = []
+        self.installable = True
+        self.findings: List[Dict] = []
+
+    def finding(self, rule: str, message: str, file: Optional[str] = None, line: Optional[int] = None) -> None:
+        self.findings.append({"rule": rule, "module": self.name, "file": file, "line": line, "message": message})
+
+
+def discover(addons_paths: Iterable[Path]) -> Tuple[Dict[str, Module], List[Dict]]:
+    """Modules by name across addons paths, plus findings for shadowed duplicates."""
+    modules: Dict[str, Module] = {}
+    findings = []
+    for ap in addons_paths:
+        for d in sorted(p for p in ap.iterdir() if p.is_dir() and not p.name.startswith(".")):
+            mf = manifest_file(d)
+            if mf is None:
+                continue
+            if d.name in modules:
+                findings.append({
+                    "rule": "duplicate-module", "module": d.name, "file": None, "line": None,
+                    "message": f"{d} is shadowed by {modules[d.name].path} (earlier in the addons path)",
+                })
+                continue
+            m = Module(d.name, d, ap)
+            try:
+                manifest = read_manifest(mf)
+                m.depends = [str(x) for x in manifest.get("depends", [])]
+                m.installable = bool(manifest.get("installable", True))
+            except Exception as e:
+                m.finding("manifest-parse", f"Failed to parse manifest: {e}", mf.name)
+            modules[d.name] = m
+    return modules, findings
+
+
+class DependencyGraph:
+    """Dependency DAG over discovered modules; edges go from a module to what it depends on."""
+
+    def __init__(self, modules: Dict[str, Module]):
+        self.modules = modules
+        self.missing: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, List[str]] = defaultdict(list)
+        for name, m in modules.items():
+            absent = [d for d in m.depends if d not in modules]
+            if absent:
+                self.missing[name] = absent
+            for d in m.depends:
+                if d in modules:
+                    self.dependents[d].append(name)
+        self.order, self.cycles = self._toposort()
+        self.closure = self._closure()
+
+    def _toposort(self) -> Tuple[List[str], List[List[str]]]:
+        """Install order (dependencies first, ties by name) and the cycles that block the rest."""
+        indegree = {n: len({d for d in m.depends if d in self.modules}) for n, m in self.modules.items()}
+        ready = [n for n, k in indegree.items() if k == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            n = heapq.heappop(ready)
+            order.append(n)
+            for dep in set(self.dependents[n]):
+                indegree[dep] -= 1
+                if indegree[dep] == 0:
+                    heapq.heappush(ready, dep)
+        left = {n for n, k in indegree.items() if k > 0}
+        return order, self._cycles(left) if left else []
+
+    def _cycles(self, nodes: Set[str]) -> List[List[str]]:
+        """Strongly connected components among ``nodes`` that contain a cycle (iterative Tarjan)."""
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        out = []
+        for start in sorted(nodes):
+            if start in index:
+                continue
+            work = [(start, iter(sorted(d for d in set(self.modules[start].depends) if d in nodes)))]
+            index[start] = low[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                v, it = work[-1]
+                for w in it:
+                    if w not in index:
+                        index[w] = low[w] = len(index)
+                        stack.append(w)
+                        on_stack.add(w)
+                        work.append((w, iter(sorted(d for d in set(self.modules[w].depends) if d in nodes))))
+                        break
+                    if w in on_stack:
+                        low[v] = min(low[v], index[w])
+                else:
+                    work.pop()
+                    if work:
+                        low[work[-1][0]] = min(low[work[-1][0]], low[v])
+                    if low[v] == index[v]:
+                        comp = []
+                        while True:
+                            w = stack.pop()
+                            on_stack.discard(w)
+                            comp.append(w)
+                            if w == v:
+                                break
+                        if len(comp) > 1 or v in self.modules[v].depends:
+                            out.append(sorted(comp))
+        return out
+
+    def _closure(self) -> Dict[str, Set[str]]:
+        """Transitive dependencies per module, built once in install order."""
+        closure: Dict[str, Set[str]] = {}
+        for n in self.order:
+            acc: Set[str] = set()
+            for d in self.modules[n].depends:
+                if d in closure:
+                    acc.add(d)
+                    acc |= closure[d]
+            closure[n] = acc
+        # Modules stuck in or behind a cycle get what is reachable without looping
+        for n in self.modules:
+            if n not in closure:
+                seen: Set[str] = set()
+                todo = [d for d in self.modules[n].depends if d in self.modules]
+                while todo:
+                    d = todo.pop()
+                    if d not in seen:
+                        seen.add(d)
+                        todo.extend(x for x in self.modules[d].depends if x in self.modules)
+                closure[n] = seen
+        return closure
+
+    def incomplete(self, name: str) -> bool:
+        """True when the module or one of its dependencies depends on a module not found."""
+        return name in self.missing or any(d in self.missing for d in self.closure[name])
+
+    def add_findings(self) -> None:
+        """Record missing dependencies and cycles on the modules concerned."""
+        for name, absent in sorted(self.missing.items()):
+            self.modules[name].finding("missing-dependency", f"Depends on {', '.join(absent)}, not found in the addons path")
+        for cycle in self.cycles:
+            for name in cycle:
+                self.modules[name].finding("dependency-cycle", f"Dependency cycle: {' → '.join(cycle)}")
+
+
+def _as_list(value) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, (list, tuple)):
+        return [v for v in value if isinstance(v, str)]
+    return []
+
+
+def model_index(files: Dict[str, Dict], module_of) -> Dict[str, Set[str]]:
+    """Models each module defines (``_name``), from per-file scan results.
+
+    ``module_of`` maps a file key to its module name, or None to skip it.
+    """
+    defined: Dict[str, Set[str]] = defaultdict(set)
+    for rel, result in files.items():
+        mod = module_of(rel)
+        if mod is None:
+            continue
+        for m in result["models"]:
+            for name in _as_list(m["name"]):
+                defined[mod].add(name)
+    return defined
+
+
+def check_inherits(
+    graph: DependencyGraph,
+    files: Dict[str, Dict],
+    module_of,
+    defined: Dict[str, Set[str]],
+) -> None:
+    """Flag ``_inherit`` targets not defined by the module or its transitive dependencies."""
+    providers: Dict[str, List[str]] = defaultdict(list)
+    for mod, names in defined.items():
+        for n in names:
+            providers[n].append(mod)
+    for rel, result in files.items():
+        mod = module_of(rel)
+        if mod is None:
+            continue
+        visible = defined.get(mod, set()).union(*(defined.get(d, set()) for d in graph.closure[mod]))
+        for m in result["models"]:
+            own = set(_as_list(m["name"]))
+            for target in _as_list(m["inherit"]):
+                # _name == _inherit without a provider is a new model written that way
+                if target in own or target in visible:
+                    continue
+                where = sorted(p for p in providers.get(target, []) if p != mod)
+                if where:
+                    graph.modules[mod].finding(
+                        "inherit-undeclared-dependency",
+                        f"Class {m['class']} inherits {target}, defined in {', '.join(where)}, "
+                        "which is not among the module's dependencies",
+                        rel.split("/", 1)[1], m["line"],
+                    )
+                elif not graph.incomplete(mod):
+                    graph.modules[mod].finding(
+                        "inherit-unknown-model",
+                        f"Class {m['class']} inherits {target}, which no module in the addons path defines",
+                        rel.split("/", 1)[1], m["line"],
+                    )
@@ -0,0 +1,147 @@
+"""Streaming machine-readable scan output and baselines.
+
+Findings are written one by one as the scan produces them, as JSON Lines or
+as a SARIF 2.1.0 log whose ``results`` array is left open until the scan
+ends. Each finding carries a fingerprint: a hash of rule id, module, file and
+message, without the line number so that edits elsewhere in a file do not
+make old findings look new. A baseline (an earlier JSONL or SARIF report) is
+loaded into a multiset of fingerprints; a finding is new when its
+fingerprint is not left in that index.
+"""
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import BinaryIO, Dict, List
+
+import orjson
+
+from .rules import RULES
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+FINGERPRINT_KEY = "odooHelper/v1"
+
+# Checks that are not version-keyed rules: id → (description, SARIF level)
+BUILTIN_CHECKS: Dict[str, tuple] = {
+    "python-syntax": ("Python file cannot be parsed", "error"),
+    "python-encoding": ("Python file is not UTF-8", "error"),
+    "js-encoding": ("JS file is not UTF-8", "warning"),
+    "xml-syntax": ("XML file is not well-formed", "error"),
+    "model-name-inherit": ("Class sets both _name and _inherit", "note"),
+    "manifest-parse": ("Manifest cannot be parsed", "error"),
+    "manifest-missing": ("Module has no manifest", "error"),
+    "duplicate-module": ("Module shadowed by one earlier in the addons path", "warning"),
+    "missing-dependency": ("Dependency not found in the addons path", "error"),
+    "dependency-cycle": ("Modules depend on each other in a cycle", "error"),
+    "inherit-undeclared-dependency": ("Inherited model comes from a module that is not a dependency", "warning"),
+    "inherit-unknown-model": ("Inherited model is not defined by any scanned module", "warning"),
+}
+
+
+def fingerprint(f: Dict) -> str:
+    key = "\x1f".join(str(f.get(k) or "") for k in ("rule", "module", "file", "message"))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def load_baseline(path: Path) -> Counter:
+    """Fingerprint multiset from a JSONL or SARIF report; raises ``ValueError`` if it is neither."""
+    data = path.read_bytes()
+    index: Counter = Counter()
+    try:
+        doc = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        doc = None
+    if isinstance(doc, dict) and "runs" in doc:
+        for run in doc["runs"]:
+            for r in run.get("results", []):
+                fp = (r.get("partialFingerprints") or {}).get(FINGERPRINT_KEY)
+                if fp:
+                    index[fp] += 1
+        return index
+    for n, line in enumerate(data.splitlines(), 1):
+        if not line.strip():
+            continue
+        try:
+            rec = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            raise ValueError(f"{path}:{n}: not a JSONL or SARIF report")
+        if isinstance(rec, dict) and rec.get("fingerprint"):
+            index[rec["fingerprint"]] += 1
+    return index
+
+
+class BaselineFilter:
+    """Passes findings not covered by the baseline; each baseline entry covers one finding."""
+
+    def __init__(self, index: Counter):
+        self.index = index
+        self.suppressed = 0
+
+    def is_new(self, f: Dict) -> bool:
+        fp = f["fingerprint"]
+        if self.index[fp] > 0:
+            self.index[fp] -= 1
+            self.suppressed += 1
+            return False
+        return True
+
+
+class JsonlWriter:
+    def __init__(self, out: BinaryIO):
+        self.out = out
+
+    def write(self, f: Dict) -> None:
+        self.out.write(orjson.dumps(f, option=orjson.OPT_APPEND_NEWLINE))
+
+    def close(self) -> None:
+        self.out.flush()
+
+
+def _sarif_rules() -> List[Dict]:
+    out = []
+    for r in RULES:
+        out.append({
+            "id": r["id"],
+            "shortDescription": {"text": r["title"]},
+            "fullDescription": {"text": r["message"]},
+            "properties": {"odooVersion": r["version"], "language": r["lang"]},
+        })
+    for rid, (text, level) in BUILTIN_CHECKS.items():
+        out.append({"id": rid, "shortDescription": {"text": text}, "defaultConfiguration": {"level": level}})
+    return out
+
+
+class SarifWriter:
+    """SARIF 2.1.0 written incrementally: header, then one result at a time, then the closing brackets."""
+
+    def __init__(self, out: BinaryIO, tool_version: str):
+        self.out = out
+        self.first = True
+        self.levels = {rid: level for rid, (_, level) in BUILTIN_CHECKS.items()}
+        run_head = {
+            "tool": {"driver": {
+                "name": "odoo-helper", "version": tool_version, "informationUri": "https://example.com/odoo-helper-cli",
+                "rules": _sarif_rules(),
+            }},
+            "originalUriBaseIds": {"SRCROOT": {"description": {"text": "Scanned module or addons directory"}}},
+        }
+        head = orjson.dumps({"version": "2.1.0", "$schema": SARIF_SCHEMA, "runs": [run_head]})
+        # Reopen the run object to append its results array
+        self.out.write(head[:-3] + b',"results":[')
+
+    def write(self, f: Dict) -> None:
+        location: Dict = {"artifactLocation": {"uri": f.get("path") or ".", "uriBaseId": "SRCROOT"}}
+        if f.get("line"):
+            location["region"] = {"startLine": f["line"]}
+        result = {
+            "ruleId": f["rule"],
+            "level": self.levels.get(f["rule"], "warning"),
+            "message": {"text": f["message"]},
+            "locations": [{"physicalLocation": location}],
+            "partialFingerprints": {FINGERPRINT_KEY: f["fingerprint"]},
+        }
+        self.out.write((b"" if self.first else b",") + orjson.dumps(result))
+        self.first = False
+
+    def close(self) -> None:
+        self.out.write(b"]}]}\n")
+        self.out.flush()
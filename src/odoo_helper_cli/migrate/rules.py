@@ -0,0 +1,267 @@
+"""Version-keyed migration rules for Python, XML views and JS assets.
+
+Each rule names the Odoo version in which the change lands (``version``);
+a scan from A to B compiles only rules with ``A < version <= B``. Rules are
+data, grouped by language:
+
+- ``python``: matched on the AST in one walk per file, by decorator, call,
+  keyword argument, method definition, class attribute or import; call
+  rules can also require ``min_args`` and a ``first_arg`` predicate from
+  ``ARG_PREDICATES``;
+- ``xml``: matched on element start events while the file is streamed
+  through expat (which also gives line numbers), by tag and/or attribute
+  value;
+- ``js``: regexes searched together with :class:`MultiPattern`, so each
+  asset is scanned once however many rules there are.
+
+``STEP_NOTES`` holds the free-form checklist per target version; ``migrate
+plan`` prints those with the titles of the rules for each step.
+"""
+import ast
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from xml.parsers import expat
+
+from ..matcher import MultiPattern
+
+STEP_NOTES: Dict[int, List[str]] = {
+    15: [
+        "Python 3.8 baseline, review deprecated APIs in mail, website.",
+        "ORM: check compute/store fields definitions; onchange API cleanup.",
+        "JS/QWeb: Owl adoption starts; legacy widgets may break.",
+    ],
+    16: [
+        "Discussed mail/thread refactors; check chatter overrides.",
+        "Accounting changes; report templates adjustments.",
+        "New assets pipeline; verify web/assets bundle names.",
+    ],
+    17: [
+        "Owl v2 widespread; legacy qweb widgets removal.",
+        "HTTP controllers typing; check request.params usages.",
+        "Models cleanup: deprecated fields/APIs removed.",
+    ],
+}
+
+RULES: List[Dict] = [
+    # Python
+    {"id": "py-openerp-import", "version": 10, "lang": "python", "match": {"import": "openerp"},
+     "title": "openerp package renamed to odoo", "message": "Import from odoo instead of openerp"},
+    {"id": "py-api-v7-v8", "version": 10, "lang": "python", "match": {"decorator": ["api.v7", "api.v8"]},
+     "title": "@api.v7/@api.v8 removed", "message": "Old-API dual decorators are gone; keep the new-API method only"},
+    {"id": "py-api-multi", "version": 13, "lang": "python", "match": {"decorator": "api.multi"},
+     "title": "@api.multi removed", "message": "@api.multi is the default since 13.0; drop the decorator"},
+    {"id": "py-api-one", "version": 13, "lang": "python", "match": {"decorator": "api.one"},
+     "title": "@api.one removed", "message": "@api.one is gone; loop over self explicitly"},
+    {"id": "py-sudo-user", "version": 13, "lang": "python", "match": {"call": "sudo", "min_args": 1, "first_arg": "not_const_bool"},
+     "title": "sudo(user) replaced by with_user()", "message": "sudo() no longer takes a user; use with_user(user)"},
+    {"id": "py-track-visibility", "version": 13, "lang": "python", "match": {"keyword": "track_visibility"},
+     "title": "track_visibility replaced by tracking", "message": "Use tracking=True instead of track_visibility"},
+    {"id": "py-fields-view-get", "version": 16, "lang": "python",
+     "match": {"method": "fields_view_get", "call": "fields_view_get"},
+     "title": "fields_view_get replaced by get_views/_get_view",
+     "message": "fields_view_get is deprecated; override _get_view or call get_views"},
+    {"id": "py-name-get", "version": 17, "lang": "python", "match": {"method": "name_get"},
+     "title": "name_get replaced by display_name", "message": "Override _compute_display_name instead of name_get"},
+    {"id": "py-sql-constraints", "version": 18, "lang": "python", "match": {"class_attr": "_sql_constraints"},
+     "title": "_sql_constraints replaced by models.Constraint",
+     "message": "Declare constraints as models.Constraint class attributes"},
+    # XML views and templates
+    {"id": "xml-t-raw", "version": 15, "lang": "xml", "match": {"attr": "t-raw"},
+     "title": "t-raw deprecated", "message": "Use t-out (with markupsafe.Markup for trusted HTML) instead of t-raw"},
+    {"id": "xml-assets-template", "version": 15, "lang": "xml",
+     "match": {"tag": "template", "attr": "inherit_id", "value": r"^web\.assets_|\.assets$"},
+     "title": "asset bundles declared in the manifest",
+     "message": "Move asset files to the manifest 'assets' key instead of inheriting the bundle template"},
+    {"id": "xml-attrs-states", "version": 17, "lang": "xml", "match": {"attr": ["attrs", "states"]},
+     "title": "attrs/states removed from views",
+     "message": "Replace attrs/states with invisible/readonly/required Python expressions"},
+    {"id": "xml-xpath-attrs-states", "version": 17, "lang": "xml",
+     "match": {"tag": "attribute", "attr": "name", "value": r"^(attrs|states)$"},
+     "title": "attrs/states removed from views",
+     "message": "xpath sets attrs/states; set invisible/readonly/required instead"},
+    {"id": "xml-tree-view", "version": 18, "lang": "xml", "match": {"tag": "tree"},
+     "title": "tree views renamed list", "message": "Use <list> instead of <tree>"},
+    {"id": "xml-kanban-box", "version": 18, "lang": "xml", "match": {"attr": "t-name", "value": r"^kanban-box$"},
+     "title": "kanban-box template replaced by card", "message": "Use t-name=\"card\" in kanban views"},
+    {"id": "xml-xpath-oe-chatter", "version": 18, "lang": "xml",
+     "match": {"tag": "xpath", "attr": "expr", "value": r"oe_chatter"},
+     "title": "chatter div replaced by <chatter/>", "message": "xpath targets div.oe_chatter; target //chatter instead"},
+    # JS / Owl assets
+    {"id": "js-widget-extend", "version": 16, "lang": "js", "match": {"pattern": r"\b(?:AbstractField|Widget)\.extend\("},
+     "title": "legacy field widgets replaced by Owl", "message": "Legacy widget; rewrite as an Owl component"},
+    {"id": "js-owl-global", "version": 16, "lang": "js", "match": {"pattern": r"\}\s*=\s*owl\b"},
+     "title": "Owl 2 imported from @odoo/owl", "message": "Import from \"@odoo/owl\" instead of the owl global"},
+    {"id": "js-odoo-define", "version": 17, "lang": "js", "match": {"pattern": r"\bodoo\.define\("},
+     "title": "legacy odoo.define modules removed", "message": "Convert to an ES module (/** @odoo-module */)"},
+    {"id": "js-legacy-require", "version": 17, "lang": "js", "match": {"pattern": r"\brequire\(\s*['\"]web\."},
+     "title": "legacy odoo.define modules removed", "message": "Legacy require('web.*'); import from @web/... instead"},
+    {"id": "js-legacy-include", "version": 17, "lang": "js", "match": {"pattern": r"\.include\(\s*\{"},
+     "title": "legacy include() replaced by patch()", "message": "Use patch() from @web/core/utils/patch"},
+    {"id": "js-trigger-up", "version": 17, "lang": "js", "match": {"pattern": r"\btrigger_up\("},
+     "title": "legacy widget events removed", "message": "trigger_up belongs to legacy widgets; use services/env.bus"},
+    {"id": "js-patch-name", "version": 17, "lang": "js", "match": {"pattern": r"\bpatch\(\s*[\w.]+\s*,\s*['\"]"},
+     "title": "patch() no longer takes a name", "message": "Call patch(target, {...}) without the patch name"},
+]
+
+KNOWN_VERSIONS = sorted({r["version"] for r in RULES} | set(STEP_NOTES))
+
+
+def _list(value) -> List[str]:
+    return [value] if isinstance(value, str) else list(value or [])
+
+
+def rules_for(frm: int, to: int) -> List[Dict]:
+    """Rules for changes landing after ``frm`` up to and including ``to``."""
+    return [r for r in RULES if frm < r["version"] <= to]
+
+
+def _finding(rule: Dict, line: int, detail: str = "") -> Dict:
+    return {
+        "rule": rule["id"],
+        "line": line,
+        "message": f"[{rule['version']}.0] {rule['message']}" + (f" ({detail})" if detail else ""),
+    }
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+class RuleSet:
+    """Rules of one version range, compiled into per-language lookup tables."""
+
+    def __init__(self, frm: int, to: int):
+        self.frm, self.to = frm, to
+        self.rules = rules_for(frm, to)
+        self.key = f"{frm}-{to}:" + ",".join(r["id"] for r in self.rules)
+        # Python: lookup by the name each node kind carries
+        self.py: Dict[str, Dict[str, List[Dict]]] = {k: {} for k in ("decorator", "call", "keyword", "method", "class_attr")}
+        self.py_imports: List[Tuple[str, Dict]] = []
+        # XML: tag ("*" for any) → (attribute or None, value regex or None, rule)
+        self.xml: Dict[str, List[Tuple[Optional[str], Optional[re.Pattern], Dict]]] = {}
+        js = []
+        for r in self.rules:
+            m = r["match"]
+            if r["lang"] == "python":
+                for kind, table in self.py.items():
+                    for name in _list(m.get(kind)):
+                        table.setdefault(name, []).append(r)
+                self.py_imports.extend((p, r) for p in _list(m.get("import")))
+            elif r["lang"] == "xml":
+                value = re.compile(m["value"]) if m.get("value") else None
+                for attr in _list(m.get("attr")) or [None]:
+                    self.xml.setdefault(m.get("tag", "*"), []).append((attr, value, r))
+            else:
+                js.append(r)
+        self.js_rules = js
+        self.js = MultiPattern([(r["match"]["pattern"], 0) for r in js])
+        self.js_regexes = [re.compile(r["match"]["pattern"]) for r in js]
+
+    def check_python(self, tree: ast.AST) -> Tuple[List[Dict], List[Dict]]:
+        """Models (``_name``/``_inherit`` classes) and rule findings from one AST walk."""
+        models, findings = [], []
+        py = self.py
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and py["decorator"]:
+                for dec in node.decorator_list:
+                    name = _dotted(dec.func if isinstance(dec, ast.Call) else dec)
+                    for r in py["decorator"].get(name, ()):
+                        findings.append(_finding(r, dec.lineno, f"@{name}"))
+            elif isinstance(node, ast.ClassDef):
+                attrs: Dict[str, object] = {}
+                for stmt in node.body:
+                    if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                        for r in py["method"].get(stmt.name, ()):
+                            findings.append(_finding(r, stmt.lineno, f"{node.name}.{stmt.name}"))
+                    elif isinstance(stmt, ast.Assign):
+                        for t in stmt.targets:
+                            if isinstance(t, ast.Name):
+                                if t.id in {"_name", "_inherit"}:
+                                    attrs[t.id] = _literal(stmt.value)
+                                for r in py["class_attr"].get(t.id, ()):
+                                    findings.append(_finding(r, stmt.lineno, f"{node.name}.{t.id}"))
+                if attrs.get("_name") or attrs.get("_inherit"):
+                    models.append({
+                        "class": node.name, "name": attrs.get("_name"), "inherit": attrs.get("_inherit"),
+                        "line": node.lineno,
+                    })
+            elif isinstance(node, ast.Call):
+                func = node.func
+                name = func.attr if isinstance(func, ast.Attribute) else func.id if isinstance(func, ast.Name) else None
+                for r in py["call"].get(name, ()):
+                    if _call_matches(node, r["match"]):
+                        findings.append(_finding(r, node.lineno, f"{name}()"))
+                for kw in node.keywords:
+                    for r in py["keyword"].get(kw.arg, ()):
+                        findings.append(_finding(r, node.lineno, f"{kw.arg}="))
+            elif isinstance(node, (ast.Import, ast.ImportFrom)) and self.py_imports:
+                names = [node.module or ""] if isinstance(node, ast.ImportFrom) else [a.name for a in node.names]
+                for mod in names:
+                    for prefix, r in self.py_imports:
+                        if mod == prefix or mod.startswith(prefix + "."):
+                            findings.append(_finding(r, node.lineno, mod))
+        return models, findings
+
+    def check_xml(self, data: bytes) -> List[Dict]:
+        """Stream the document through expat; raises ``expat.ExpatError`` on malformed XML."""
+        findings = []
+        if not self.xml:
+            return findings
+        parser = expat.ParserCreate()
+        generic = self.xml.get("*", [])
+
+        def start(tag, attrs):
+            for attr, value, r in self.xml.get(tag, []) + generic:
+                if attr is None:
+                    findings.append(_finding(r, parser.CurrentLineNumber, f"<{tag}>"))
+                elif attr in attrs and (value is None or value.search(attrs[attr])):
+                    findings.append(_finding(r, parser.CurrentLineNumber, f"<{tag} {attr}=\"{attrs[attr][:60]}\">"))
+
+        parser.StartElementHandler = start
+        parser.Parse(data, True)
+        return findings
+
+    def check_js(self, text: str) -> List[Dict]:
+        findings = []
+        for i in self.js.search_all(text):
+            for match in self.js_regexes[i].finditer(text):
+                findings.append(_finding(self.js_rules[i], text.count("\n", 0, match.start()) + 1))
+        return findings
+
+
+# Predicates on a call's first argument (positional, else the first keyword)
+ARG_PREDICATES = {
+    # sudo(True)/sudo(False) is still valid after sudo(user) went away
+    "not_const_bool": lambda a: not (isinstance(a, ast.Constant) and isinstance(a.value, bool)),
+}
+
+
+def _call_matches(node: ast.Call, match: Dict) -> bool:
+    if len(node.args) + len(node.keywords) < match.get("min_args", 0):
+        return False
+    pred = match.get("first_arg")
+    if pred is None:
+        return True
+    first = node.args[0] if node.args else node.keywords[0].value if node.keywords else None
+    return first is not None and ARG_PREDICATES[pred](first)
+
+
+def _literal(node: ast.AST):
+    try:
+        return ast.literal_eval(node)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=8)
+def get_ruleset(frm: int, to: int) -> RuleSet:
+    """Compiled rules for a version range; compiled once per process."""
+    return RuleSet(frm, to)
@@ -0,0 +1,235 @@
+"""Single-pass module scanner with a per-file result cache.
+
+Every file is read once: its bytes are hashed and parsed once. Python files
+get model detection and all Python rules from one AST walk, XML files are
+streamed once for every XML rule, and JS assets are searched once for every
+JS rule (see ``rules``). Files run on a process pool when there are enough
+of them to pay for it; each worker compiles the rule set once. The walk
+submits paths (workers read the files) with a bounded number in flight, so
+memory does not grow with the tree and results stream out as they finish.
+
+Results are cached under ``cache_dir("scan")`` keyed by content hash, so a
+rescan only analyzes files whose content changed. A file whose mtime and size
+still match the cache is not even read. Changing the rule set (another
+``--from``/``--to`` range) drops the cached results.
+"""
+import ast
+import hashlib
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from xml.parsers import expat
+
+import orjson
+
+from ..cache import cache_dir
+from .rules import get_ruleset
+
+# Bump when analysis output changes so stale cached results are dropped
+SCANNER_VERSION = 3
+SKIP_DIRS = {"__pycache__", "node_modules", ".git", ".tox", ".venv", "venv"}
+LANGUAGES = {".py": "python", ".xml": "xml", ".js": "js"}
+# Below this many files to analyze, a process pool costs more than it saves
+MIN_PARALLEL_FILES = 32
+# Files submitted to the pool per worker before the walk waits for results
+IN_FLIGHT_PER_JOB = 4
+
+
+def iter_sources(root: Path) -> Iterator[Path]:
+    """Python, XML and JS files under ``root`` in one walk; skips caches, VCS dirs and vendored static/lib."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        skip = SKIP_DIRS | ({"lib"} if os.path.basename(dirpath) == "static" else set())
+        dirnames[:] = sorted(d for d in dirnames if d not in skip and not d.startswith("."))
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1] in LANGUAGES and not name.endswith(".min.js"):
+                yield Path(dirpath, name)
+
+
+def analyze_source(lang: str, data: bytes, frm: int, to: int) -> Dict:
+    """Models and findings (without file names) for one file's content."""
+    rules = get_ruleset(frm, to)
+    if lang == "xml":
+        try:
+            return {"models": [], "findings": rules.check_xml(data)}
+        except expat.ExpatError as e:
+            return {"models": [], "findings": [{"rule": "xml-syntax", "line": e.lineno, "message": f"Cannot parse: {e}"}]}
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        return {"models": [], "findings": [{"rule": f"{lang}-encoding", "line": 1, "message": f"Not UTF-8: {e}"}]}
+    if lang == "js":
+        return {"models": [], "findings": sorted(rules.check_js(text), key=lambda f: f["line"])}
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError) as e:
+        line = getattr(e, "lineno", None) or 1
+        return {"models": [], "findings": [{"rule": "python-syntax", "line": line, "message": f"Cannot parse: {e}"}]}
+
+    models, findings = rules.check_python(tree)
+    for m in models:
+        if m["name"] and m["inherit"]:
+            findings.append({
+                "rule": "model-name-inherit",
+                "line": m["line"],
+                "message": f"Class {m['class']} defines both _name ({m['name']}) and _inherit ({m['inherit']}). "
+                           "Ensure this is intended (new model vs extension).",
+            })
+    findings.sort(key=lambda f: f["line"])
+    return {"models": models, "findings": findings}
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def analyze_file(lang: str, path: str, frm: int, to: int) -> Tuple[str, Dict]:
+    """Content hash and :func:`analyze_source` result for a file, read in the worker."""
+    data = Path(path).read_bytes()
+    return _sha(data), analyze_source(lang, data, frm, to)
+
+
+class ScanCache:
+    """Per-root cache: path → (mtime_ns, size, sha) and sha → analysis result."""
+
+    def __init__(self, root: Path, rules_key: str, enabled: bool = True):
+        digest = hashlib.sha1(str(root.resolve()).encode()).hexdigest()[:16]
+        self.path = cache_dir("scan") / f"{digest}.json"
+        self.enabled = enabled
+        self.rules_key = rules_key
+        self.files: Dict[str, List] = {}
+        self.results: Dict[str, Dict] = {}
+        if enabled:
+            try:
+                data = orjson.loads(self.path.read_bytes())
+            except (OSError, orjson.JSONDecodeError):
+                data = {}
+            if data.get("version") == SCANNER_VERSION and data.get("rules") == rules_key:
+                self.files, self.results = data["files"], data["results"]
+
+    def by_stat(self, rel: str, st: os.stat_result) -> Optional[Tuple[str, Dict]]:
+        entry = self.files.get(rel)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size and entry[2] in self.results:
+            return entry[2], self.results[entry[2]]
+        return None
+
+    def save(self, seen: Dict[str, List]) -> None:
+        """Keep only entries for files seen in this scan; best effort."""
+        if not self.enabled:
+            return
+        used = {e[2] for e in seen.values()}
+        data = {
+            "version": SCANNER_VERSION,
+            "rules": self.rules_key,
+            "files": seen,
+            "results": {sha: r for sha, r in self.results.items() if sha in used},
+        }
+        tmp = self.path.with_suffix(".tmp")
+        try:
+            tmp.write_bytes(orjson.dumps(data))
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+
+def iter_scan(
+    root: Path,
+    frm: int,
+    to: int,
+    jobs: int = 1,
+    use_cache: bool = True,
+    dirs: Optional[List[Path]] = None,
+    counts: Optional[Dict[str, int]] = None,
+) -> Iterator[Tuple[str, Dict]]:
+    """Yield (posix path relative to ``root``, analysis result) as results become available.
+
+    Cached files come out during the walk. Others are analyzed inline, or,
+    with ``jobs`` > 1 and at least ``MIN_PARALLEL_FILES`` of them, on a pool
+    that is fed during the walk and yields in completion order. ``dirs``
+    limits the walk to these directories under ``root``, e.g. the modules of
+    an addons path; the cache stays keyed on ``root``. ``counts`` (if given)
+    is updated with cached/analyzed file counts. The cache is saved once the
+    generator is exhausted.
+    """
+    cache = ScanCache(root, get_ruleset(frm, to).key, use_cache)
+    counts = counts if counts is not None else {}
+    counts.setdefault("cached", 0)
+    counts.setdefault("analyzed", 0)
+    seen: Dict[str, List] = {}
+    # Uncached files held back until there are enough to start the pool
+    held: List[Tuple[str, Path, str, bytes]] = []
+    pool: Optional[ProcessPoolExecutor] = None
+    in_flight: Dict[Future, str] = {}
+    limit = max(1, jobs) * IN_FLIGHT_PER_JOB
+    try:
+        for path in (p for d in (dirs or [root]) for p in iter_sources(d)):
+            rel = path.relative_to(root).as_posix()
+            try:
+                st = path.stat()
+                hit = cache.by_stat(rel, st)
+                if hit is None:
+                    data = path.read_bytes()
+            except OSError:
+                continue
+            if hit is not None:
+                sha, result = hit
+            else:
+                sha = _sha(data)
+                result = cache.results.get(sha)
+            seen[rel] = [st.st_mtime_ns, st.st_size, sha]
+            if result is not None:
+                counts["cached"] += 1
+                yield rel, result
+            elif pool is not None:
+                in_flight[pool.submit(analyze_file, _lang(rel), str(path), frm, to)] = rel
+                yield from _completed(in_flight, limit, seen, cache, counts)
+            elif jobs > 1:
+                held.append((rel, path, sha, data))
+                if len(held) >= MIN_PARALLEL_FILES:
+                    pool = ProcessPoolExecutor(max_workers=jobs)
+                    for h_rel, h_path, _, _ in held:
+                        in_flight[pool.submit(analyze_file, _lang(h_rel), str(h_path), frm, to)] = h_rel
+                        yield from _completed(in_flight, limit, seen, cache, counts)
+                    held = []
+            else:
+                yield _analyzed(rel, sha, analyze_source(_lang(rel), data, frm, to), cache, counts)
+        # Too few files for the pool: analyze the held ones here
+        for rel, _, sha, data in held:
+            yield _analyzed(rel, sha, analyze_source(_lang(rel), data, frm, to), cache, counts)
+        yield from _completed(in_flight, 0, seen, cache, counts)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    cache.save(seen)
+
+
+def _lang(rel: str) -> str:
+    return LANGUAGES[os.path.splitext(rel)[1]]
+
+
+def _analyzed(rel: str, sha: str, result: Dict, cache: ScanCache, counts: Dict[str, int]) -> Tuple[str, Dict]:
+    cache.results[sha] = result
+    counts["analyzed"] += 1
+    return rel, result
+
+
+def _completed(in_flight: Dict[Future, str], limit: int, seen: Dict[str, List], cache: ScanCache,
+               counts: Dict[str, int]) -> Iterator[Tuple[str, Dict]]:
+    """Yield finished pool results; wait for more while over ``limit`` in flight (0 drains)."""
+    while in_flight:
+        if len(in_flight) > limit:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        else:
+            done = [f for f in in_flight if f.done()]
+            if not done:
+                return
+        for fut in done:
+            rel = in_flight.pop(fut)
+            try:
+                sha, result = fut.result()
+            except OSError:
+                seen.pop(rel, None)  # gone since the walk
+                continue
+            # The worker hashed what it read; the file may have changed since the walk
+            seen[rel][2] = sha
+            yield _analyzed(rel, sha, result, cache, counts)
@@ -2,24 +2,54 @@ import typer
 from rich.console import Console
 from pathlib import Path
 import os
+import re
 from textwrap import dedent
+from typing import List, Optional
+
+from .templates import stub_env_source, xlsx_large, xlsx_large_test
 
 app = typer.Typer()
 console = Console()
 
 
+FIELD_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def _field_names(value: str) -> List[str]:
+    return [f.strip() for f in value.split(",") if f.strip()]
+
+
 @app.command("scaffold")
 def scaffold(
     type: str = typer.Option(..., "--type", help="xlsx or pdf"),
     name: str = typer.Option(..., help="Report name"),
     module: str = typer.Option(..., help="Module name"),
     dest: Path = typer.Option(Path("."), help="Destination directory"),
+    profile: str = typer.Option("default", "--profile", help="default or large (XLSX: streaming writes, batched reads)"),
+    model: str = typer.Option("res.partner", "--model", help="Model the report is bound to and reads"),
+    fields: str = typer.Option("name,create_date", "--fields", help="Comma-separated fields to export (large profile)"),
+    group_by: Optional[str] = typer.Option(None, "--group-by", help="Field for a read_group summary sheet (large profile)"),
+    sum_fields: str = typer.Option("", "--sum-fields", help="Comma-separated numeric fields summed per group (large profile)"),
 ):
     """Generate a minimal report module skeleton for XLSX or PDF."""
     rtype = type.lower()
     if rtype not in {"xlsx", "pdf"}:
         console.print("[red]--type must be 'xlsx' or 'pdf'")
         raise typer.Exit(code=2)
+    profile = profile.lower()
+    if profile not in {"default", "large"}:
+        console.print("[red]--profile must be 'default' or 'large'")
+        raise typer.Exit(code=2)
+    if profile == "large" and rtype != "xlsx":
+        console.print("[red]--profile large is only available for --type xlsx")
+        raise typer.Exit(code=2)
+    field_list = _field_names(fields)
+    sum_list = _field_names(sum_fields)
+    names = field_list + sum_list + ([group_by] if group_by else [])
+    bad = [f for f in names if not FIELD_NAME.match(f)]
+    if profile == "large" and (bad or not field_list):
+        console.print(f"[red]Invalid field names: {', '.join(bad) or '(none given)'}")
+        raise typer.Exit(code=2)
 
     base = dest / module
     paths = {
@@ -44,8 +74,10 @@ def scaffold(
     # __init__ files
     if not paths["module_init"].exists():
         paths["module_init"].write_text("from . import report\n", encoding="utf-8")
-    if not paths["report_init"].exists():
-        paths["report_init"].write_text("\n", encoding="utf-8")
+    import_line = f"from . import {name}\n"
+    existing = paths["report_init"].read_text(encoding="utf-8") if paths["report_init"].exists() else ""
+    if import_line not in existing:
+        paths["report_init"].write_text(existing.strip() + ("\n" if existing.strip() else "") + import_line, encoding="utf-8")
 
     # Manifest
     dep = "report_xlsx" if rtype == "xlsx" else "base"
@@ -67,7 +99,13 @@ def scaffold(
     paths["manifest"].write_text(manifest, encoding="utf-8")
 
     # Report python
-    if rtype == "xlsx":
+    if profile == "large":
+        report_py = xlsx_large(module, name, model, field_list, group_by, sum_list)
+        tests = base / "tests"
+        tests.mkdir(parents=True, exist_ok=True)
+        (tests / "stub_env.py").write_text(stub_env_source(), encoding="utf-8")
+        (tests / f"test_{name}_offline.py").write_text(xlsx_large_test(name), encoding="utf-8")
+    elif rtype == "xlsx":
         report_py = dedent(f"""
         from odoo import models
 
@@ -88,7 +126,7 @@ def scaffold(
 
             @api.model
             def _get_report_values(self, docids, data=None):
-                return {{'doc_ids': docids, 'doc_model': 'res.partner', 'data': data or {{}}}}
+                return {{'doc_ids': docids, 'doc_model': '{model}', 'data': data or {{}}}}
         """)
     paths["report_py"].write_text(report_py, encoding="utf-8")
 
@@ -97,7 +135,7 @@ def scaffold(
         data_xml = dedent(f"""
         <odoo>
           <report id="{name}_xlsx"
-                  model="res.partner"
+                  model="{model}"
                   string="{name} XLSX"
                   report_type="xlsx"
                   name="{module}.{name}_xlsx"
@@ -114,7 +152,7 @@ def scaffold(
         data_xml = dedent(f"""
         <odoo>
           <report id="{name}_pdf"
-                  model="res.partner"
+                  model="{model}"
                   string="{name} PDF"
                   report_type="qweb-pdf"
                   name="{module}.{name}_pdf"
@@ -138,3 +176,64 @@ def scaffold(
     paths["views_xml"].write_text(template_xml.strip() + "\n", encoding="utf-8")
 
     console.print(f"[green]Scaffolded[/green] {rtype.upper()} report module at {base}")
+    if profile == "large":
+        console.print(f"Offline test: cd {base} && python -m unittest discover -s tests -p 'test_*_offline.py'")
+
+
+@app.command("bench")
+def bench(
+    path: Path = typer.Option(..., "--path", help="Module directory generated by `report scaffold`"),
+    report: Optional[str] = typer.Option(None, "--report", help="Report file name under report/ (needed if there are several)"),
+    rows: int = typer.Option(100_000, "--rows", min=1, help="Synthetic rows fed to the report"),
+    columns: Optional[int] = typer.Option(None, "--columns", min=1, help="Columns to export (default: the report's FIELDS)"),
+    width: int = typer.Option(24, "--width", min=1, help="Characters per text cell"),
+    seed: int = typer.Option(42, help="Generator seed; same parameters and seed give the same rows"),
+    repeat: int = typer.Option(1, min=1, help="Runs per mode; the fastest is kept"),
+    output: str = typer.Option("rich", help="Output format: rich|json"),
+):
+    """Render a scaffolded report offline on synthetic rows; compare default and constant_memory XLSX."""
+    from . import benchmark as benchmarks
+
+    if output not in {"rich", "json"}:
+        console.print("[red]--output must be 'rich' or 'json'")
+        raise typer.Exit(code=2)
+    files = benchmarks.report_files(path)
+    if report:
+        files = [f for f in files if f.stem == report.removesuffix(".py")]
+    if len(files) != 1:
+        found = ", ".join(f.stem for f in benchmarks.report_files(path)) or "none"
+        console.print(f"[red]Pick one report with --report (found under {path / 'report'}: {found})")
+        raise typer.Exit(code=1)
+    try:
+        info = benchmarks.inspect_report(path, files[0], columns)
+        results = benchmarks.run(info, rows, width, seed, repeat)
+    except (ValueError, RuntimeError, SyntaxError, ImportError) as e:
+        console.print(f"[red]{e}")
+        raise typer.Exit(code=1)
+
+    params = {"rows": rows, "columns": len(info["fields"]), "width": width, "seed": seed}
+    if output == "json":
+        console.print_json(data={"report": info, "params": params, "results": results})
+        return
+    from rich.table import Table
+    table = Table(title=f"{info['report']} ({info['kind'].upper()}, {rows:,} rows × {len(info['fields'])} columns, best of {repeat})")
+    table.add_column("Mode")
+    table.add_column("Rows/s", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Peak RSS MB", justify="right")
+    table.add_column("Render RSS MB", justify="right")
+    table.add_column("Output MB", justify="right")
+    for mode, r in results.items():
+        table.add_row(
+            mode, f"{r['rows_s']:,}", f"{r['seconds']:.3f}", f"{r['peak_rss_mb']:.1f}",
+            f"{r['render_rss_mb']:.1f}", f"{r['output_mb']:.2f}",
+        )
+    console.print(table)
+    if not any(r["rows_read"] for r in results.values()):
+        console.print("[yellow]The report read no records; scaffold with --profile large or fetch rows with search_read.")
+    elif {"default", "constant_memory"} <= results.keys():
+        d, c = results["default"], results["constant_memory"]
+        console.print(
+            f"constant_memory vs default: render memory {c['render_rss_mb']:.1f} vs {d['render_rss_mb']:.1f} MB, "
+            f"time {c['seconds']:.3f} vs {d['seconds']:.3f} s"
+        )
@@ -0,0 +1,243 @@
+"""Offline rendering benchmarks for scaffolded report modules.
+
+A report file from ``<module>/report/`` is loaded against the stub ``odoo``
+package and fed synthetic rows through a :class:`~.stubenv.StubEnv`. Rows are
+generated on access from their id (deterministic for a seed), so the data
+set itself costs almost no memory and peak RSS reflects the report and the
+writer. Each mode runs in a fresh interpreter, as in ``logs bench``:
+
+- XLSX reports render with XlsxWriter twice, with the report's workbook
+  options and ``constant_memory`` off (``default``) and on
+  (``constant_memory``).
+- PDF reports are QWeb templates, which need a server; the bench calls the
+  report's ``_get_report_values`` and renders the same batched rows as
+  reportlab tables (``reportlab``) to size the row volume.
+"""
+import importlib.util
+import io
+import multiprocessing
+import random
+import re
+import string
+import time
+import xml.etree.ElementTree as ET
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .stubenv import StubEnv, install_odoo_stub
+
+XLSX_MODES = ["default", "constant_memory"]
+PDF_MODES = ["reportlab"]
+DEFAULT_COLUMNS = 8
+PDF_BATCH = 1000
+_NUMERIC = re.compile(r"amount|price|qty|quantity|total|debit|credit|balance|subtotal|weight|volume")
+_EPOCH = datetime(2024, 1, 1)
+
+
+def report_files(module_dir: Path) -> List[Path]:
+    return sorted(p for p in (module_dir / "report").glob("*.py") if p.name != "__init__.py")
+
+
+def _load(path: Path):
+    install_odoo_stub()
+    spec = importlib.util.spec_from_file_location(f"_bench_report_{path.stem}", path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _report_class(mod):
+    for obj in vars(mod).values():
+        if isinstance(obj, type) and str(getattr(obj, "_name", None) or "").startswith("report."):
+            if hasattr(obj, "generate_xlsx_report") or hasattr(obj, "_get_report_values"):
+                return obj
+    return None
+
+
+def _bound_model(module_dir: Path, report_name: str) -> Optional[str]:
+    """Model of the report action named ``report_name`` in the module's data files."""
+    for xml in sorted(module_dir.glob("**/*.xml")):
+        try:
+            root = ET.parse(xml).getroot()
+        except (ET.ParseError, OSError):
+            continue
+        for el in root.iter("report"):
+            if el.get("name") == report_name and el.get("model"):
+                return el.get("model")
+        for rec in root.iter("record"):
+            if rec.get("model") != "ir.actions.report":
+                continue
+            vals = {f.get("name"): (f.text or "").strip() for f in rec.iter("field")}
+            if vals.get("report_name") == report_name and vals.get("model"):
+                return vals["model"]
+    return None
+
+
+def inspect_report(module_dir: Path, path: Path, columns: Optional[int] = None) -> Dict:
+    """What to feed the report: kind, model, fields and grouping; raises ``ValueError`` if it is not a report."""
+    mod = _load(path)
+    cls = _report_class(mod)
+    if cls is None:
+        raise ValueError(f"{path.name} defines no report class (_name 'report.*')")
+    kind = "xlsx" if hasattr(cls, "generate_xlsx_report") else "pdf"
+    model = getattr(mod, "MODEL", None) or _bound_model(module_dir, cls._name[len("report."):]) or "res.partner"
+    fields = list(getattr(mod, "FIELDS", None) or [])
+    if columns is not None or not fields:
+        n = columns if columns is not None else DEFAULT_COLUMNS
+        fields = (fields + [f"x_col_{i}" for i in range(len(fields), n)])[:n]
+    return {
+        "file": str(path), "class": cls.__name__, "report": cls._name, "kind": kind, "model": model,
+        "fields": fields, "group_by": getattr(mod, "GROUP_BY", None),
+        "sum_fields": list(getattr(mod, "SUM_FIELDS", None) or []),
+    }
+
+
+def _kind(field: str, info: Dict) -> str:
+    if field in info["sum_fields"] or _NUMERIC.search(field):
+        return "float"
+    if field == info["group_by"] or field.endswith("_id"):
+        return "m2o"
+    if field in ("create_date", "write_date") or field.endswith("_datetime"):
+        return "datetime"
+    if field.endswith("date"):
+        return "date"
+    if field.endswith("_count") or field == "sequence":
+        return "int"
+    return "text"
+
+
+class SyntheticRows(Sequence):
+    """Rows with ids 1..n built on access; the same id and seed always give the same row."""
+
+    def __init__(self, n: int, info: Dict, width: int, seed: int = 42):
+        self.ids = range(1, n + 1)
+        rng = random.Random(seed)
+        self.filler = "".join(rng.choice(string.ascii_letters + " ") for _ in range(1024 + width))
+        self.width = width
+        names = info["fields"] + info["sum_fields"] + ([info["group_by"]] if info["group_by"] else [])
+        self.kinds = {f: _kind(f, info) for f in dict.fromkeys(names)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        rid = self.ids[i]
+        row = {"id": rid}
+        for f, kind in self.kinds.items():
+            if kind == "float":
+                row[f] = round((rid * 7919 % 100000) / 100, 2)
+            elif kind == "m2o":
+                g = rid % 50 + 1
+                row[f] = (g, f"{f} {g}")
+            elif kind == "datetime":
+                row[f] = _EPOCH + timedelta(seconds=rid * 37)
+            elif kind == "date":
+                row[f] = date(2024, 1, 1) + timedelta(days=rid % 730)
+            elif kind == "int":
+                row[f] = rid % 1000
+            else:
+                # Unique per row, so XlsxWriter's shared string table cannot fold them
+                o = rid % 1024
+                row[f] = (f"{rid:x} " + self.filler[o:o + self.width])[:self.width]
+        return row
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _text(value) -> str:
+    if value is False or value is None:
+        return ""
+    if isinstance(value, tuple):
+        return str(value[1])
+    return str(value)
+
+
+def _render_xlsx(report, env: StubEnv, info: Dict, mode: str) -> bytes:
+    import xlsxwriter
+    options = dict(report.get_workbook_options()) if hasattr(report, "get_workbook_options") else {}
+    options["constant_memory"] = mode == "constant_memory"
+    buf = io.BytesIO()
+    workbook = xlsxwriter.Workbook(buf, options)
+    # No selected records and no domain: the report exports every synthetic row
+    report.generate_xlsx_report(workbook, {}, env[info["model"]].browse([]))
+    workbook.close()
+    return buf.getvalue()
+
+
+def _render_pdf(report, env: StubEnv, info: Dict) -> bytes:
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.platypus import LongTable, SimpleDocTemplate
+
+    report._get_report_values([], data={})
+    model = env[info["model"]]
+    story = []
+    last_id = 0
+    while True:
+        rows = model.search_read([("id", ">", last_id)], info["fields"], order="id", limit=PDF_BATCH)
+        if not rows:
+            break
+        story.append(LongTable([info["fields"]] + [[_text(r[f]) for f in info["fields"]] for r in rows], repeatRows=1))
+        last_id = rows[-1]["id"]
+    buf = io.BytesIO()
+    SimpleDocTemplate(buf, pagesize=landscape(A4)).build(story)
+    return buf.getvalue()
+
+
+def _child(info: Dict, mode: str, rows: int, width: int, seed: int, conn) -> None:
+    try:
+        mod = _load(Path(info["file"]))
+        if hasattr(mod, "FIELDS"):
+            mod.FIELDS = info["fields"]
+        env = StubEnv({info["model"]: SyntheticRows(rows, info, width, seed)})
+        report = getattr(mod, info["class"])(env)
+        before = _peak_rss_mb()
+        started = time.perf_counter()
+        data = _render_xlsx(report, env, info, mode) if info["kind"] == "xlsx" else _render_pdf(report, env, info)
+        seconds = time.perf_counter() - started
+        conn.send({
+            "seconds": seconds, "rows_read": env.rows_read, "output_bytes": len(data),
+            "peak_rss_mb": _peak_rss_mb(), "render_rss_mb": _peak_rss_mb() - before,
+        })
+    except Exception as e:
+        conn.send({"error": f"{type(e).__name__}: {e}"})
+    finally:
+        conn.close()
+
+
+def run_one(info: Dict, mode: str, rows: int, width: int, seed: int) -> Dict:
+    """Render once in a fresh interpreter (spawned, so RSS is not inherited)."""
+    ctx = multiprocessing.get_context("spawn")
+    recv, send = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_child, args=(info, mode, rows, width, seed, send))
+    proc.start()
+    send.close()
+    try:
+        result = recv.recv()
+    except EOFError:
+        raise RuntimeError(f"{mode} render crashed (exit code {proc.exitcode})")
+    finally:
+        proc.join()
+    if "error" in result:
+        raise RuntimeError(f"{mode} render failed: {result['error']}")
+    return result
+
+
+def run(info: Dict, rows: int, width: int, seed: int, repeat: int) -> Dict[str, Dict]:
+    """Best-of-``repeat`` results per mode, with rows/s over the rows the report read."""
+    out = {}
+    for mode in XLSX_MODES if info["kind"] == "xlsx" else PDF_MODES:
+        runs = [run_one(info, mode, rows, width, seed) for _ in range(max(1, repeat))]
+        best = min(runs, key=lambda r: r["seconds"])
+        best["peak_rss_mb"] = round(min(r["peak_rss_mb"] for r in runs), 1)
+        best["render_rss_mb"] = round(min(r["render_rss_mb"] for r in runs), 1)
+        best["rows_s"] = round(best["rows_read"] / best["seconds"]) if best["seconds"] else 0
+        best["output_mb"] = round(best.pop("output_bytes") / (1 << 20), 2)
+        best["seconds"] = round(best["seconds"], 3)
+        out[mode] = best
+    return out
@@ -0,0 +1,194 @@
+"""Stand-in for the parts of the Odoo ORM that report generators use, to run them without a server.
+
+``report scaffold`` copies this file into generated modules as
+``tests/stub_env.py``, so it must only depend on the standard library.
+
+- :func:`install_odoo_stub` registers a minimal ``odoo`` package (``models``
+  and ``api``) so report files load and their classes can be instantiated
+  with a stub env, even where a real Odoo is importable.
+- :class:`StubEnv` holds rows per model and serves ``search_read``,
+  ``read_group`` and ``fields_get`` for AND-only domains; ``id`` bounds
+  are resolved by bisection, so keyset batching stays cheap on large row
+  sets. Calls are recorded in ``env.calls`` for assertions and
+  ``env.rows_read`` counts the rows ``search_read`` returned.
+"""
+import operator
+import sys
+import types
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence
+
+_OPS = {
+    "=": operator.eq, "!=": operator.ne, ">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+    "in": lambda a, b: a in b, "not in": lambda a, b: a not in b,
+}
+
+
+def install_odoo_stub() -> None:
+    """Make ``from odoo import models, api`` resolve to the stub in this process."""
+    if getattr(sys.modules.get("odoo"), "__stub__", False):
+        return
+    odoo = types.ModuleType("odoo")
+    odoo.__stub__ = True
+    models = types.ModuleType("odoo.models")
+    api = types.ModuleType("odoo.api")
+
+    class AbstractModel:
+        _name = None
+        _inherit = None
+        _description = None
+
+        def __init__(self, env):
+            self.env = env
+
+    models.AbstractModel = models.Model = models.TransientModel = AbstractModel
+    api.model = api.model_create_multi = lambda f: f
+    odoo.models, odoo.api = models, api
+    sys.modules.update({"odoo": odoo, "odoo.models": models, "odoo.api": api})
+
+
+def _key(value):
+    # many2one values are (id, display_name)
+    return value[0] if isinstance(value, tuple) else value
+
+
+class StubRecordset:
+    def __init__(self, model: str, ids: List[int]):
+        self._name = model
+        self.ids = list(ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __bool__(self) -> bool:
+        return bool(self.ids)
+
+    def __iter__(self):
+        return iter(StubRecordset(self._name, [i]) for i in self.ids)
+
+
+class StubModel:
+    def __init__(self, env: "StubEnv", name: str):
+        self.env = env
+        self._name = name
+        self._rows = env.data.get(name, [])
+        self._ids = env.ids.get(name, [])
+
+    def with_context(self, *args, **kwargs) -> "StubModel":
+        return self
+
+    def sudo(self, *args) -> "StubModel":
+        return self
+
+    def browse(self, ids) -> StubRecordset:
+        return StubRecordset(self._name, [ids] if isinstance(ids, int) else ids)
+
+    def _window(self, domain: List) -> range:
+        """Index range of rows allowed by the domain's ``id`` bounds (rows are sorted by id)."""
+        lo, hi = 0, len(self._rows)
+        for leaf in domain:
+            if isinstance(leaf, (list, tuple)) and leaf[0] == "id":
+                _, op, v = leaf
+                if op == ">":
+                    lo = max(lo, bisect_right(self._ids, v))
+                elif op == ">=":
+                    lo = max(lo, bisect_left(self._ids, v))
+                elif op == "<":
+                    hi = min(hi, bisect_left(self._ids, v))
+                elif op == "<=":
+                    hi = min(hi, bisect_right(self._ids, v))
+        return range(lo, hi)
+
+    def _matches(self, row: Dict, domain: List) -> bool:
+        for leaf in domain:
+            if isinstance(leaf, str):
+                if leaf != "&":
+                    raise NotImplementedError(f"stub domains are AND-only, got {leaf!r}")
+                continue
+            field, op, value = leaf
+            if op not in _OPS:
+                raise NotImplementedError(f"stub domain operator {op!r}")
+            if not _OPS[op](_key(row.get(field, False)), value):
+                return False
+        return True
+
+    def _iter(self, domain: Optional[List], order: Optional[str] = None) -> Iterator[Dict]:
+        domain = list(domain or [])
+        if order and order.split()[0] != "id":
+            raise NotImplementedError("stub search only orders by id")
+        idx = self._window(domain)
+        for i in (reversed(idx) if order and order.lower().endswith("desc") else idx):
+            row = self._rows[i]
+            if self._matches(row, domain):
+                yield row
+
+    def _search(self, domain: Optional[List], order: Optional[str], offset: int = 0, limit: Optional[int] = None):
+        return list(islice(self._iter(domain, order), offset, offset + limit if limit else None))
+
+    def fields_get(self, allfields=None, attributes=None) -> Dict[str, Dict]:
+        names = allfields or (sorted(self._rows[0]) if len(self._rows) else [])
+        return {f: {"string": f.replace("_", " ").title()} for f in names}
+
+    def search_read(self, domain=None, fields=None, offset=0, limit=None, order=None) -> List[Dict]:
+        self.env.calls.append({"method": "search_read", "model": self._name, "domain": list(domain or []),
+                               "fields": fields, "offset": offset, "limit": limit, "order": order})
+        rows = self._search(domain, order, offset, limit)
+        self.env.rows_read += len(rows)
+        if not fields:
+            return [dict(r) for r in rows]
+        return [{"id": r["id"], **{f: r.get(f, False) for f in fields}} for r in rows]
+
+    def search_count(self, domain=None) -> int:
+        return sum(1 for _ in self._iter(domain))
+
+    def read_group(self, domain, fields, groupby, offset=0, limit=None, orderby=False, lazy=True) -> List[Dict]:
+        self.env.calls.append({"method": "read_group", "model": self._name, "domain": list(domain or []),
+                               "fields": fields, "groupby": groupby, "orderby": orderby, "lazy": lazy})
+        group_field = groupby[0] if isinstance(groupby, (list, tuple)) else groupby
+        sums = [f.split(":")[0] for f in fields if f.endswith(":sum")]
+        groups: Dict = {}
+        for row in self._iter(domain):
+            value = row.get(group_field, False)
+            g = groups.get(_key(value))
+            if g is None:
+                g = groups[_key(value)] = {group_field: value, "__count": 0, **{f: 0.0 for f in sums}}
+            g["__count"] += 1
+            for f in sums:
+                g[f] += row.get(f) or 0.0
+        out = sorted(groups.values(), key=lambda g: str(_key(g[group_field])))
+        if not lazy:
+            return out[offset:offset + limit if limit else None]
+        for g in out:
+            g[f"{group_field}_count"] = g.pop("__count")
+        return out[offset:offset + limit if limit else None]
+
+
+class StubEnv:
+    """Rows per model name, kept sorted by ``id``.
+
+    A list of dicts is sorted here. Any other sequence is taken as already in
+    id order and must expose its ids as ``.ids`` (e.g. a ``range``), so rows
+    can be generated on access instead of held in memory.
+    """
+
+    def __init__(self, data: Dict[str, Sequence[Dict]], context: Optional[Dict] = None):
+        self.data: Dict[str, Sequence[Dict]] = {}
+        self.ids: Dict[str, Sequence[int]] = {}
+        for model, rows in data.items():
+            if isinstance(rows, list):
+                rows = sorted(rows, key=lambda r: r["id"])
+                self.ids[model] = [r["id"] for r in rows]
+            else:
+                self.ids[model] = rows.ids
+            self.data[model] = rows
+        self.context = dict(context or {})
+        self.calls: List[Dict] = []
+        self.invalidations = 0
+        self.rows_read = 0
+
+    def __getitem__(self, model: str) -> StubModel:
+        return StubModel(self, model)
+
+    def invalidate_all(self) -> None:
+        self.invalidations += 1
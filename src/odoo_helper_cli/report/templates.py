@@ -0,0 +1,238 @@
+"""Source templates for the ``--profile large`` XLSX scaffold.
+
+The generated report streams: XlsxWriter runs in ``constant_memory`` mode
+(each row is flushed to a temp file once the next one starts, so rows are
+written strictly top to bottom), records come in id-ordered keyset batches
+from ``search_read`` with an explicit field list, the record cache is
+dropped after each batch, totals come from one ``read_group``, and cell
+formats are created once per workbook. The generated offline test runs the
+report against ``tests/stub_env.py``, a copy of :mod:`.stubenv`.
+"""
+from pathlib import Path
+from string import Template
+from typing import List, Optional
+
+from . import stubenv
+
+XLSX_LARGE = Template('''\
+import datetime
+
+from odoo import models
+
+MODEL = '$model'
+# Explicit list: search_read without one reads every stored field
+FIELDS = $fields
+# Records per search_read; each batch is written, then evicted from the ORM cache
+BATCH_SIZE = 5000
+# Summary sheet from one read_group (None skips it)
+GROUP_BY = $group_by
+SUM_FIELDS = $sum_fields
+
+
+class $cls(models.AbstractModel):
+    _name = 'report.$module.${name}_xlsx'
+    _inherit = 'report.report_xlsx.abstract'
+    _description = '$name XLSX (large)'
+
+    def get_workbook_options(self):
+        # Rows are flushed to disk as soon as the next row starts, so memory stays
+        # flat; rows must be written in order and strings are stored inline.
+        return {'constant_memory': True}
+
+    def _formats(self, workbook):
+        """Every format once per workbook; XlsxWriter keeps each add_format() alive until close."""
+        return {
+            'header': workbook.add_format({'bold': True, 'bg_color': '#D9D9D9', 'border': 1}),
+            'date': workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+            'datetime': workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm:ss'}),
+            'float': workbook.add_format({'num_format': '#,##0.00'}),
+        }
+
+    def _domain(self, data, objects):
+        if objects:
+            return [('id', 'in', objects.ids)]
+        return list((data or {}).get('domain') or [])
+
+    def _batches(self, domain):
+        """search_read in id order, resuming after the last id (no OFFSET rescans)."""
+        Model = self.env[MODEL]
+        last_id = 0
+        while True:
+            rows = Model.search_read(domain + [('id', '>', last_id)], FIELDS, order='id', limit=BATCH_SIZE)
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
+            self.env.invalidate_all()
+
+    def _write_cell(self, sheet, row, col, value, formats):
+        if value is False or value is None:
+            return
+        if isinstance(value, tuple):  # many2one: (id, display_name)
+            value = value[1]
+        elif isinstance(value, list):  # x2many: ids
+            value = ', '.join(map(str, value))
+        if isinstance(value, bool):
+            sheet.write_boolean(row, col, value)
+        elif isinstance(value, int):
+            sheet.write_number(row, col, value)
+        elif isinstance(value, float):
+            sheet.write_number(row, col, value, formats['float'])
+        elif isinstance(value, datetime.datetime):
+            sheet.write_datetime(row, col, value, formats['datetime'])
+        elif isinstance(value, datetime.date):
+            sheet.write_datetime(row, col, value, formats['date'])
+        else:
+            sheet.write_string(row, col, str(value))
+
+    def generate_xlsx_report(self, workbook, data, objects):
+        formats = self._formats(workbook)
+        domain = self._domain(data, objects)
+        labels = self.env[MODEL].fields_get(FIELDS + SUM_FIELDS + ([GROUP_BY] if GROUP_BY else []), ['string'])
+        sheet = workbook.add_worksheet('$sheet')
+        # Column layout must be set before the first row is flushed
+        sheet.set_column(0, len(FIELDS) - 1, 18)
+        sheet.freeze_panes(1, 0)
+        sheet.write_row(0, 0, [labels[f]['string'] for f in FIELDS], formats['header'])
+        row = 1
+        for batch in self._batches(domain):
+            for rec in batch:
+                for col, field in enumerate(FIELDS):
+                    self._write_cell(sheet, row, col, rec[field], formats)
+                row += 1
+        if GROUP_BY:
+            self._write_summary(workbook, domain, labels, formats)
+
+    def _write_summary(self, workbook, domain, labels, formats):
+        groups = self.env[MODEL].read_group(
+            domain, ['%s:sum' % f for f in SUM_FIELDS], [GROUP_BY], orderby=GROUP_BY, lazy=False,
+        )
+        sheet = workbook.add_worksheet('Summary')
+        sheet.set_column(0, len(SUM_FIELDS) + 1, 18)
+        heads = [labels[GROUP_BY]['string'], 'Count'] + [labels[f]['string'] for f in SUM_FIELDS]
+        sheet.write_row(0, 0, heads, formats['header'])
+        for row, group in enumerate(groups, 1):
+            self._write_cell(sheet, row, 0, group[GROUP_BY] or 'Undefined', formats)
+            sheet.write_number(row, 1, group['__count'])
+            for col, field in enumerate(SUM_FIELDS, 2):
+                self._write_cell(sheet, row, col, float(group[field] or 0.0), formats)
+''')
+
+XLSX_LARGE_TEST = Template('''\
+"""Offline test for the $name report: no Odoo server, a stub env from stub_env.py.
+
+    python -m unittest discover -s tests -p 'test_*_offline.py'
+
+Not imported by tests/__init__.py, so Odoo's own test runner skips it.
+"""
+import datetime
+import importlib.util
+import io
+import os
+import sys
+import unittest
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from stub_env import StubEnv, install_odoo_stub  # noqa: E402
+
+install_odoo_stub()
+
+import xlsxwriter  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location('${name}_report', os.path.join(HERE, '..', 'report', '$name.py'))
+report = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(report)
+
+ROWS = report.BATCH_SIZE * 2 + 17
+
+
+def make_rows(n):
+    day = datetime.date(2024, 1, 1)
+    fields = report.FIELDS + report.SUM_FIELDS + ([report.GROUP_BY] if report.GROUP_BY else [])
+    rows = []
+    for i in range(1, n + 1):
+        rec = {'id': i}
+        for f in fields:
+            if f in report.SUM_FIELDS:
+                rec[f] = float(i % 100)
+            elif f == report.GROUP_BY or f.endswith('_id'):
+                rec[f] = (i % 7 + 1, 'Group %d' % (i % 7 + 1))
+            elif f.endswith('date'):
+                rec[f] = day + datetime.timedelta(days=i % 365)
+            else:
+                rec[f] = '%s %d' % (f, i)
+        rows.append(rec)
+    return rows
+
+
+class Test${cls}Offline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.env = StubEnv({report.MODEL: make_rows(ROWS)})
+        cls.report = report.$cls(cls.env)
+        cls.buf = io.BytesIO()
+        cls.workbook = xlsxwriter.Workbook(cls.buf, cls.report.get_workbook_options())
+        cls.report.generate_xlsx_report(cls.workbook, {}, cls.env[report.MODEL].browse([]))
+        cls.workbook.close()
+
+    def sheet_xml(self, n):
+        with zipfile.ZipFile(io.BytesIO(self.buf.getvalue())) as zf:
+            return zf.read('xl/worksheets/sheet%d.xml' % n).decode('utf-8')
+
+    def test_streams_with_constant_memory(self):
+        self.assertTrue(self.report.get_workbook_options().get('constant_memory'))
+
+    def test_every_row_written_in_order(self):
+        # constant_memory silently drops cells written above an already flushed row
+        self.assertEqual(self.sheet_xml(1).count('<row '), ROWS + 1)
+
+    def test_fetches_id_ordered_batches_with_explicit_fields(self):
+        calls = [c for c in self.env.calls if c['method'] == 'search_read']
+        self.assertEqual(len(calls), ROWS // report.BATCH_SIZE + 2)
+        bounds = []
+        for c in calls:
+            self.assertEqual(c['fields'], report.FIELDS)
+            self.assertEqual(c['order'], 'id')
+            self.assertEqual(c['limit'], report.BATCH_SIZE)
+            self.assertEqual(c['offset'], 0)
+            bounds.append(c['domain'][-1][2])
+        self.assertEqual(bounds, sorted(bounds))
+        self.assertEqual(self.env.invalidations, len(calls) - 1)
+
+    def test_formats_created_once(self):
+        self.assertLess(len(self.workbook.formats), 10)
+
+    def test_summary_from_read_group(self):
+        groups = [c for c in self.env.calls if c['method'] == 'read_group']
+        if not report.GROUP_BY:
+            self.assertEqual(groups, [])
+            return
+        self.assertEqual(len(groups), 1)
+        self.assertIn('<row ', self.sheet_xml(2))
+
+
+if __name__ == '__main__':
+    unittest.main()
+''')
+
+
+def class_name(name: str) -> str:
+    return name.title().replace("_", "")
+
+
+def xlsx_large(module: str, name: str, model: str, fields: List[str], group_by: Optional[str], sum_fields: List[str]) -> str:
+    return XLSX_LARGE.substitute(
+        module=module, name=name, sheet=name[:31], cls=f"{class_name(name)}Xlsx", model=model,
+        fields=repr(fields), group_by=repr(group_by), sum_fields=repr(sum_fields),
+    )
+
+
+def xlsx_large_test(name: str) -> str:
+    return XLSX_LARGE_TEST.substitute(name=name, cls=f"{class_name(name)}Xlsx")
+
+
+def stub_env_source() -> str:
+    return Path(stubenv.__file__).read_text(encoding="utf-8")
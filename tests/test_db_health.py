@@ -0,0 +1,130 @@
+import os
+import statistics
+import time
+
+import pytest
+
+from odoo_helper_cli.db import connection as db_connection
+from odoo_helper_cli.db.health import HEALTH_SQL, fetch_health, health_row
+
+DSN_ENV = "ODOO_HELPER_TEST_DSN"
+ROW = ("PostgreSQL 16.2", 3, 7, 11, 2, True, [{"pid": 42, "duration": "00:05:00", "query": "SELECT 1"}])
+
+
+class _Cursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append((sql, params))
+
+    def fetchone(self):
+        return ROW
+
+
+class _Conn:
+    def __init__(self):
+        self.executed = []
+
+    def cursor(self):
+        return _Cursor(self)
+
+
+def test_health_row_shape():
+    row = health_row(ROW, 0.0123456)
+    assert row == {
+        "version": "PostgreSQL 16.2",
+        "active": 3,
+        "idle": 7,
+        "total": 11,
+        "waiting_locks": 2,
+        "has_ir_model_data": True,
+        "long_running": [{"pid": 42, "duration": "00:05:00", "query": "SELECT 1"}],
+        "elapsed_ms": 12.35,
+    }
+
+
+def test_health_row_rejects_short_rows():
+    with pytest.raises(ValueError):
+        health_row(ROW[:-1], 0.0)
+
+
+def test_fetch_health_is_one_statement():
+    conn = _Conn()
+    out = fetch_health(conn, "5 minutes")
+    assert conn.executed == [(HEALTH_SQL, {"threshold": "5 minutes"})]
+    assert out["waiting_locks"] == 2 and out["elapsed_ms"] >= 0
+
+
+# The probes as separate statements, as before they were folded into HEALTH_SQL
+SEPARATE_PROBES = [
+    "SELECT version()",
+    "SELECT count(*) FILTER (WHERE state = 'active'), count(*) FILTER (WHERE state = 'idle'), count(*) "
+    "FROM pg_stat_activity WHERE pid <> pg_backend_pid()",
+    "SELECT count(*) FROM pg_locks WHERE NOT granted",
+    "SELECT to_regclass('public.ir_model_data') IS NOT NULL",
+    "SELECT pid, now() - query_start, left(query, 140) FROM pg_stat_activity "
+    "WHERE state = 'active' AND now() - query_start > '5 minutes'::interval ORDER BY 2 DESC LIMIT 10",
+]
+
+
+@pytest.fixture
+def dsn():
+    value = os.environ.get(DSN_ENV)
+    if not value:
+        pytest.skip(f"set {DSN_ENV} to run against a live Postgres")
+    pytest.importorskip("psycopg")
+    yield value
+    db_connection.discard(value)
+
+
+def test_live_connection_is_reused(dsn):
+    with db_connection.connection(dsn) as first:
+        pid = first.info.backend_pid
+        fetch_health(first, "5 minutes")
+    with db_connection.connection(dsn) as second:
+        fetch_health(second, "5 minutes")
+        assert second is first
+        assert second.info.backend_pid == pid
+
+
+def test_live_health_is_one_round_trip(dsn):
+    with db_connection.connection(dsn) as conn:
+        import psycopg
+
+        executed = []
+
+        class CountingCursor(psycopg.Cursor):
+            def execute(self, query, params=None, **kwargs):
+                executed.append(query)
+                return super().execute(query, params, **kwargs)
+
+        factory, conn.cursor_factory = conn.cursor_factory, CountingCursor
+        try:
+            fetch_health(conn, "5 minutes")
+        finally:
+            conn.cursor_factory = factory
+        assert len(executed) == 1
+
+        def separate():
+            with conn.cursor() as cur:
+                for sql in SEPARATE_PROBES:
+                    cur.execute(sql)
+                    cur.fetchall()
+
+        def timed(fn, n=25):
+            runs = []
+            for _ in range(n):
+                started = time.perf_counter()
+                fn()
+                runs.append(time.perf_counter() - started)
+            return statistics.median(runs)
+
+        combined = timed(lambda: fetch_health(conn, "5 minutes"))
+        assert combined < timed(separate)
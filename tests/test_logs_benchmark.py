@@ -0,0 +1,62 @@
+import pytest
+from typer.testing import CliRunner
+
+from odoo_helper_cli.logs import app
+from odoo_helper_cli.logs import benchmark
+from odoo_helper_cli.logs.hints import BUILTIN_RULES, HintEngine
+from odoo_helper_cli.logs.parser import iter_blocks
+from odoo_helper_cli.logs.reader import iter_lines
+
+RESULTS = {"parse": {"seconds": 1.0, "mb_s": 50.0, "peak_rss_mb": 30.0}}
+
+
+def test_baseline_round_trip_creates_parent_dirs(tmp_path):
+    path = tmp_path / "new" / "dir" / "baseline.json"
+    benchmark.save_baseline(path, {"size_mb": 1.0}, RESULTS)
+    assert benchmark.load_baseline(path) == {"version": benchmark.BASELINE_VERSION, "params": {"size_mb": 1.0},
+                                             "results": RESULTS}
+
+
+def test_missing_or_outdated_baseline_is_none(tmp_path):
+    assert benchmark.load_baseline(tmp_path / "missing.json") is None
+    old = tmp_path / "old.json"
+    old.write_text('{"version": 0, "results": {}}')
+    assert benchmark.load_baseline(old) is None
+
+
+@pytest.mark.parametrize("body, message", [
+    ("[1, 2]", "not a JSON object"),
+    ('"text"', "not a JSON object"),
+    ("{", "not valid JSON"),
+    (f'{{"version": {benchmark.BASELINE_VERSION}, "results": []}}', "no params/results"),
+])
+def test_malformed_baseline_is_rejected(tmp_path, body, message):
+    path = tmp_path / "baseline.json"
+    path.write_text(body)
+    with pytest.raises(ValueError, match=message):
+        benchmark.load_baseline(path)
+
+
+def test_bench_reports_a_malformed_baseline_before_running(tmp_path, monkeypatch):
+    path = tmp_path / "baseline.json"
+    path.write_text("[]")
+    monkeypatch.setattr(benchmark, "run", lambda *a: pytest.fail("ran with a broken baseline"))
+    result = CliRunner().invoke(app, ["bench", "--baseline", str(path)])
+    assert result.exit_code == 1
+    assert "not a JSON object" in result.output
+
+
+def test_synthetic_rules_exercise_the_regex_fallback(tmp_path):
+    log = tmp_path / "odoo.log"
+    benchmark.generate_log(log, size_mb=1, traceback_ratio=0.2)
+    rules = benchmark.synthetic_rules(40)
+    engine = HintEngine(rules)
+    texts = [f"{b['exception']} {b['message']}\n{b['snippet']}" for b in iter_blocks(iter_lines(log))]
+    matched, candidates = set(), set()
+    for t in texts:
+        matched.update(engine.matcher.search_all(t))
+        candidates.update(engine.matcher.candidates(t))
+    synthetic = range(len(BUILTIN_RULES), len(rules))
+    # every 10th rule matches; every 10th + 5 gets past the prefilter and fails its regex
+    assert sorted(matched.intersection(synthetic)) == [len(BUILTIN_RULES) + i for i in (0, 10, 20, 30)]
+    assert sorted((candidates - matched).intersection(synthetic)) == [len(BUILTIN_RULES) + i for i in (5, 15, 25, 35)]
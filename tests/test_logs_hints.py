@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from odoo_helper_cli.logs import hints
+
+TOML_PACK = '''
+[[rules]]
+id = "mail-template"
+pattern = 'mail\\.template.*render'
+hint = "Mail template rendering failed."
+
+[[rules]]
+pattern = "StrictCase"
+hint = "Case matters."
+ignore_case = false
+'''
+
+YAML_PACK = '''
+rules:
+  - id: stock-quant
+    pattern: 'stock\\.quant.*negative'
+    hint: Negative quant.
+'''
+
+
+@pytest.fixture
+def pack(tmp_path):
+    path = tmp_path / "team.toml"
+    path.write_text(TOML_PACK, encoding="utf-8")
+    return path
+
+
+def test_toml_pack_is_loaded(pack):
+    rules = hints._parse_pack(pack)
+    assert [r["id"] for r in rules] == ["mail-template", "team-2"]
+    assert [r["ignore_case"] for r in rules] == [True, False]
+
+
+def test_yaml_pack_is_loaded(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "stock.yaml"
+    path.write_text(YAML_PACK, encoding="utf-8")
+    engine = hints.get_engine([path], builtin=False)
+    assert engine.hints("STOCK.QUANT went negative") == ["Negative quant."]
+
+
+def test_engine_matches_pack_and_builtin_rules(pack):
+    engine = hints.get_engine([pack])
+    assert len(engine.rules) == len(hints.BUILTIN_RULES) + 2
+    found = engine.hints("MAIL.TEMPLATE failed to render\nUniqueViolation: duplicate key")
+    assert found[0].startswith("Unique constraint violation")
+    assert "Mail template rendering failed." in found
+    assert "Case matters." not in engine.hints("strictcase")
+    assert "Case matters." in engine.hints("StrictCase")
+
+
+@pytest.mark.parametrize("body, message", [
+    ('rules = "nope"', "expected a list of rules"),
+    ('[[rules]]\nid = "x"\nhint = "no pattern"', "needs 'pattern' and 'hint'"),
+    ('[[rules]]\nid = "bad"\npattern = "("\nhint = "h"', "rule bad: invalid pattern"),
+])
+def test_invalid_pack_is_rejected(tmp_path, body, message):
+    path = tmp_path / "bad.toml"
+    path.write_text(body, encoding="utf-8")
+    with pytest.raises(ValueError, match=message):
+        hints._parse_pack(path)
+
+
+def test_engine_is_reused_until_the_pack_changes(pack):
+    first = hints.get_engine([pack])
+    assert hints.get_engine([pack]) is first
+    pack.write_text(TOML_PACK.replace("Case matters.", "Case still matters."), encoding="utf-8")
+    st = pack.stat()
+    os.utime(pack, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    second = hints.get_engine([pack])
+    assert second is not first
+    assert "Case still matters." in second.hints("StrictCase")
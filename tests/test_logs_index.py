@@ -0,0 +1,64 @@
+from odoo_helper_cli.logs import index
+from odoo_helper_cli.logs.benchmark import generate_log
+
+
+def _counting_next_header(monkeypatch):
+    calls = []
+    real = index.next_header
+
+    def counted(fh, offset):
+        calls.append(offset)
+        return real(fh, offset)
+
+    monkeypatch.setattr(index, "next_header", counted)
+    return calls
+
+
+def test_unchanged_log_keeps_its_index(tmp_path, monkeypatch):
+    log = tmp_path / "odoo.log"
+    generate_log(log, size_mb=5)
+    idx = index.ensure_index(log)
+    assert len(idx["entries"]) > 1
+    with open(log, "rb") as fh:
+        assert index._still_valid(idx, fh, log.stat())
+
+    calls = _counting_next_header(monkeypatch)
+    assert index.ensure_index(log) == idx
+    assert calls == []
+
+
+def test_grown_log_only_samples_the_tail(tmp_path, monkeypatch):
+    log = tmp_path / "odoo.log"
+    generate_log(log, size_mb=5)
+    before = index.ensure_index(log)
+    old_size = log.stat().st_size
+
+    tail = tmp_path / "tail.log"
+    generate_log(tail, size_mb=3, seed=7)
+    with open(log, "ab") as fh:
+        fh.write(tail.read_bytes())
+
+    calls = _counting_next_header(monkeypatch)
+    after = index.ensure_index(log)
+    assert calls and min(calls) >= before["next"] >= old_size - index.INDEX_STEP
+    assert after["entries"][:len(before["entries"])] == before["entries"]
+    assert len(after["entries"]) > len(before["entries"])
+    assert after["size"] == log.stat().st_size
+
+
+def test_rewritten_log_rebuilds_the_index(tmp_path):
+    log = tmp_path / "odoo.log"
+    generate_log(log, size_mb=3)
+    before = index.ensure_index(log)
+    # copytruncate then regrowth past the old size, with different timestamps
+    data = log.read_bytes().replace(b"2025-", b"2026-")
+    log.write_bytes(data + data[:1024])
+    after = index.ensure_index(log)
+    assert after["entries"][0][0] > before["entries"][0][0]
+
+
+def test_index_is_not_written_next_to_the_log(tmp_path):
+    log = tmp_path / "odoo.log"
+    generate_log(log, size_mb=2)
+    index.ensure_index(log)
+    assert [p.name for p in tmp_path.iterdir()] == ["odoo.log"]
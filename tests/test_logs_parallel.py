@@ -0,0 +1,115 @@
+import gzip
+from itertools import chain
+
+import pytest
+
+from odoo_helper_cli.logs import parallel
+from odoo_helper_cli.logs.benchmark import generate_log
+from odoo_helper_cli.logs.index import ensure_index, seek_range
+from odoo_helper_cli.logs.parser import GroupTable, block_record, in_window, iter_blocks, merge_by_time, parse_user_ts
+from odoo_helper_cli.logs.reader import is_gzip, iter_lines, rotated_files
+
+WINDOW = (parse_user_ts("2025-01-01 00:10:00"), parse_user_ts("2025-01-01 00:40:00"))
+
+
+@pytest.fixture(scope="module")
+def log(tmp_path_factory):
+    path = tmp_path_factory.mktemp("logs") / "odoo.log"
+    generate_log(path, size_mb=6, traceback_ratio=0.1)
+    return path
+
+
+@pytest.fixture(scope="module")
+def rotated(tmp_path_factory, log):
+    """The same records split into odoo.log.2.gz, odoo.log.1 and odoo.log at header boundaries."""
+    d = tmp_path_factory.mktemp("rotated")
+    data = log.read_bytes()
+    cuts = [data.index(b"\n2025-", len(data) * k // 3) + 1 for k in (1, 2)]
+    with gzip.open(d / "odoo.log.2.gz", "wb") as fh:
+        fh.write(data[:cuts[0]])
+    (d / "odoo.log.1").write_bytes(data[cuts[0]:cuts[1]])
+    (d / "odoo.log").write_bytes(data[cuts[1]:])
+    return rotated_files(d / "odoo.log")
+
+
+def _ranges(files, since, until):
+    if since is None and until is None:
+        return {}
+    return {f: seek_range(ensure_index(f), since, until) for f in files if not is_gzip(f)}
+
+
+def _serial(files, since, until, table, ranges):
+    blocks = chain.from_iterable(iter_blocks(iter_lines(f, *ranges.get(f, (0, None)))) for f in files)
+    if since is not None or until is not None:
+        blocks = (b for b in blocks if in_window(b["ts"], since, until))
+    if table is None:
+        return [block_record(b) for b in blocks]
+    for b in blocks:
+        table.add(b)
+    return table.results()
+
+
+def _table(group, fingerprints=True):
+    return GroupTable(fingerprints=fingerprints) if group else None
+
+
+@pytest.mark.parametrize("group", [True, False], ids=["grouped", "no-group"])
+@pytest.mark.parametrize("window", [(None, None), WINDOW], ids=["all", "window"])
+def test_parallel_matches_serial(log, group, window):
+    since, until = window
+    ranges = _ranges([log], since, until)
+    serial = _serial([log], since, until, _table(group), ranges)
+    par = parallel.analyze_parallel([log], 4, since, until, _table(group), ranges)
+    assert len(parallel.plan_chunks([log], 4, ranges)) > 1
+    assert serial and par == serial
+
+
+def test_parallel_matches_serial_exact_grouping(log):
+    serial = _serial([log], None, None, _table(True, fingerprints=False), {})
+    assert parallel.analyze_parallel([log], 3, None, None, _table(True, fingerprints=False)) == serial
+
+
+@pytest.mark.parametrize("group", [True, False], ids=["grouped", "no-group"])
+@pytest.mark.parametrize("window", [(None, None), WINDOW], ids=["all", "window"])
+def test_parallel_matches_serial_on_rotated_gzip_set(log, rotated, group, window):
+    since, until = window
+    assert [p.name for p in rotated] == ["odoo.log.2.gz", "odoo.log.1", "odoo.log"]
+    ranges = _ranges(rotated, since, until)
+    serial = _serial(rotated, since, until, _table(group), ranges)
+    par = parallel.analyze_parallel(rotated, 4, since, until, _table(group), ranges)
+    assert par == serial
+    # Splitting into rotated files loses nothing against the single log
+    assert serial == _serial([log], since, until, _table(group), _ranges([log], since, until))
+
+
+@pytest.fixture(scope="module")
+def other_node(tmp_path_factory):
+    path = tmp_path_factory.mktemp("node-b") / "odoo.log"
+    generate_log(path, size_mb=3, seed=7, traceback_ratio=0.1)
+    return path
+
+
+@pytest.mark.parametrize("group", [True, False], ids=["grouped", "no-group"])
+@pytest.mark.parametrize("window", [(None, None), WINDOW], ids=["all", "window"])
+def test_parallel_matches_serial_across_sources(log, rotated, other_node, group, window):
+    # The rotated set repeats the first log record for record, so every timestamp ties across those two
+    sources = {"node-a": [log], "node-b": [other_node], "node-c": rotated}
+    files = [f for fs in sources.values() for f in fs]
+    labels = {f: label for label, fs in sources.items() for f in fs}
+    since, until = window
+    ranges = _ranges(files, since, until)
+    blocks = merge_by_time([
+        (label, (b for f in fs for b in iter_blocks(iter_lines(f, *ranges.get(f, (0, None))))
+                 if since is None and until is None or in_window(b["ts"], since, until)))
+        for label, fs in sources.items()
+    ])
+    table = _table(group)
+    if table is None:
+        serial = [block_record(b) for b in blocks]
+    else:
+        for b in blocks:
+            table.add(b)
+        serial = table.results()
+    par = parallel.analyze_parallel(files, 4, since, until, _table(group), ranges, labels)
+    assert len(parallel.plan_chunks(files, 4, ranges)) > len(files)
+    assert serial and par == serial
@@ -0,0 +1,57 @@
+import sqlite3
+
+from typer.testing import CliRunner
+
+from odoo_helper_cli.logs import app, store
+from odoo_helper_cli.logs.benchmark import generate_log
+
+runner = CliRunner()
+
+
+def test_query_reads_an_ingested_store(tmp_path):
+    log, db = tmp_path / "odoo.log", tmp_path / "logs.sqlite"
+    generate_log(log, size_mb=1, traceback_ratio=0.1)
+    assert runner.invoke(app, ["ingest", "--path", str(log), "--db", str(db)]).exit_code == 0
+    result = runner.invoke(app, ["query", "--db", str(db), "--output", "json", "--no-suggest"])
+    assert result.exit_code == 0, result.output
+    assert '"count"' in result.output
+
+
+def test_query_on_a_corrupt_store_fails_cleanly(tmp_path):
+    db = tmp_path / "logs.sqlite"
+    db.write_bytes(b"this is not a sqlite database" * 200)
+    result = runner.invoke(app, ["query", "--db", str(db)])
+    assert result.exit_code == 1
+    assert "Failed to open store" in result.output
+    assert not isinstance(result.exception, sqlite3.Error)
+
+
+def _broken_store(tmp_path):
+    db = tmp_path / "logs.sqlite"
+    conn = sqlite3.connect(str(db))
+    # Same table name, wrong columns: CREATE TABLE IF NOT EXISTS keeps it, the query then fails
+    conn.execute("CREATE TABLE blocks (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.close()
+    return db
+
+
+def test_query_on_a_store_with_a_broken_schema_fails_cleanly(tmp_path):
+    db = _broken_store(tmp_path)
+    result = runner.invoke(app, ["query", "--db", str(db)])
+    assert result.exit_code == 1
+    assert "Failed to" in result.output
+    assert not isinstance(result.exception, sqlite3.Error)
+
+
+def test_ingest_that_fails_to_write_the_store_fails_cleanly(tmp_path):
+    log, db = tmp_path / "odoo.log", tmp_path / "logs.sqlite"
+    generate_log(log, size_mb=1, traceback_ratio=0.1)
+    conn = store.connect(db)
+    conn.execute("CREATE TRIGGER no_rows BEFORE INSERT ON blocks BEGIN SELECT RAISE(ABORT, 'store is read-only'); END")
+    conn.commit()
+    conn.close()
+    result = runner.invoke(app, ["ingest", "--path", str(log), "--db", str(db)])
+    assert result.exit_code == 1
+    assert "Failed to write store" in result.output
+    assert not isinstance(result.exception, sqlite3.Error)
@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from odoo_helper_cli.logs import parser
+from odoo_helper_cli.logs.parser import _parse_ts_slow, decode_ts, format_ts
+
+NORMAL = [
+    "2025-01-01 00:00:00,000 1234 INFO prod odoo.modules.loading: loading 1 modules...",
+    "2025-03-09 13:45:12,789 1234 ERROR prod odoo.http: Exception during request handling.",
+    "2024-02-29 23:59:59,999 42 WARNING prod odoo.models: leap day",
+    "1999-12-31 23:59:59,500 1 INFO db werkzeug: pre-epoch-2000",
+    "2025-06-30 08:00:00 1 INFO prod odoo.service.server: no milliseconds",
+    "2025-06-30 08:00:00",
+]
+MILLISECONDS = [
+    "2025-06-30 08:00:00,001 x",
+    "2025-06-30 08:00:00,010 x",
+    "2025-06-30 08:00:00,1234 more digits than Odoo writes",
+    "2025-06-30 08:00:00,12 only two digits",
+    "2025-06-30 08:00:00,",
+    "2025-06-30 08:00:00.123 dot separator",
+]
+MALFORMED = [
+    "",
+    "Traceback (most recent call last):",
+    "  File \"/opt/odoo/odoo/http.py\", line 1650, in _serve_db",
+    "2025-01-01",
+    "2025-01-01 00:00",
+    "2025-13-01 00:00:00,000 month 13",
+    "2025-02-30 00:00:00,000 no such day",
+    "2025-01-01 24:00:00,000 hour 24",
+    "2025-01-01 00:60:00,000 minute 60",
+    "2025/01/01 00:00:00,000 slashes",
+    "2025-01-01T00:00:00,000 ISO T",
+    "20x5-01-01 00:00:00,000 letter in year",
+    " 2025-01-01 00:00:00,000 leading space",
+    "2025-1-01 00:00:00,000 short month",
+]
+# Not what Odoo writes, but strptime accepts them, so decode_ts must agree
+UNUSUAL = [
+    "２０２５-01-01 00:00:00,000 full-width digits",
+]
+
+
+@pytest.fixture(autouse=True)
+def _cold_cache():
+    parser._SECOND_CACHE.clear()
+    yield
+    parser._SECOND_CACHE.clear()
+
+
+@pytest.mark.parametrize("line", NORMAL + MILLISECONDS + MALFORMED + UNUSUAL)
+def test_decode_matches_strptime(line):
+    assert decode_ts(line) == _parse_ts_slow(line)
+
+
+@pytest.mark.parametrize("line", MALFORMED)
+def test_malformed_lines_have_no_timestamp(line):
+    assert decode_ts(line) is None
+
+
+def test_second_boundary_cache_hits():
+    lines = [f"2025-01-01 00:00:{s:02d},{ms:03d} 1 INFO x: y" for s in (58, 59) for ms in (0, 1, 500, 999)]
+    lines.append("2025-01-01 00:01:00,000 1 INFO x: y")
+    first = [decode_ts(line) for line in lines]
+    assert len(parser._SECOND_CACHE) == 3
+    # Second pass is served from the cache and must not change anything
+    assert [decode_ts(line) for line in lines] == first == [_parse_ts_slow(line) for line in lines]
+    assert first == sorted(first) and len(set(first)) == len(first)
+    assert format_ts(first[3]) == "2025-01-01T00:00:58.999000"
+    assert first[-1] - first[-2] == 1
+
+
+def test_cache_is_bounded():
+    for n in range(parser._SECOND_CACHE_MAX + 10):
+        line = f"2025-01-01 {n // 3600 % 24:02d}:{n // 60 % 60:02d}:{n % 60:02d},000 x"
+        assert decode_ts(line) == _parse_ts_slow(line)
+    assert len(parser._SECOND_CACHE) <= parser._SECOND_CACHE_MAX
+
+
+@pytest.mark.benchmark
+def test_decode_is_faster_than_strptime():
+    # Wall-clock, so opt-in; `logs bench --only timestamps --only timestamps-strptime` compares on a log
+    # Odoo logs write many records per second; 20 lines per second here
+    lines = [f"2025-01-01 {i // 72000 % 24:02d}:{i // 1200 % 60:02d}:{i // 20 % 60:02d},{i % 1000:03d} 1 INFO x: y"
+             for i in range(20_000)]
+
+    def best(fn, repeat=3):
+        runs = []
+        for _ in range(repeat):
+            parser._SECOND_CACHE.clear()
+            started = time.perf_counter()
+            for line in lines:
+                fn(line)
+            runs.append(time.perf_counter() - started)
+        return min(runs)
+
+    slow, fast = best(_parse_ts_slow), best(decode_ts)
+    assert fast * 3 < slow, f"decode_ts {fast:.4f}s vs strptime {slow:.4f}s"
@@ -0,0 +1,85 @@
+import random
+import re
+
+import pytest
+
+from odoo_helper_cli.matcher import LiteralScan, MultiPattern, required_literals
+
+
+@pytest.mark.parametrize("pattern, flags, expected", [
+    (r"UniqueViolation", 0, {("UniqueViolation", False)}),
+    (r"UniqueViolation", re.I, {("uniqueviolation", True)}),
+    (r"psycopg\..*OperationalError", 0, {("OperationalError", False)}),
+    (r"foo|barbaz", 0, {("foo", False), ("barbaz", False)}),
+    (r"(?i:Acc)Denied", 0, {("Denied", False)}),
+    (r"(?i:Access)Den", 0, {("access", True)}),
+    (r"(?:abcd)+x", 0, {("abcd", False)}),
+])
+def test_required_literals(pattern, flags, expected):
+    assert required_literals(pattern, flags) == expected
+
+
+@pytest.mark.parametrize("pattern, flags", [
+    (r"\d+", 0),
+    (r"ab", 0),  # shorter than MIN_LITERAL
+    (r"foo|\w+", 0),  # one alternative has no literal
+    (r"(?:abcd)?x", 0),  # optional
+    (r"café", re.I),  # non-ASCII case folding
+    (r"(", 0),  # invalid
+])
+def test_no_literal_prefilter(pattern, flags):
+    assert required_literals(pattern, flags) is None
+
+
+def test_literal_scan_reports_overlapping_and_prefix_literals():
+    scan = LiteralScan(["abc", "abcdef", "cde", "zzz"])
+    assert scan.found("xxabcdefxx") == {"abc", "abcdef", "cde"}
+    assert scan.found("abcd") == {"abc"}
+    assert scan.found("nothing here") == set()
+    assert LiteralScan([]).found("abc") == set()
+
+
+def test_literal_scan_escapes_metacharacters():
+    scan = LiteralScan(["a.b", "(x)"])
+    assert scan.found("axb") == set()
+    assert scan.found("a.b (x)") == {"a.b", "(x)"}
+
+
+WORDS = ["error", "Error", "ERR", "record", "access", "denied", "model", "unique", "view", "psycopg", "xml", "café"]
+
+
+def _pattern(rng):
+    a, b = rng.sample(WORDS, 2)
+    return rng.choice([
+        f"{a}", f"{a}.*{b}", f"{a}|{b}", rf"{a}\s+\w+", rf"(?:{a})+_{b}", rf"\d+{a}", rf"{a}?x", f"(?i:{a}){b}",
+    ]), rng.choice([0, re.I])
+
+
+def _text(rng):
+    return " ".join(rng.choice(WORDS + ["x", "_", "42", "ſvalue"]) for _ in range(rng.randint(0, 12)))
+
+
+def test_search_all_agrees_with_plain_regex():
+    rng = random.Random(7)
+    patterns = [_pattern(rng) for _ in range(150)]
+    compiled = [re.compile(p, f) for p, f in patterns]
+    matcher = MultiPattern(patterns)
+    assert len(matcher) == len(patterns)
+    for _ in range(500):
+        text = _text(rng)
+        expected = [i for i, rx in enumerate(compiled) if rx.search(text)]
+        assert matcher.search_all(text) == expected, text
+        assert set(expected) <= set(matcher.candidates(text))
+
+
+def test_prefilter_skips_rules_whose_literals_are_absent():
+    matcher = MultiPattern([("UniqueViolation", 0), ("access denied", re.I), (r"\d+", 0)])
+    assert matcher.candidates("nothing to see") == [2]
+    assert matcher.candidates("ACCESS DENIED for uid 2") == [1, 2]
+    assert matcher.search_all("UniqueViolation: ACCESS denied") == [0, 1]
+
+
+def test_icase_literals_do_not_prefilter_non_ascii_text():
+    # 'ſ' (long s) matches 's' case-insensitively but lowercases to itself
+    matcher = MultiPattern([("access", re.I)])
+    assert matcher.search_all("acceſſ") == [0]
@@ -0,0 +1,25 @@
+import ast
+import textwrap
+
+import pytest
+
+from odoo_helper_cli.migrate.rules import get_ruleset
+
+
+def _rule_ids(source, frm=12, to=13):
+    _, findings = get_ruleset(frm, to).check_python(ast.parse(textwrap.dedent(source)))
+    return [(f["rule"], f["line"]) for f in findings]
+
+
+@pytest.mark.parametrize("call", ["sudo(user)", "sudo(self.env.user)", "sudo(SUPERUSER_ID)", "sudo(1)", "sudo(user=uid)"])
+def test_sudo_with_a_user_is_flagged(call):
+    assert _rule_ids(f"records.{call}\n") == [("py-sudo-user", 1)]
+
+
+@pytest.mark.parametrize("call", ["sudo()", "sudo(True)", "sudo(False)", "sudo(flag=False)"])
+def test_sudo_without_a_user_is_not_flagged(call):
+    assert _rule_ids(f"records.{call}\n") == []
+
+
+def test_sudo_rule_outside_the_version_range():
+    assert _rule_ids("records.sudo(user)\n", frm=13, to=17) == []
@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from odoo_helper_cli.migrate import scanner
+
+FILES = 100
+
+
+@pytest.fixture
+def module(tmp_path):
+    root = tmp_path / "my_module"
+    (root / "models").mkdir(parents=True)
+    (root / "views").mkdir()
+    for i in range(FILES // 2):
+        (root / "models" / f"m{i:03}.py").write_text(
+            f"from odoo import models\n\n\nclass M{i}(models.Model):\n    _name = 'x.m{i}'\n    _inherit = 'x.base'\n",
+            encoding="utf-8",
+        )
+        (root / "views" / f"v{i:03}.xml").write_text(f"<odoo><record id='v{i}' model='ir.ui.view'/></odoo>", encoding="utf-8")
+    return root
+
+
+class RecordingPool(ThreadPoolExecutor):
+    """Threads instead of processes, recording what is submitted and how much is in flight."""
+
+    submitted = []
+    peak = 0
+
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers)
+        self.live = set()
+
+    def submit(self, fn, *args):
+        RecordingPool.submitted.append(args)
+        fut = super().submit(fn, *args)
+        self.live.add(fut)
+        self.live = {f for f in self.live if not f.done()}
+        RecordingPool.peak = max(RecordingPool.peak, len(self.live))
+        return fut
+
+
+def _scan(root, jobs, counts=None):
+    return dict(scanner.iter_scan(root, 14, 17, jobs=jobs, use_cache=False, counts=counts))
+
+
+def test_parallel_scan_matches_serial(module):
+    assert _scan(module, 2) == _scan(module, 1)
+
+
+def test_pool_gets_paths_with_bounded_work_in_flight(module, monkeypatch):
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", RecordingPool)
+    monkeypatch.setattr(RecordingPool, "submitted", [])
+    monkeypatch.setattr(RecordingPool, "peak", 0)
+    counts = {}
+    assert len(_scan(module, 2, counts)) == FILES
+    assert counts == {"cached": 0, "analyzed": FILES}
+    assert len(RecordingPool.submitted) == FILES
+    assert all(isinstance(args[1], str) for args in RecordingPool.submitted)
+    assert RecordingPool.peak <= 2 * scanner.IN_FLIGHT_PER_JOB + 1
+
+
+def test_results_stream_before_the_walk_ends(module, monkeypatch):
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", RecordingPool)
+    walked = []
+    real = scanner.iter_sources
+
+    def counting(root):
+        for p in real(root):
+            walked.append(p)
+            yield p
+
+    monkeypatch.setattr(scanner, "iter_sources", counting)
+    gen = scanner.iter_scan(module, 14, 17, jobs=2, use_cache=False)
+    next(gen)
+    assert len(walked) < FILES
+    gen.close()
+
+
+def test_few_files_are_analyzed_without_a_pool(module, monkeypatch):
+    monkeypatch.setattr(scanner, "ProcessPoolExecutor", None)  # would fail if used
+    monkeypatch.setattr(scanner, "MIN_PARALLEL_FILES", FILES + 1)
+    assert len(_scan(module, 4)) == FILES
+
+
+def test_rescan_is_served_from_the_cache(module):
+    counts = {}
+    first = dict(scanner.iter_scan(module, 14, 17, jobs=2))
+    again = dict(scanner.iter_scan(module, 14, 17, jobs=2, counts=counts))
+    assert again == first
+    assert counts == {"cached": FILES, "analyzed": 0}